@@ -35,10 +35,10 @@ from ainara.framework.chat_memory import ChatMemory
 from ainara.framework.config import config
 from ainara.framework.green_memories import GREENMemories
 from ainara.framework.loading_animation import LoadingAnimation
+from ainara.framework.nlp import analyze_query, get_nlp
 from ainara.framework.orakle_middleware import OrakleMiddleware
 from ainara.framework.template_manager import TemplateManager
 from ainara.framework.tts.base import TTSBackend
-from ainara.framework.utils import load_spacy_model
 
 # import pprint
 
@@ -96,8 +96,10 @@ class ChatManager:
         self.new_summary = "-"
         self.nexus_test = 0
 
-        # Load spaCy model for sentence segmentation
-        self.nlp = load_spacy_model()
+        # Shared spaCy pipeline: full syntax for the reasoning heuristic and a
+        # lighter parser-only view for sentence segmentation
+        self.nlp = get_nlp("syntax")
+        self.nlp_sentences = get_nlp("sentences")
 
         # Initialize template manager
         self.template_manager = TemplateManager()
@@ -234,20 +236,29 @@ class ChatManager:
             self.green_memories = GREENMemories(
                 llm=self.llm,
                 chat_memory=self.chat_memory,
+                background_warm_up=config.get(
+                    "user_profile.green_memories.background_warm_up", True
+                ),
             )
             logger.info("User Memories Manager initialized.")
-            # Perform initial consolidation
             logger.info("Processing existing messages for user profile...")
-            self.green_memories.process_new_messages_for_update()
-            logger.info("Message processing complete.")
+            if config.get(
+                "user_profile.green_memories.assimilation.background", True
+            ):
+                # Perform initial consolidation without blocking the chat
+                self.green_memories.start_background_update()
+            else:
+                self.green_memories.process_new_messages_for_update()
 
-        # Always regenerate summary when enabling memory
+        # Load the cached summary, generating it only if there is none yet
         if self.green_memories:
             self.user_profile_summary = (
-                self.green_memories.generate_user_profile_summary()
+                self.green_memories.get_user_profile_summary(
+                    wait_if_missing=True
+                )
             )
             if self.user_profile_summary:
-                logger.info("User profile summary generated/updated.")
+                logger.info("User profile summary loaded.")
 
         # Initialize decay components if needed
         if self.memory_decay_interval > 0 and self.decay_executor is None:
@@ -350,7 +361,7 @@ class ChatManager:
         if not text.strip():
             return []
 
-        if not self.nlp:
+        if not self.nlp_sentences:
             logger.error("spaCy model not available")
             raise RuntimeError("spacy model not available")
 
@@ -390,7 +401,7 @@ class ChatManager:
                 else:
                     try:
                         # Use spaCy to split the paragraph into sentences
-                        doc = self.nlp(paragraph)
+                        doc = self.nlp_sentences(paragraph)
                         paragraph_sentences = [
                             sent.text.strip()
                             for sent in doc.sents
@@ -1108,7 +1119,13 @@ class ChatManager:
         if len(query.split()) <= 3:
             return 0.0
 
-        doc = self.nlp(query.lower())
+        # The rules were tuned on a lowercased parse, which changes some
+        # tags and dependencies, so the query is analyzed lowercased
+        analysis = analyze_query(query.lower())
+        if analysis is None:
+            return 0.0
+        doc = analysis.doc
+        lemmas = analysis.lemmas
         score = 0.0
 
         # --- Define linguistic features and their weights ---
@@ -1129,20 +1146,15 @@ class ChatManager:
 
         # --- Rule-based scoring ---
         # Rule 1: Check for high-impact reasoning verbs (especially as the root)
-        root_verb = ""
-        for token in doc:
-            if token.dep_ == "ROOT" and token.pos_ == "VERB":
-                root_verb = token.lemma_
-                if token.lemma_ in reasoning_verbs:
-                    score += 1.0
-                    logger.debug(
-                        "Heuristic: Found root reasoning verb"
-                        f" '{token.lemma_}' (+1.0)"
-                    )
-                break
+        root_verb = analysis.root_verb
+        if root_verb in reasoning_verbs:
+            score += 1.0
+            logger.debug(
+                f"Heuristic: Found root reasoning verb '{root_verb}' (+1.0)"
+            )
 
         # Rule 2: Check for explanatory interrogatives at the start
-        if doc[0].lemma_ in explanatory_interrogatives:
+        if lemmas[0] in explanatory_interrogatives:
             score += 0.6
             logger.debug(
                 f"Heuristic: Found explanatory interrogative '{doc[0].text}'"
@@ -1160,15 +1172,12 @@ class ChatManager:
 
         # Rule 4: Check for any reasoning verb, even if not the root
         if score < 0.5:  # Only apply if a strong signal hasn't been found
-            for token in doc:
-                if (
-                    token.lemma_ in reasoning_verbs
-                    and token.lemma_ != root_verb
-                ):
+            for lemma in lemmas:
+                if lemma in reasoning_verbs and lemma != root_verb:
                     score += 0.4
                     logger.debug(
                         "Heuristic: Found non-root reasoning verb"
-                        f" '{token.lemma_}' (+0.2)"
+                        f" '{lemma}' (+0.2)"
                     )
                     break
 
@@ -1416,6 +1425,13 @@ class ChatManager:
                 )
 
             # --- User Profile Injection (from cached summary) ---
+            if self.memory_enabled and self.green_memories:
+                # Last good summary; refreshed in the background once the
+                # memories changed
+                self.user_profile_summary = (
+                    self.green_memories.get_user_profile_summary()
+                    or self.user_profile_summary
+                )
             if self.memory_enabled and self.user_profile_summary:
                 # final_system_content += f"\n\n--- Next paragraph contains key information about the user, possibly including the user's name, which I MUST take into account:\n{self.user_profile_summary}"
                 final_system_content += (
@@ -1428,7 +1444,7 @@ class ChatManager:
             # --- Recent Memories Summary Injection ---
             if self.memory_enabled and self.green_memories:
                 recent_memories_summary = (
-                    self.green_memories.generate_recent_memories_summary()
+                    self.green_memories.get_recent_memories_summary()
                 )
                 if recent_memories_summary:
                     final_system_content += (
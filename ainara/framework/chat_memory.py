@@ -25,6 +25,10 @@ from typing import Any, Dict, List, Optional
 from ainara.framework.storage import get_text_backend, get_vector_backend
 # Import our storage backends
 from ainara.framework.storage.base import StorageBackend
+from ainara.framework.storage.write_behind import (
+    VectorWriteBehind,
+    vector_metadata,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +113,12 @@ class ChatMemory:
             logger.info(
                 f"Using {vector_type} vector backend with context {context_id}"
             )
+            if self.vector_storage.needs_reindex:
+                logger.warning(
+                    "Chat history vectors come from a different embedding"
+                    " encoder; semantic search results will be unreliable"
+                    " until re_index_vectors() is run."
+                )
         except ImportError:
             logger.warning(
                 f"Vector storage backend '{vector_type}' dependencies not"
@@ -119,6 +129,30 @@ class ChatMemory:
             logger.error(f"Failed to initialize vector storage: {e}")
             self.vector_storage = None
 
+        # Embed new entries on a background worker instead of in add_entry
+        self.vector_writer = None
+        if self.vector_storage and config.get(
+            "memory.vector_storage.write_behind.enabled", True
+        ):
+            if hasattr(self.storage, "mark_vector_indexed"):
+                self.vector_writer = VectorWriteBehind(
+                    self.storage,
+                    self.vector_storage,
+                    max_batch_size=config.get(
+                        "memory.vector_storage.write_behind.max_batch_size", 32
+                    ),
+                    max_wait_ms=config.get(
+                        "memory.vector_storage.write_behind.max_wait_ms", 50
+                    ),
+                    name=context_id,
+                )
+                self.vector_writer.replay()
+            else:
+                logger.info(
+                    "Text backend can't track vector indexing; entries are"
+                    " embedded synchronously."
+                )
+
     def add_entry(
         self,
         content: str,
@@ -164,19 +198,34 @@ class ChatMemory:
         if user_id is not None:
             entry_metadata["user"] = user_id
 
-        # Add to text storage
+        # Add to text storage. With the write-behind queue the row is
+        # committed unindexed and embedded later by the worker.
         message_id = self.storage.add_message(
-            content=content, role=role, metadata=entry_metadata
+            content=content,
+            role=role,
+            metadata=entry_metadata,
+            vector_indexed=not self.vector_writer,
+        )
+        # Same metadata, and vector id, as replay() and re_index_vectors()
+        message_vector_metadata = vector_metadata(
+            {
+                "id": message_id,
+                "role": role,
+                "timestamp": entry_metadata["timestamp"],
+                "user": entry_metadata.get("user"),
+                "metadata": entry_metadata,
+            }
         )
 
-        # Add to vector storage if available
-        if self.vector_storage:
+        if self.vector_writer:
+            self.vector_writer.enqueue(
+                message_id, content, message_vector_metadata
+            )
+        elif self.vector_storage:
+            # Add to vector storage if available
             try:
-                vector_metadata = entry_metadata.copy()
-                vector_metadata["message_id"] = message_id
-
                 self.vector_storage.add_text(
-                    text=content, metadata=vector_metadata
+                    text=content, metadata=message_vector_metadata
                 )
             except Exception as e:
                 logger.error(f"Error adding to vector storage: {e}")
@@ -204,6 +253,24 @@ class ChatMemory:
             users=users,
         )
 
+    def get_history_days(self) -> List[str]:
+        """Get the local days (YYYY-MM-DD) that have chat history"""
+        return self.storage.get_message_days()
+
+    def get_adjacent_history_day(
+        self, day: Optional[str] = None, direction: str = "previous"
+    ) -> Optional[str]:
+        """Get the closest day with history before or after `day`"""
+        return self.storage.get_adjacent_message_day(day, direction)
+
+    def get_history_day_count(self, day: str) -> int:
+        """Get the number of messages of one local day of chat history"""
+        return self.storage.get_message_day_count(day)
+
+    def get_history_for_day(self, day: str) -> List[Dict[str, Any]]:
+        """Get one local day of chat history, oldest first"""
+        return self.storage.get_messages_for_day(day)
+
     def search_entries(
         self,
         query: str,
@@ -351,6 +418,9 @@ class ChatMemory:
             return
 
         logger.info("Starting vector re-indexing process...")
+        if self.vector_writer:
+            # Let queued entries land before the collection is dropped
+            self.vector_writer.flush()
         self.vector_storage.reset()
 
         total_messages = self.get_total_messages()
@@ -360,38 +430,41 @@ class ChatMemory:
 
         logger.info(f"Found {total_messages} messages to index.")
 
-        for offset in range(0, total_messages, batch_size):
-            messages = self.storage.get_messages(
-                limit=batch_size, offset=offset
-            )
-            if not messages:
-                break
-
-            documents_to_add = []
-            for msg in messages:
-                meta = msg.get("metadata") or {}
-                meta["message_id"] = msg["id"]
-                meta["role"] = msg["role"]
-                meta["timestamp"] = msg["timestamp"]
-                if msg.get("user"):
-                    meta["user"] = msg["user"]
-
-                documents_to_add.append(
-                    {"page_content": msg["content"], "metadata": meta}
+        indexed = 0
+        documents_to_add = []
+
+        def add_batch():
+            nonlocal indexed, documents_to_add
+            self.vector_storage.add_documents(documents_to_add)
+            # Only the messages actually sent are flagged: a message stored
+            # while this runs keeps its flag for the write-behind replay
+            if hasattr(self.storage, "mark_vector_indexed"):
+                self.storage.mark_vector_indexed(
+                    [doc["metadata"]["message_id"] for doc in documents_to_add]
                 )
-
-            if documents_to_add:
-                self.vector_storage.add_documents(documents_to_add)
-
-            logger.info(
-                f"Indexed {offset + len(messages)} /"
-                f" {total_messages} messages."
+            indexed += len(documents_to_add)
+            documents_to_add = []
+            logger.info(f"Indexed {indexed} / {total_messages} messages.")
+
+        for msg in self.storage.iter_messages(batch_size=batch_size):
+            documents_to_add.append(
+                {
+                    "page_content": msg["content"],
+                    "metadata": vector_metadata(msg),
+                }
             )
+            if len(documents_to_add) >= batch_size:
+                add_batch()
+
+        if documents_to_add:
+            add_batch()
 
         logger.info("Vector re-indexing complete.")
 
     def close(self):
         """Close all resources"""
+        if self.vector_writer:
+            self.vector_writer.close()
         self.storage.close()
         if self.vector_storage:
             self.vector_storage.close()
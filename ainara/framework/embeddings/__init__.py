@@ -0,0 +1,51 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+from ainara.framework.embeddings.batcher import EmbeddingBatcher
+from ainara.framework.embeddings.cache import (
+    EmbeddingCache,
+    LRUEmbeddingCache,
+    encode_cached,
+    get_embedding_cache,
+)
+from ainara.framework.embeddings.onnx_encoder import (
+    OnnxSentenceEncoder,
+    export_quantized_onnx,
+)
+from ainara.framework.embeddings.registry import (
+    EmbeddingModelRegistry,
+    embedding_model_id,
+    get_embedding_model,
+    model_registry,
+    release_embedding_model,
+)
+
+__all__ = [
+    "EmbeddingBatcher",
+    "EmbeddingCache",
+    "EmbeddingModelRegistry",
+    "LRUEmbeddingCache",
+    "OnnxSentenceEncoder",
+    "embedding_model_id",
+    "encode_cached",
+    "export_quantized_onnx",
+    "get_embedding_cache",
+    "get_embedding_model",
+    "model_registry",
+    "release_embedding_model",
+]
@@ -0,0 +1,231 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# encode() keyword arguments, and the values of them, that leave the result
+# the batcher returns unchanged. Calls with any other option or value
+# (tensors, normalization, a batch size, ...) go straight to the model.
+NEUTRAL_KWARGS = {
+    "show_progress_bar": (None, False),
+    "convert_to_numpy": (True,),
+}
+
+_STOP = object()
+
+
+def _bucket(size: int) -> str:
+    """Power-of-two bucket label for the batch-size histogram."""
+    low = 1 << (size.bit_length() - 1)
+    high = (low << 1) - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces encode requests from many threads into batched model calls.
+
+    Callers on any thread submit texts and get a Future back. A single
+    worker thread takes the first pending request, gathers whatever else
+    is queued or arrives within `max_wait_ms` (up to `max_batch_size`
+    texts), encodes everything in one `model.encode()` call and resolves
+    the futures. The wait only happens while requests are arriving
+    concurrently: a lone request after a lone request is served at once.
+
+    Requests of `max_batch_size` texts or more gain nothing from
+    coalescing, so they are encoded on the caller's thread and never hold
+    up the small request-path queries queued behind them.
+
+    The batcher exposes `encode()` with the model's signature and forwards
+    any other attribute to the model, so the registry can hand it out in
+    place of the model itself.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        name: str = "",
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            model: Any object with a sentence-transformers style `encode()`
+            max_batch_size: Texts per batch above which no more requests are
+                            coalesced (a single larger request still runs)
+            max_wait_ms: How long to wait for more requests after the first
+            name: Label for the worker thread and logs
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue" = queue.Queue()
+        # Whether the last batch coalesced several requests
+        self._concurrent = False
+        self._stats_lock = threading.Lock()
+        self._batch_sizes: Counter = Counter()
+        self._requests = 0
+        self._batches = 0
+        self._texts = 0
+
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"EmbeddingBatcher-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def __getattr__(self, attr: str) -> Any:
+        # Only called for attributes the batcher itself doesn't define
+        return getattr(self.model, attr)
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        Queues texts for encoding.
+
+        Returns:
+            A Future resolving to a 2D float32 array, one row per text
+        """
+        future: Future = Future()
+        if not texts:
+            future.set_result(np.empty((0, 0), np.float32))
+        elif self._closed or len(texts) >= self.max_batch_size:
+            self._serve([(list(texts), future)])
+        else:
+            self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, sentences, **kwargs):
+        """Drop-in for `model.encode()` that goes through the batcher."""
+        if any(
+            value not in NEUTRAL_KWARGS.get(key, ())
+            for key, value in kwargs.items()
+        ):
+            return self.model.encode(sentences, **kwargs)
+        single = isinstance(sentences, str)
+        embeddings = self.submit(
+            [sentences] if single else list(sentences)
+        ).result()
+        return embeddings[0] if single else embeddings
+
+    def _collect(self, first: Tuple) -> List[Tuple]:
+        """Gathers requests to batch together with the first one."""
+        requests = [first]
+        total = len(first[0])
+        # Waiting only pays off while other callers are active
+        wait = self._concurrent or not self._queue.empty()
+        deadline = time.monotonic() + (self.max_wait if wait else 0.0)
+        while total < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    request = self._queue.get(timeout=timeout)
+                else:
+                    request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is _STOP:
+                # Finish this batch, then stop
+                self._queue.put(_STOP)
+                break
+            requests.append(request)
+            total += len(request[0])
+        self._concurrent = len(requests) > 1
+        return requests
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            self._serve(self._collect(first))
+
+        # Serve anything that raced with close()
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is not _STOP:
+                self._serve([request])
+
+    def _serve(self, requests: List[Tuple]):
+        """Encodes a batch of requests with one model call."""
+        texts = [text for request_texts, _ in requests for text in request_texts]
+        try:
+            embeddings = np.asarray(self.model.encode(texts), dtype=np.float32)
+        except Exception as e:
+            logger.error(f"Batched encode of {len(texts)} texts failed: {e}")
+            for _, future in requests:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for request_texts, future in requests:
+            future.set_result(embeddings[offset:offset + len(request_texts)])
+            offset += len(request_texts)
+
+        with self._stats_lock:
+            self._requests += len(requests)
+            self._batches += 1
+            self._texts += len(texts)
+            self._batch_sizes[_bucket(len(texts))] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns batching counters and the batch-size distribution."""
+        with self._stats_lock:
+            return {
+                "requests": self._requests,
+                "batches": self._batches,
+                "texts": self._texts,
+                "mean_batch_size": (
+                    round(self._texts / self._batches, 2)
+                    if self._batches
+                    else 0.0
+                ),
+                "requests_per_batch": (
+                    round(self._requests / self._batches, 2)
+                    if self._batches
+                    else 0.0
+                ),
+                "batch_size_histogram": dict(
+                    sorted(
+                        self._batch_sizes.items(),
+                        key=lambda item: int(item[0].split("-")[0]),
+                    )
+                ),
+            }
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Stops the worker after the pending requests are served."""
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
@@ -0,0 +1,363 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional
+
+import numpy as np
+
+from ainara.framework.config import config
+from ainara.framework.embeddings.registry import embedding_model_id
+
+logger = logging.getLogger(__name__)
+
+# When the cache grows over its size limit, entries are evicted until it is
+# back under this fraction of the limit, so eviction doesn't run on every put.
+EVICTION_LOW_WATERMARK = 0.9
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes text before hashing so trivially different inputs share keys."""
+    return unicodedata.normalize("NFC", text).strip()
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed embedding cache.
+
+    Embeddings are stored as float32 blobs in a SQLite file, keyed by a hash
+    of (model id, normalized text). The file is bounded by size: when it
+    grows over `max_size_mb` the least recently used entries are evicted.
+    """
+
+    def __init__(self, db_path: str, max_size_mb: int = 512):
+        """
+        Initialize the embedding cache
+
+        Args:
+            db_path: Path to the SQLite cache file
+            max_size_mb: Maximum total size of the stored vectors in MB
+        """
+        self.db_path = db_path
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.conn.execute("PRAGMA synchronous=NORMAL;")
+        with self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    dim INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON"
+                " embeddings (last_access);"
+            )
+        self._total_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        logger.info(
+            f"Embedding cache opened at {db_path}"
+            f" ({self._total_bytes / (1024 * 1024):.1f} MB used)"
+        )
+
+    @staticmethod
+    def make_key(model_id: str, text: str) -> str:
+        """Returns the content address for a (model, text) pair."""
+        digest = hashlib.sha256()
+        digest.update(model_id.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(normalize_text(text).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_many(
+        self, model_id: str, texts: List[str]
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Looks up cached embeddings for a list of texts.
+
+        Returns:
+            A list aligned with `texts`, with None for every cache miss.
+        """
+        if not texts:
+            return []
+        keys = [self.make_key(model_id, text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's host parameter limit
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start: start + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self.conn.execute(
+                    "SELECT cache_key, vector FROM embeddings WHERE"
+                    f" cache_key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for cache_key, blob in rows:
+                    found[cache_key] = np.frombuffer(blob, dtype=np.float32)
+            if found:
+                now = time.time()
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE embeddings SET last_access = ? WHERE"
+                        " cache_key = ?",
+                        [(now, key) for key in found],
+                    )
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for result in results if result is not None)
+            self.hits += hits
+            self.misses += len(results) - hits
+        return results
+
+    def put_many(
+        self, model_id: str, texts: List[str], embeddings: np.ndarray
+    ):
+        """Stores embeddings for a list of texts."""
+        if not texts:
+            return
+        now = time.time()
+        rows = []
+        for text, embedding in zip(texts, embeddings):
+            vector = np.asarray(embedding, dtype=np.float32)
+            rows.append(
+                (
+                    self.make_key(model_id, text),
+                    model_id,
+                    int(vector.shape[-1]),
+                    vector.tobytes(),
+                    now,
+                )
+            )
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (cache_key, model,"
+                    " dim, vector, last_access) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            # Replacing an existing key may overcount slightly; the counter
+            # is re-synced from the table whenever eviction runs.
+            self._total_bytes += sum(len(row[3]) for row in rows)
+            if self._total_bytes > self.max_size_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Evicts least recently used entries until under the low watermark."""
+        self._total_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+        target = int(self.max_size_bytes * EVICTION_LOW_WATERMARK)
+        if self._total_bytes <= target:
+            return
+
+        to_free = self._total_bytes - target
+        freed = 0
+        evicted_keys = []
+        cursor = self.conn.execute(
+            "SELECT cache_key, LENGTH(vector) FROM embeddings ORDER BY"
+            " last_access ASC"
+        )
+        for cache_key, size in cursor:
+            evicted_keys.append((cache_key,))
+            freed += size
+            if freed >= to_free:
+                break
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM embeddings WHERE cache_key = ?", evicted_keys
+            )
+        self._total_bytes -= freed
+        logger.info(
+            f"Evicted {len(evicted_keys)} entries from the embedding cache"
+            f" ({freed / (1024 * 1024):.1f} MB freed)."
+        )
+
+    def encode(self, model, model_id: str, texts: List[str]) -> np.ndarray:
+        """
+        Returns embeddings for `texts`, encoding only the cache misses.
+
+        Args:
+            model: Any object with a sentence-transformers style `encode()`
+            model_id: Identifier of the model, part of the cache key
+            texts: Texts to embed
+
+        Returns:
+            A 2D float32 array with one row per text
+        """
+        cached = self.get_many(model_id, texts)
+        missing = [i for i, vector in enumerate(cached) if vector is None]
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            new_embeddings = np.asarray(
+                model.encode(missing_texts), dtype=np.float32
+            )
+            self.put_many(model_id, missing_texts, new_embeddings)
+            for i, embedding in zip(missing, new_embeddings):
+                cached[i] = embedding
+        return np.vstack(cached) if cached else np.empty((0, 0), np.float32)
+
+    def stats(self) -> dict:
+        """Returns usage counters for the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size_mb": round(self._total_bytes / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_size_bytes / (1024 * 1024), 2),
+        }
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            if self.conn:
+                self.conn.close()
+                self.conn = None
+
+
+class LRUEmbeddingCache:
+    """
+    In-memory LRU cache of embeddings, bounded by entry count and bytes.
+
+    Used for short-lived entries such as user queries, which should age out
+    in a long-running process instead of accumulating forever.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_mb: float = 16):
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Returns the cached embedding for `text`, or None."""
+        with self._lock:
+            embedding = self._entries.get(text)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(text)
+            self.hits += 1
+            return embedding
+
+    def put(self, text: str, embedding: np.ndarray):
+        """Stores an embedding, evicting the least recently used entries."""
+        embedding = np.asarray(embedding)
+        with self._lock:
+            previous = self._entries.pop(text, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[text] = embedding
+            self._bytes += embedding.nbytes
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self._bytes > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Returns usage counters for the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "size_mb": round(self._bytes / (1024 * 1024), 2),
+                "max_size_mb": round(self.max_bytes / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_embedding_cache = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Returns the process-wide embedding cache, creating it on first use.
+
+    Returns None if the cache is disabled in the configuration or could not
+    be opened, in which case callers should encode directly.
+    """
+    global _embedding_cache
+    if not config.get("cache.embeddings.enabled", True):
+        return None
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            db_path = config.get(
+                "cache.embeddings.path",
+                os.path.join(
+                    config.get("cache.directory"), "embeddings_cache.db"
+                ),
+            )
+            try:
+                _embedding_cache = EmbeddingCache(
+                    os.path.expanduser(db_path),
+                    max_size_mb=config.get("cache.embeddings.max_size_mb", 512),
+                )
+            except Exception as e:
+                logger.error(f"Failed to open embedding cache: {e}")
+                return None
+        return _embedding_cache
+
+
+def encode_cached(model, model_id: str, texts: List[str]) -> np.ndarray:
+    """
+    Encodes texts through the persistent cache when it is available.
+
+    Falls back to a plain `model.encode()` if the cache is disabled or fails.
+    """
+    # Keep vectors from different encoder backends apart
+    model_id = embedding_model_id(model, model_id)
+    cache = get_embedding_cache()
+    if cache is not None:
+        try:
+            return cache.encode(model, model_id, texts)
+        except Exception as e:
+            logger.error(f"Embedding cache lookup failed, encoding directly: {e}")
+    return np.asarray(model.encode(texts), dtype=np.float32)
@@ -0,0 +1,261 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+import json
+import logging
+import os
+import re
+from typing import List, Optional, Union
+
+import numpy as np
+
+try:
+    import onnxruntime
+    from tokenizers import Tokenizer
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Identifier of this encoder; vectors from it are cached and indexed
+# separately from the ones produced by the torch encoder.
+ONNX_BACKEND_ID = "onnx-int8"
+
+ENCODER_FILE = "model_int8.onnx"
+SPEC_FILE = "encoder.json"
+
+
+def onnx_model_dir(model_name: str, cache_folder: str) -> str:
+    """Returns the directory holding the ONNX export of a model."""
+    model_slug = re.sub(r"[^\w.-]", "_", model_name)
+    return os.path.join(cache_folder, "onnx", model_slug)
+
+
+def export_quantized_onnx(
+    model_name: str, output_dir: str, cache_folder: Optional[str] = None
+) -> str:
+    """
+    Exports a sentence-transformers model to an int8-quantized ONNX encoder.
+
+    The whole pipeline (transformer, pooling and normalization) goes into the
+    graph, so the ONNX encoder returns the same kind of vectors as
+    `SentenceTransformer.encode`. Exporting needs torch and
+    sentence-transformers; running the result only needs onnxruntime.
+
+    Args:
+        model_name: Name or path of the sentence-transformers model
+        output_dir: Directory to write the encoder to
+        cache_folder: sentence-transformers model cache directory
+
+    Returns:
+        The output directory
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(
+        model_name, cache_folder=cache_folder, device="cpu"
+    )
+    model.eval()
+    features = model.tokenize(["A sentence to trace the export with."])
+    input_names = [
+        name
+        for name in ("input_ids", "attention_mask", "token_type_ids")
+        if name in features
+    ]
+
+    class _SentenceEmbedding(torch.nn.Module):
+        def __init__(self, st_model):
+            super().__init__()
+            self.st_model = st_model
+
+        def forward(self, *inputs):
+            return self.st_model(dict(zip(input_names, inputs)))[
+                "sentence_embedding"
+            ]
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, "model_fp32.onnx")
+    dynamic_axes = {
+        name: {0: "batch", 1: "sequence"} for name in input_names
+    }
+    dynamic_axes["sentence_embedding"] = {0: "batch"}
+    with torch.no_grad():
+        torch.onnx.export(
+            _SentenceEmbedding(model),
+            tuple(features[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["sentence_embedding"],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+    quantize_dynamic(
+        fp32_path,
+        os.path.join(output_dir, ENCODER_FILE),
+        weight_type=QuantType.QInt8,
+    )
+    os.remove(fp32_path)
+    model.tokenizer.save_pretrained(output_dir)
+
+    # The spec is written last: its presence marks a complete export
+    spec = {
+        "model_name": model_name,
+        "inputs": input_names,
+        "max_seq_length": model.max_seq_length,
+        "dimension": model.get_sentence_embedding_dimension(),
+        "pad_token": model.tokenizer.pad_token,
+        "pad_token_id": model.tokenizer.pad_token_id,
+    }
+    with open(os.path.join(output_dir, SPEC_FILE), "w") as f:
+        json.dump(spec, f, indent=2)
+    logger.info(f"Exported int8 ONNX encoder for {model_name} to {output_dir}")
+    return output_dir
+
+
+class OnnxSentenceEncoder:
+    """
+    Runs an int8-quantized ONNX export of a sentence-transformers model.
+
+    Exposes the subset of the `SentenceTransformer` interface the framework
+    uses (`encode`, `get_sentence_embedding_dimension`), so it can be handed
+    out by the model registry in place of the torch model.
+    """
+
+    encoder_backend = ONNX_BACKEND_ID
+
+    def __init__(self, model_dir: str, num_threads: int = 0):
+        """
+        Load an exported encoder
+
+        Args:
+            model_dir: Directory written by export_quantized_onnx()
+            num_threads: Intra-op threads for onnxruntime (0 lets it choose)
+        """
+        if not ONNX_AVAILABLE:
+            raise ImportError(
+                "onnxruntime and tokenizers are required for the ONNX"
+                " embedding backend. Please run 'pip install onnxruntime"
+                " tokenizers'."
+            )
+        with open(os.path.join(model_dir, SPEC_FILE)) as f:
+            spec = json.load(f)
+        self.model_name = spec["model_name"]
+        self.input_names = spec["inputs"]
+        self.max_seq_length = spec["max_seq_length"]
+        self.dimension = spec["dimension"]
+
+        self.tokenizer = Tokenizer.from_file(
+            os.path.join(model_dir, "tokenizer.json")
+        )
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(
+            pad_id=spec["pad_token_id"], pad_token=spec["pad_token"]
+        )
+
+        options = onnxruntime.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, ENCODER_FILE),
+            options,
+            providers=["CPUExecutionProvider"],
+        )
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], np.int64),
+            "attention_mask": np.array(
+                [e.attention_mask for e in encodings], np.int64
+            ),
+            "token_type_ids": np.array(
+                [e.type_ids for e in encodings], np.int64
+            ),
+        }
+        feeds = {name: inputs[name] for name in self.input_names}
+        return self.session.run(None, feeds)[0]
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        normalize_embeddings: bool = False,
+        convert_to_tensor: bool = False,
+        **kwargs,
+    ):
+        """
+        Embeds one or more sentences, like `SentenceTransformer.encode`.
+
+        Args:
+            sentences: A sentence or a list of sentences
+            batch_size: Sentences per inference call
+            normalize_embeddings: L2-normalize the returned vectors
+            convert_to_tensor: Return a torch tensor instead of numpy
+
+        Returns:
+            A float32 array, 1D for a single sentence and 2D for a list
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        embeddings = np.empty((len(texts), self.dimension), np.float32)
+        # Batch sentences of similar length together to reduce padding
+        order = np.argsort([-len(text) for text in texts], kind="stable")
+        for start in range(0, len(texts), batch_size):
+            indices = order[start:start + batch_size]
+            embeddings[indices] = self._encode_batch(
+                [texts[i] for i in indices]
+            )
+
+        if normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        if single:
+            embeddings = embeddings[0]
+        if convert_to_tensor:
+            import torch
+
+            return torch.from_numpy(embeddings)
+        return embeddings
+
+
+def load_onnx_encoder(
+    model_name: str, cache_folder: str, num_threads: int = 0
+) -> OnnxSentenceEncoder:
+    """
+    Loads the ONNX encoder for a model, exporting it on first use.
+
+    Args:
+        model_name: Name or path of the sentence-transformers model
+        cache_folder: Cache directory; exports live under <cache>/onnx
+        num_threads: Intra-op threads for onnxruntime (0 lets it choose)
+    """
+    model_dir = onnx_model_dir(model_name, cache_folder)
+    if not os.path.exists(os.path.join(model_dir, SPEC_FILE)):
+        logger.info(
+            f"No ONNX export found for {model_name}, exporting (one-time)..."
+        )
+        export_quantized_onnx(model_name, model_dir, cache_folder)
+    return OnnxSentenceEncoder(model_dir, num_threads=num_threads)
@@ -0,0 +1,274 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from sentence_transformers import SentenceTransformer
+
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+from ainara.framework.config import config
+from ainara.framework.embeddings.batcher import EmbeddingBatcher
+from ainara.framework.embeddings.onnx_encoder import load_onnx_encoder
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingModelRegistry:
+    """
+    Process-wide registry of loaded embedding models.
+
+    Every consumer (matcher, vector storage backends, GREEN memories, skills)
+    asks the registry for a model instead of instantiating its own copy, so
+    the same weights are only loaded once per process. Models are keyed by
+    (model name, cache folder, device, backend) and reference counted; a
+    model is unloaded when its last user releases it, or explicitly via
+    `unload()`.
+
+    The encoder backend comes from `memory.vector_storage.embedding_backend`:
+    "torch" (sentence-transformers, the default) or "onnx" (an int8-quantized
+    ONNX export run through onnxruntime, for CPU-only deployments).
+
+    Unless `memory.vector_storage.micro_batching.enabled` is false, each
+    model is handed out wrapped in an EmbeddingBatcher, so concurrent encode
+    calls from different threads share batched model calls.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple, Any] = {}
+        self._refcounts: Dict[Tuple, int] = {}
+        # A single lock also serializes model loading, so two threads asking
+        # for the same model at startup never load it twice.
+        self._lock = threading.RLock()
+
+    def _make_key(
+        self,
+        model_name: str,
+        cache_folder: Optional[str] = None,
+        device: Optional[str] = None,
+        backend: Optional[str] = None,
+    ) -> Tuple:
+        if cache_folder is None:
+            cache_folder = config.get("cache.directory")
+        if backend is None:
+            backend = config.get(
+                "memory.vector_storage.embedding_backend", "torch"
+            )
+        return (model_name, cache_folder, device, backend)
+
+    def _load(self, key: Tuple):
+        model_name, cache_folder, device, backend = key
+        if backend == "onnx":
+            try:
+                return load_onnx_encoder(
+                    model_name,
+                    cache_folder,
+                    num_threads=config.get(
+                        "memory.vector_storage.onnx_threads", 0
+                    ),
+                )
+            except Exception as e:
+                logger.error(
+                    f"Failed to load ONNX encoder for {model_name}, falling"
+                    f" back to sentence-transformers: {e}"
+                )
+        elif backend != "torch":
+            logger.warning(
+                f"Unknown embedding backend '{backend}', using torch."
+            )
+
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise ImportError(
+                "sentence-transformers library not found. Please run 'pip"
+                " install sentence-transformers'."
+            )
+        return SentenceTransformer(
+            model_name, cache_folder=cache_folder, device=device
+        )
+
+    def acquire(
+        self,
+        model_name: str,
+        cache_folder: Optional[str] = None,
+        device: Optional[str] = None,
+        backend: Optional[str] = None,
+    ) -> "SentenceTransformer":
+        """
+        Returns the shared model instance, loading it on first use.
+
+        Args:
+            model_name: Name or path of the sentence-transformers model
+            cache_folder: Model cache directory (defaults to cache.directory)
+            device: Torch device, or None to let the library choose
+            backend: "torch" or "onnx" (defaults to the configured backend)
+
+        Returns:
+            The shared SentenceTransformer (or compatible encoder) instance
+        """
+        key = self._make_key(model_name, cache_folder, device, backend)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                logger.info(
+                    f"Loading embedding model: {model_name} ({key[3]})"
+                )
+                model = self._load(key)
+                if config.get(
+                    "memory.vector_storage.micro_batching.enabled", True
+                ):
+                    model = EmbeddingBatcher(
+                        model,
+                        max_batch_size=config.get(
+                            "memory.vector_storage.micro_batching"
+                            ".max_batch_size",
+                            64,
+                        ),
+                        max_wait_ms=config.get(
+                            "memory.vector_storage.micro_batching"
+                            ".max_wait_ms",
+                            2.0,
+                        ),
+                        name=model_name,
+                    )
+                self._models[key] = model
+                self._refcounts[key] = 0
+            else:
+                logger.info(f"Reusing loaded embedding model: {model_name}")
+            self._refcounts[key] += 1
+            return model
+
+    def release(
+        self,
+        model_name: str,
+        cache_folder: Optional[str] = None,
+        device: Optional[str] = None,
+        backend: Optional[str] = None,
+    ):
+        """Drops one reference to a model, unloading it when none remain."""
+        key = self._make_key(model_name, cache_folder, device, backend)
+        with self._lock:
+            if key not in self._refcounts:
+                return
+            self._refcounts[key] -= 1
+            if self._refcounts[key] <= 0:
+                self._unload_key(key)
+
+    def unload(
+        self,
+        model_name: str,
+        cache_folder: Optional[str] = None,
+        device: Optional[str] = None,
+        force: bool = False,
+        backend: Optional[str] = None,
+    ) -> bool:
+        """
+        Explicitly unloads a model.
+
+        Args:
+            model_name: Name of the model to unload
+            cache_folder: Cache folder used when acquiring the model
+            device: Device used when acquiring the model
+            force: Unload even if the model still has active references
+            backend: Backend used when acquiring the model
+
+        Returns:
+            True if the model was unloaded
+        """
+        key = self._make_key(model_name, cache_folder, device, backend)
+        with self._lock:
+            if key not in self._models:
+                return False
+            if self._refcounts.get(key, 0) > 0 and not force:
+                logger.warning(
+                    f"Not unloading embedding model {model_name}: still has"
+                    f" {self._refcounts[key]} active references."
+                )
+                return False
+            self._unload_key(key)
+            return True
+
+    def _unload_key(self, key: Tuple):
+        model = self._models.pop(key, None)
+        if isinstance(model, EmbeddingBatcher):
+            model.close()
+        self._refcounts.pop(key, None)
+        logger.info(f"Unloaded embedding model: {key[0]}")
+
+    def loaded_models(self) -> List[Dict[str, Any]]:
+        """Returns a summary of the currently loaded models."""
+        with self._lock:
+            return [
+                {
+                    "model_name": key[0],
+                    "cache_folder": key[1],
+                    "device": key[2],
+                    "backend": key[3],
+                    "refcount": self._refcounts.get(key, 0),
+                }
+                for key in self._models
+            ]
+
+    def batching_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the micro-batching metrics of every loaded model."""
+        with self._lock:
+            return {
+                f"{key[0]} ({key[3]})": model.stats()
+                for key, model in self._models.items()
+                if isinstance(model, EmbeddingBatcher)
+            }
+
+
+# Global registry instance
+model_registry = EmbeddingModelRegistry()
+
+
+def get_embedding_model(
+    model_name: str,
+    cache_folder: Optional[str] = None,
+    device: Optional[str] = None,
+    backend: Optional[str] = None,
+) -> "SentenceTransformer":
+    """Acquires a shared embedding model from the global registry."""
+    return model_registry.acquire(model_name, cache_folder, device, backend)
+
+
+def release_embedding_model(
+    model_name: str,
+    cache_folder: Optional[str] = None,
+    device: Optional[str] = None,
+    backend: Optional[str] = None,
+):
+    """Releases a model previously obtained with get_embedding_model()."""
+    model_registry.release(model_name, cache_folder, device, backend)
+
+
+def embedding_model_id(model, model_name: str) -> str:
+    """
+    Returns an identifier for the vectors a loaded model produces.
+
+    Vectors from the quantized ONNX encoder are close to, but not the same
+    as, the torch ones, so they get a distinct id wherever vectors are
+    cached or indexed.
+    """
+    backend = getattr(model, "encoder_backend", "torch")
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
@@ -19,19 +19,24 @@
 # Implementation of the "Generatively Reinforced Evolving Embeddings Network"
 # (GREEN) Memories Algorithm
 
+import hashlib
 import json
 import logging
 import os
 import math
 # import re
 import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 import threading
+import time
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 try:
-    from sentence_transformers import SentenceTransformer
-    from sentence_transformers.util import cos_sim
+    import sentence_transformers  # noqa: F401
 
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
@@ -41,10 +46,17 @@ from spacy.lang.en.stop_words import STOP_WORDS as SPACY_STOP_WORDS
 
 from ainara.framework.chat_memory import ChatMemory
 from ainara.framework.config import config
+from ainara.framework.embeddings import encode_cached, get_embedding_model
 from ainara.framework.llm.base import LLMBackend
+from ainara.framework.memory_mirror import (
+    MAX_REINFORCED_RELEVANCE,
+    MemoryMirror,
+    decay_epochs,
+)
+from ainara.framework.memory_retrieval_cache import RetrievalCache
+from ainara.framework.nlp import SUBSTANTIVE_POS, analyze_query, get_nlp
 from ainara.framework.storage import get_vector_backend
 from ainara.framework.template_manager import TemplateManager
-from ainara.framework.utils import load_spacy_model
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +64,162 @@ logger = logging.getLogger(__name__)
 # This acts as a low-pass filter to prune irrelevant memories from active recall.
 MIN_RELEVANCE_THRESHOLD = 0.2
 
+DEFAULT_SCORING_CONFIG = {
+    # A multiplier to boost the importance of key_memories during ranking.
+    "key_memory_boost": 1.5,
+    # The weight given to a memory's intrinsic relevance score versus its
+    # semantic similarity to the query. 0.3 means 30% relevance, 70% semantic.
+    "relevance_weight": 0.3,
+    # The penalty applied to memories marked as 'past' to de-prioritize them.
+    "past_memory_penalty": 0.5,
+    # The maximum boost applied to a memory that was just updated.
+    "max_recency_boost": 1.5,
+    # Controls how quickly the recency boost fades over time (in hours).
+    # A smaller value means the boost lasts longer.
+    "recency_decay_rate": 0.01,
+    # The initial relevance boost for a memory's first update within a session.
+    "session_relevance_increment": 1.0,
+    # The factor by which the boost is multiplied for each subsequent update
+    # in the same session.
+    "session_relevance_decay_rate": 0.5,
+}
+
+# Allowed (min, max) range of each scoring setting; None means unbounded
+SCORING_CONFIG_RANGES = {
+    "key_memory_boost": (0.0, None),
+    "relevance_weight": (0.0, 1.0),
+    "past_memory_penalty": (0.0, 1.0),
+    "max_recency_boost": (1.0, None),
+    "recency_decay_rate": (0.0, None),
+    "session_relevance_increment": (0.0, None),
+    "session_relevance_decay_rate": (0.0, 1.0),
+}
+
+
+def validate_scoring_config(overrides: Optional[Dict] = None) -> Dict:
+    """
+    Merges scoring overrides into the defaults and checks every value.
+    Unknown settings are logged and ignored.
+
+    Raises:
+        ValueError: On non-numeric or out-of-range values
+    """
+    overrides = overrides or {}
+    unknown = set(overrides) - set(DEFAULT_SCORING_CONFIG)
+    if unknown:
+        logger.warning(
+            "Ignoring unknown memory scoring settings:"
+            f" {', '.join(sorted(unknown))}"
+        )
+    scoring_config = {}
+    for key, default in DEFAULT_SCORING_CONFIG.items():
+        value = overrides.get(key, default)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(
+                f"Memory scoring setting '{key}' must be a number, got"
+                f" {value!r}"
+            )
+        low, high = SCORING_CONFIG_RANGES[key]
+        if value < low or (high is not None and value > high):
+            raise ValueError(
+                f"Memory scoring setting '{key}' must be within"
+                f" [{low}, {high if high is not None else 'inf'}], got {value}"
+            )
+        scoring_config[key] = float(value)
+    return scoring_config
+
+
+def _timestamp_seconds(value: Optional[str]) -> float:
+    """
+    Epoch seconds of an ISO timestamp, or NaN if it can't be parsed.
+
+    Naive timestamps are taken as UTC, like the ones memories are written
+    with, rather than as local time.
+    """
+    if not value:
+        return math.nan
+    try:
+        dt_object = datetime.fromisoformat(value)
+        if dt_object.tzinfo is None:
+            dt_object = dt_object.replace(tzinfo=timezone.utc)
+        return dt_object.timestamp()
+    except (ValueError, TypeError):
+        logger.warning(f"Could not parse last_updated timestamp: {value}")
+        return math.nan
+
+
+def score_memory_candidates(
+    scoring_config: Dict,
+    distances: np.ndarray,
+    relevances: np.ndarray,
+    is_key: np.ndarray,
+    topic_match: np.ndarray,
+    is_past: np.ndarray,
+    last_updated_ts: np.ndarray,
+    now: float,
+) -> np.ndarray:
+    """
+    Computes the combined ranking score of all memory candidates at once.
+
+    Args:
+        scoring_config: Validated scoring settings
+        distances: Squared L2 distances from the vector search
+        relevances: Current relevance of each memory
+        is_key: Whether each memory is a key memory
+        topic_match: Whether each memory's topic is currently relevant
+        is_past: Whether each memory is marked as past
+        last_updated_ts: Update times in epoch seconds (NaN if unknown)
+        now: Current time in epoch seconds
+
+    Returns:
+        The scores, higher is better
+    """
+    boost = scoring_config["key_memory_boost"]
+    weight = scoring_config["relevance_weight"]
+
+    relevances = relevances * np.where(is_key, boost, 1.0)
+    # Boost relevance if the memory's topic is currently active
+    relevances = relevances * np.where(topic_match, boost, 1.0)
+
+    # For normalized vectors, cosine similarity can be calculated from
+    # squared L2 distance using: 1 - (distance / 2)
+    semantic_scores = 1 - distances / 2
+    scores = semantic_scores * (1 - weight) + relevances * weight
+
+    # Recency boost, fading with the hours since the last update
+    hours_since_update = (now - last_updated_ts) / 3600
+    recency_boost = 1 + (scoring_config["max_recency_boost"] - 1) * np.exp(
+        -scoring_config["recency_decay_rate"] * hours_since_update
+    )
+    scores = scores * np.where(np.isnan(recency_boost), 1.0, recency_boost)
+
+    # Demote past memories in ranking so current ones are preferred.
+    return scores * np.where(
+        is_past, scoring_config["past_memory_penalty"], 1.0
+    )
+
+
+# Placeholders the summary generators return when the LLM call fails
+PROFILE_SUMMARY_FAILED = "User profile couldn't be generated"
+RECENT_SUMMARY_FAILED = "Recent memories summary couldn't be generated"
+
+# db_metadata keys of the cached summaries
+SUMMARY_CACHE_KEYS = {
+    "user_profile": "summary_cache_user_profile",
+    "recent_memories": "summary_cache_recent_memories",
+}
+
+# Memory fields retrieval reads from the vector store metadata
+VECTOR_METADATA_FIELDS = {
+    "id",
+    "memory_type",
+    "topic",
+    "memory",
+    "status",
+    "created_at",
+    "last_updated",
+}
+
 # Define a set of stopwords for normalization.
 # We use spaCy's list and can extend it if needed.
 STOPWORDS = set(SPACY_STOP_WORDS)
@@ -64,43 +232,57 @@ class GREENMemories:
         self,
         llm: LLMBackend,
         chat_memory: ChatMemory,
+        background_warm_up: bool = False,
     ):
+        """
+        Sets up the memories from SQLite; cheap enough to run at startup.
+
+        Loading spaCy, the embedding model and the vector store, and
+        syncing the vector store, is done by _warm_up(): here, or on a
+        background thread if background_warm_up is set. Until it's done,
+        contextual retrieval returns nothing and profile updates wait;
+        `ready` is a future resolved when it finishes.
+        """
         self.llm = llm
         self.chat_memory = chat_memory
         self.storage = chat_memory.storage
         self.template_manager = TemplateManager()
         self.context_window = llm.get_context_window() or 4096  # default 4k
-        self.scoring_config = {
-            # A multiplier to boost the importance of key_memories during ranking.
-            "key_memory_boost": 1.5,
-            # The weight given to a memory's intrinsic relevance score versus its
-            # semantic similarity to the query. 0.3 means 30% relevance, 70% semantic.
-            "relevance_weight": 0.3,
-            # The penalty applied to memories marked as 'past' to de-prioritize them.
-            "past_memory_penalty": 0.5,
-            # The maximum boost applied to a memory that was just updated.
-            "max_recency_boost": 1.5,
-            # Controls how quickly the recency boost fades over time (in hours).
-            # A smaller value means the boost lasts longer.
-            "recency_decay_rate": 0.01,
-            # The initial relevance boost for a memory's first update within a session.
-            "session_relevance_increment": 1.0,
-            # The factor by which the boost is multiplied for each subsequent update
-            # in the same session.
-            "session_relevance_decay_rate": 0.5,
-        }
-        self.nlp = load_spacy_model()
+        self.scoring_config = validate_scoring_config(
+            config.get("user_profile.green_memories.scoring", {})
+        )
         self._db_lock = threading.Lock()
         self.extraction_context_turns = config.get(
             "user_profile.green_memories.extraction_context_turns", 2
         )
-        if not self.nlp:
-            # spaCy is a critical dependency for substantive query analysis.
-            raise RuntimeError(
-                "Failed to load spaCy model, which is essential for"
-                " GREENMemories."
+        # Concurrent turn planning of process_new_messages_for_update
+        self.assimilation_max_workers = max(
+            1,
+            int(
+                config.get(
+                    "user_profile.green_memories.assimilation.max_workers", 4
+                )
+            ),
+        )
+        # Batched planning: consecutive turns share one LLM call, up to a
+        # budget of conversation tokens (1 turn disables batching)
+        self.batch_max_turns = max(
+            1,
+            int(
+                config.get(
+                    "user_profile.green_memories.assimilation.batch.max_turns",
+                    1,
+                )
+            ),
+        )
+        self.batch_max_tokens = int(
+            config.get(
+                "user_profile.green_memories.assimilation.batch.max_tokens",
+                2000,
             )
-
+        )
+        self._assimilation_lock = threading.Lock()
+        self._assimilation_status = {"running": False, "processed": 0, "total": 0}
         # This path is only needed for the one-time migration
         self.profile_path = os.path.join(
             config.get("data.directory"), "user_profile.json"
@@ -109,9 +291,43 @@ class GREENMemories:
         # Setup database / load key memories
         self._create_memories_table()
         self._update_schema()
+        # In-process copy of user_memories serving the per-turn reads; every
+        # write below goes to SQLite first and then to the mirror
+        self.memories = MemoryMirror()
+        self._load_memory_mirror()
+        # Summaries of the memories are cached with the memory version they
+        # were generated from; any memory write bumps the version
+        self._summary_lock = threading.Lock()
+        self._memory_version = int(
+            self.storage.get_metadata("memory_version") or 0
+        )
+        self._summary_cache = self._load_summary_cache()
+        self._summaries_refreshing = set()
+        self._summary_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="MemorySummaryThread"
+        )
+        # Contextual retrievals reused by close follow-up queries
+        self.retrieval_cache = None
+        if config.get(
+            "user_profile.green_memories.retrieval_cache.enabled", True
+        ):
+            self.retrieval_cache = RetrievalCache(
+                similarity_threshold=config.get(
+                    "user_profile.green_memories.retrieval_cache"
+                    ".similarity_threshold",
+                    0.95,
+                ),
+                max_entries=config.get(
+                    "user_profile.green_memories.retrieval_cache.max_entries",
+                    4,
+                ),
+            )
         self.all_key_memories = self.get_key_memories()
-        # Cache all topics on initialization to avoid repeated DB queries
+        # Cache all topics on initialization to avoid repeated DB queries.
+        # The list is kept in sync with the topic embedding index below.
         self.all_topics = self.get_all_topics()
+        self._topic_embeddings = None
+        self._topic_index_lock = threading.Lock()
         logger.info(f"Cached {len(self.all_topics)} unique memory topics.")
 
         # Check if we need to force a full rescan of chat history
@@ -120,6 +336,91 @@ class GREENMemories:
         # # Run a one-time migration from the old JSON file if it exists
         # self._run_migration()
 
+        # Loaded by _warm_up()
+        self.nlp = None
+        self.topic_matcher_model = None
+        self.embedding_model_name = None
+        self.vector_storage = None
+        self.ready = Future()
+        self._warm_up_status = {
+            "state": "pending",
+            "seconds": None,
+            "error": None,
+        }
+        if background_warm_up:
+            self.start_warm_up()
+        else:
+            self._warm_up()
+
+    def start_warm_up(self) -> Future:
+        """Runs _warm_up() on a daemon thread; returns the `ready` future."""
+        threading.Thread(
+            target=self._run_warm_up, name="MemoryWarmUpThread", daemon=True
+        ).start()
+        return self.ready
+
+    def _run_warm_up(self):
+        try:
+            self._warm_up()
+        except Exception:
+            # Logged and recorded in the status by _warm_up()
+            pass
+
+    def _warm_up(self):
+        """
+        Loads spaCy, the embedding model and the vector store, and syncs the
+        vector store with SQLite if needed. Resolves `ready`.
+        """
+        self._warm_up_status["state"] = "warming_up"
+        start_time = time.perf_counter()
+        try:
+            self._load_models_and_vector_store()
+        except Exception as e:
+            self._warm_up_status.update(
+                state="failed",
+                seconds=round(time.perf_counter() - start_time, 3),
+                error=str(e),
+            )
+            logger.error(f"Memory warm-up failed: {e}")
+            self.ready.set_exception(e)
+            raise
+        self._warm_up_status.update(
+            state="ready", seconds=round(time.perf_counter() - start_time, 3)
+        )
+        logger.info(
+            "Memory warm-up complete in"
+            f" {self._warm_up_status['seconds']:.2f}s."
+        )
+        self.ready.set_result(True)
+
+    def is_ready(self) -> bool:
+        """True once the warm-up finished, successfully or not."""
+        return self.ready.done()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Waits for the warm-up; returns whether it succeeded in time."""
+        try:
+            self.ready.result(timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    def get_warm_up_status(self) -> Dict[str, Any]:
+        """Returns the warm-up state: pending, warming_up, ready or failed."""
+        return dict(self._warm_up_status)
+
+    def _load_models_and_vector_store(self):
+        # View over the shared spaCy pipeline for memory text normalization;
+        # queries go through the shared per-turn analysis instead
+        nlp = get_nlp("lemmas")
+        if not nlp:
+            # spaCy is a critical dependency for substantive query analysis.
+            raise RuntimeError(
+                "Failed to load spaCy model, which is essential for"
+                " GREENMemories."
+            )
+        self.nlp = nlp
+
         # Initialize vector storage for memories
         vector_type = config.get(
             "user_profile.vector_storage.type",
@@ -141,16 +442,20 @@ class GREENMemories:
         )
 
         # Topic matching model for memory boosting
-        self.topic_matcher_model = None
+        self.embedding_model_name = embedding_model
         if SENTENCE_TRANSFORMERS_AVAILABLE:
             try:
-                self.topic_matcher_model = SentenceTransformer(
+                self.topic_matcher_model = get_embedding_model(
                     embedding_model,
                     cache_folder=config.get("cache.directory")
                 )
                 logger.info(f"Loaded topic matcher model: {embedding_model}")
             except Exception as e:
                 logger.error(f"Failed to load topic matcher model: {e}")
+            try:
+                self._build_topic_index()
+            except Exception as e:
+                logger.error(f"Failed to build topic embedding index: {e}")
         elif not SENTENCE_TRANSFORMERS_AVAILABLE:
             logger.warning(
                 "sentence_transformers library not found. Topic-based memory "
@@ -176,26 +481,39 @@ class GREENMemories:
 
             # Second, check for count mismatch to detect manual deletion or corruption.
             # This assumes a `count()` method is added to the vector storage backend.
-            with self.storage.conn:
-                sqlite_count = self.storage.conn.execute(
-                    "SELECT COUNT(id) FROM user_memories"
-                ).fetchone()[0]
+            sqlite_count = self.memories.count()
             vector_count = self.vector_storage.count()
 
-            if needs_reset == "true" or sqlite_count != vector_count:
+            needs_rebuild = self.storage.get_metadata(
+                "vector_db_needs_rebuild"
+            )
+
+            if needs_rebuild == "true" or self.vector_storage.needs_reindex:
+                # Every vector has to be recomputed, a diff can't help
+                if needs_rebuild == "true":
+                    logger.info(
+                        "Vector DB rebuild requested. Starting full sync..."
+                    )
+                else:
+                    logger.info(
+                        "Vector DB was indexed with a different embedding"
+                        " encoder. Starting full sync..."
+                    )
+                self.rebuild_profile_vector_store()
+            elif needs_reset == "true" or sqlite_count != vector_count:
                 if needs_reset == "true":
                     logger.info(
-                        "Vector DB needs reset due to explicit flag. Starting"
-                        " full sync..."
+                        "Vector DB needs reset due to explicit flag."
+                        " Reconciling with SQLite..."
                     )
                 else:
                     logger.warning(
                         "Mismatch detected between SQLite"
                         f" ({sqlite_count} memories) and Vector DB"
                         f" ({vector_count} memories). This can happen after a"
-                        " manual deletion. Triggering re-sync."
+                        " manual deletion. Reconciling with SQLite..."
                     )
-                self._sync_profile_to_vector_store()
+                self._reconcile_profile_vector_store()
             else:
                 logger.info(
                     "Vector DB is consistent with SQLite"
@@ -225,8 +543,8 @@ class GREENMemories:
     def _create_memories_table(self):
         """Creates the user_memories table in the database if it doesn't exist."""
         try:
-            with self.storage.conn:
-                self.storage.conn.execute(
+            with self.storage.write() as conn:
+                conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS user_memories (
                         id TEXT PRIMARY KEY,
@@ -241,11 +559,11 @@ class GREENMemories:
                     )
                     """
                 )
-                self.storage.conn.execute(
+                conn.execute(
                     "CREATE INDEX IF NOT EXISTS idx_memories_topic ON"
                     " user_memories(topic);"
                 )
-                self.storage.conn.execute(
+                conn.execute(
                     "CREATE INDEX IF NOT EXISTS idx_memories_type ON"
                     " user_memories(memory_type);"
                 )
@@ -346,8 +664,8 @@ class GREENMemories:
                 )
                 # Instead of setting to None which violates the NOT NULL constraint,
                 # we delete the metadata key directly.
-                with self.storage.conn:
-                    self.storage.conn.execute(
+                with self.storage.write() as conn:
+                    conn.execute(
                         "DELETE FROM db_metadata WHERE key = ?",
                         ("profile_last_processed_timestamp",),
                     )
@@ -360,7 +678,7 @@ class GREENMemories:
     def _update_schema(self):
         """Adds new columns to the user_memories table if they don't exist."""
         try:
-            with self.storage.conn:
+            with self.storage.write() as conn:
                 # # !!!! Force reset !!!
                 # self.storage.set_metadata("vector_db_needs_reset", "true")
                 # logger.info(
@@ -368,7 +686,7 @@ class GREENMemories:
                 #     " change."
                 # )
                 # # !!!!!!!!!!!!!!!!!!!
-                cursor = self.storage.conn.cursor()
+                cursor = conn.cursor()
                 cursor.execute("PRAGMA table_info(user_memories)")
                 columns = [row[1] for row in cursor.fetchall()]
 
@@ -412,6 +730,18 @@ class GREENMemories:
                     )
                     logger.info("Schema update complete.")
 
+                if "decay_epoch" not in columns:
+                    logger.info(
+                        "Adding 'decay_epoch' column to user_memories table."
+                    )
+                    # Existing relevances are taken as of epoch 0, the
+                    # initial global decay epoch
+                    cursor.execute(
+                        "ALTER TABLE user_memories ADD COLUMN decay_epoch"
+                        " REAL NOT NULL DEFAULT 0"
+                    )
+                    logger.info("Schema update complete.")
+
                 # This is now safe to run in all cases, as the column is guaranteed to exist.
                 cursor.execute(
                     "CREATE INDEX IF NOT EXISTS idx_memories_status ON"
@@ -437,10 +767,120 @@ class GREENMemories:
                     memory[key] = None
         return memory
 
-    def _sync_profile_to_vector_store(self):
-        import time
+    def _load_memory_mirror(self):
+        """Loads the whole user_memories table into the in-memory mirror."""
+        epoch = float(self.storage.get_metadata("memory_decay_epoch") or 0)
+        cursor = self.storage.reader().cursor()
+        cursor.execute("SELECT * FROM user_memories")
+        self.memories.load(
+            (self._dict_from_row(row) for row in cursor), epoch=epoch
+        )
+        logger.info(f"Loaded {self.memories.count()} memories into memory.")
+
+    def _memory_documents(self, memories: List[Dict]) -> List[Dict]:
+        """
+        Builds vector store documents for memories that have text.
+
+        Only the embedded text is normalized. The metadata is a copy of the
+        memory plus `last_updated_ts`, the update time in epoch seconds, so
+        ranking doesn't have to parse timestamps.
+        """
+        memories = [memory for memory in memories if memory.get("memory", "")]
+        normalized_contents = self._normalize_memory_texts(
+            [memory["memory"] for memory in memories]
+        )
+        documents = []
+        for memory, normalized_content in zip(memories, normalized_contents):
+            metadata = memory.copy()
+            last_updated_ts = _timestamp_seconds(memory.get("last_updated"))
+            if not math.isnan(last_updated_ts):
+                metadata["last_updated_ts"] = last_updated_ts
+            documents.append(
+                {"page_content": normalized_content, "metadata": metadata}
+            )
+        return documents
+
+    @staticmethod
+    def _memory_fingerprint(memory: Dict) -> tuple:
+        """
+        What must match between a memory and its vector store copy:
+        the text (hashed), when it was last updated and its status.
+        """
+        content_hash = hashlib.sha1(
+            str(memory.get("memory", "")).encode("utf-8")
+        ).hexdigest()
+        return (
+            content_hash,
+            memory.get("last_updated"),
+            memory.get("status", "current"),
+        )
+
+    def _reconcile_profile_vector_store(self, batch_size: int = 64):
+        """
+        Brings the memory vector index in line with the profile by diffing
+        the two and re-embedding or deleting only what differs.
+        """
+        if not self.vector_storage:
+            logger.debug(
+                "Vector storage not available, skipping profile sync."
+            )
+            return
+
+        if not getattr(
+            self.vector_storage, "supports_metadata_listing", False
+        ):
+            # The backend can't list its documents, so it can't be diffed
+            self.rebuild_profile_vector_store()
+            return
+
+        indexed = self.vector_storage.get_all_metadata()
+
+        start_time = time.time()
+        memories = {
+            memory["id"]: memory
+            for memory in self.memories.all()
+            if memory.get("memory", "")
+        }
+        # Memories missing from the index, outdated there, or indexed before
+        # some of the fields retrieval reads existed
+        to_upsert = [
+            memory
+            for memory_id, memory in memories.items()
+            if memory_id not in indexed
+            or self._memory_fingerprint(memory)
+            != self._memory_fingerprint(indexed[memory_id])
+            or not VECTOR_METADATA_FIELDS.issubset(indexed[memory_id])
+        ]
+        to_delete = [
+            memory_id for memory_id in indexed if memory_id not in memories
+        ]
+
+        for start in range(0, len(to_delete), batch_size):
+            self.vector_storage.delete(to_delete[start:start + batch_size])
+        for start in range(0, len(to_upsert), batch_size):
+            self.vector_storage.upsert_documents(
+                self._memory_documents(to_upsert[start:start + batch_size])
+            )
+
+        duration = time.time() - start_time
+        logger.info(
+            f"Reconciled memory vector store: {len(to_upsert)} upserted,"
+            f" {len(to_delete)} deleted,"
+            f" {len(memories) - len(to_upsert)} unchanged. Operation took"
+            f" {duration:.2f} seconds."
+        )
+
+        self.storage.set_metadata("vector_db_needs_reset", "false")
+
+    def rebuild_profile_vector_store(self):
+        """
+        Clears and rebuilds the memory vector index from the profile.
 
-        """Clears and rebuilds the memory vector index from the profile."""
+        This re-embeds every memory. It is what encoder changes need; for
+        other inconsistencies the startup reconciliation is enough. To have
+        it run at the next startup, set the 'vector_db_needs_rebuild'
+        metadata flag (see scripts/rebuild_memory_vectors.py).
+        """
         if not self.vector_storage:
             logger.debug(
                 "Vector storage not available, skipping profile sync."
@@ -451,36 +891,24 @@ class GREENMemories:
         logger.info("Syncing user profile memories to vector store...")
         self.vector_storage.reset()  # Clear the collection
 
-        cursor = self.storage.conn.cursor()
-        cursor.execute("SELECT * FROM user_memories")
-        all_memories = [self._dict_from_row(row) for row in cursor.fetchall()]
+        all_memories = self.memories.all()
 
         if not all_memories:
             logger.info("No memories found in profile to index.")
-            return
-
-        documents_to_add = []
-        for memory in all_memories:
-            content = memory.get("memory", "")
-            if not content:
-                continue
-            metadata = memory.copy()
-            normalized_content = self._normalize_memory_text(content)
-            documents_to_add.append(
-                {"page_content": normalized_content, "metadata": metadata}
-            )
-
-        if documents_to_add:
-            self.vector_storage.add_documents(documents_to_add)
-            duration = time.time() - start_time
-            logger.info(
-                f"Successfully indexed {len(documents_to_add)}"
-                " memories in vector store. Operation took"
-                f" {duration:.2f} seconds."
-            )
+        else:
+            documents_to_add = self._memory_documents(all_memories)
+            if documents_to_add:
+                self.vector_storage.add_documents(documents_to_add)
+                duration = time.time() - start_time
+                logger.info(
+                    f"Successfully indexed {len(documents_to_add)}"
+                    " memories in vector store. Operation took"
+                    f" {duration:.2f} seconds."
+                )
 
-        # After a successful sync, clear the flag
+        # After a successful sync, clear the flags
         self.storage.set_metadata("vector_db_needs_reset", "false")
+        self.storage.set_metadata("vector_db_needs_rebuild", "false")
         logger.info("Vector DB sync complete. Cleared reset flag.")
 
     def _is_query_substantive(self, query: str) -> bool:
@@ -495,22 +923,24 @@ class GREENMemories:
         # Strip any "role: " prefix (e.g., "user: ") from the last line.
         actual_query = last_line.split(":", 1)[-1].strip()
 
-        doc = self.nlp(actual_query)
         logger.info(
             f"Substantive check on query: '{actual_query}' (from last line:"
             f" '{last_line}')"
         )
 
-        # Define parts of speech that we consider substantive for a query.
-        substantive_pos = {"NOUN", "PROPN", "VERB", "ADJ"}
-        for token in doc:
-            logger.debug(f"  - Token: '{token.text}', POS: {token.pos_}")
-            if token.pos_ in substantive_pos:
-                logger.info(
-                    f"Found substantive token '{token.text}' ({token.pos_})."
-                    " Returning True."
-                )
-                return True
+        # Reuse the turn's analysis when the chat manager already parsed it
+        analysis = analyze_query(actual_query)
+        if analysis is None:
+            return False
+        if analysis.is_substantive:
+            token = next(
+                t for t in analysis.doc if t.pos_ in SUBSTANTIVE_POS
+            )
+            logger.info(
+                f"Found substantive token '{token.text}' ({token.pos_})."
+                " Returning True."
+            )
+            return True
         # If no such token was found, the query is not substantive.
         logger.info("No substantive tokens found. Returning False.")
         return False
@@ -577,7 +1007,7 @@ class GREENMemories:
                 f"Generated user profile summary: {profile_summary[:150]}..."
             )
         except Exception:
-            profile_summary = "User profile couldn't be generated"
+            profile_summary = PROFILE_SUMMARY_FAILED
             logger.error(profile_summary)
 
         return profile_summary
@@ -618,19 +1048,7 @@ class GREENMemories:
         )
 
         # Fetch recent memories
-        query = (
-            "SELECT * FROM user_memories WHERE status = 'current' ORDER BY"
-            " last_updated DESC"
-        )
-        params = ()
-
-        if top_k is not None:
-            query += " LIMIT ?"
-            params += (top_k,)
-
-        cursor = self.storage.conn.cursor()
-        cursor.execute(query, params)
-        recent_memories = [self._dict_from_row(row) for row in cursor.fetchall()]
+        recent_memories = self.memories.most_recent(top_k, status="current")
 
         if not recent_memories:
             logger.info("No recent memories found to generate a summary.")
@@ -654,11 +1072,123 @@ class GREENMemories:
                 f"Generated recent memories summary: {recent_summary[:150]}..."
             )
         except Exception:
-            recent_summary = "Recent memories summary couldn't be generated"
+            recent_summary = RECENT_SUMMARY_FAILED
             logger.error(recent_summary)
 
         return recent_summary
 
+    def _load_summary_cache(self) -> Dict[str, Dict]:
+        """Loads the cached summaries persisted by previous runs."""
+        cache = {}
+        for name, key in SUMMARY_CACHE_KEYS.items():
+            value = self.storage.get_metadata(key)
+            if not value:
+                continue
+            try:
+                cache[name] = json.loads(value)
+            except json.JSONDecodeError:
+                logger.warning(f"Discarding unreadable cached {name} summary.")
+        return cache
+
+    def _bump_memory_version(self):
+        """
+        Marks the cached summaries and memory retrievals as stale after a
+        memory write.
+        """
+        with self._summary_lock:
+            self._memory_version += 1
+            version = self._memory_version
+        if self.retrieval_cache:
+            self.retrieval_cache.clear()
+        self.storage.set_metadata("memory_version", str(version))
+
+    def get_user_profile_summary(
+        self, wait_if_missing: bool = False
+    ) -> Optional[str]:
+        """
+        Returns the last good narrative user profile summary.
+
+        A summary generated from an older version of the memories is still
+        returned, while a fresh one is generated in the background.
+
+        Args:
+            wait_if_missing: If no summary was ever generated, generate it
+                             now instead of in the background
+        """
+        return self._get_cached_summary(
+            "user_profile",
+            self.generate_user_profile_summary,
+            PROFILE_SUMMARY_FAILED,
+            wait_if_missing,
+        )
+
+    def get_recent_memories_summary(
+        self, wait_if_missing: bool = False
+    ) -> Optional[str]:
+        """
+        Returns the last good summary of recent memories.
+
+        Works like get_user_profile_summary().
+        """
+        return self._get_cached_summary(
+            "recent_memories",
+            self.generate_recent_memories_summary,
+            RECENT_SUMMARY_FAILED,
+            wait_if_missing,
+        )
+
+    def _get_cached_summary(
+        self, name, generate, failed_text, wait_if_missing
+    ) -> Optional[str]:
+        with self._summary_lock:
+            entry = self._summary_cache.get(name)
+            version = self._memory_version
+            stale = entry is None or (
+                entry.get("version") != version
+                or entry.get("context_window") != self.context_window
+            )
+            refresh = stale and name not in self._summaries_refreshing
+            if refresh:
+                self._summaries_refreshing.add(name)
+
+        if refresh:
+            if entry is None and wait_if_missing:
+                self._refresh_summary(name, generate, failed_text, version)
+                entry = self._summary_cache.get(name)
+            else:
+                self._summary_executor.submit(
+                    self._refresh_summary, name, generate, failed_text, version
+                )
+        return entry.get("summary") if entry else None
+
+    def _refresh_summary(self, name, generate, failed_text, version):
+        """Generates a summary and caches it, unless generation failed."""
+        try:
+            context_window = self.context_window
+            summary = generate()
+            if summary == failed_text:
+                logger.warning(
+                    f"Keeping the previous {name} summary after a failed"
+                    " generation."
+                )
+                return
+            entry = {
+                "version": version,
+                "context_window": context_window,
+                "summary": summary,
+            }
+            with self._summary_lock:
+                self._summary_cache[name] = entry
+            self.storage.set_metadata(
+                SUMMARY_CACHE_KEYS[name], json.dumps(entry)
+            )
+            logger.info(f"Cached {name} summary for memory version {version}.")
+        except Exception as e:
+            logger.error(f"Failed to refresh {name} summary: {e}")
+        finally:
+            with self._summary_lock:
+                self._summaries_refreshing.discard(name)
+
     def get_key_memories(
         self,
         limit: Optional[int] = None,
@@ -668,81 +1198,151 @@ class GREENMemories:
         Returns a flat list of key memories from the database, optionally limited.
         Key memories are sorted by relevance in descending order.
         """
-        query = (
-            "SELECT * FROM user_memories WHERE memory_type = 'key_memories'"
-            " AND status = 'current' AND relevance >= ? ORDER BY relevance"
-            " DESC"
+        return self.memories.top_by_relevance(
+            limit,
+            memory_type="key_memories",
+            status="current",
+            min_relevance=(
+                MIN_RELEVANCE_THRESHOLD if low_pass_filter else None
+            ),
         )
-        if low_pass_filter:
-            params = (MIN_RELEVANCE_THRESHOLD,)
-        else:
-            params = ()
-
-        if limit is not None:
-            query += " LIMIT ?"
-            params += (limit,)
-
-        cursor = self.storage.conn.cursor()
-        cursor.execute(query, params)
-        return [self._dict_from_row(row) for row in cursor.fetchall()]
 
     def is_empty(self) -> bool:
         """Checks if the user profile contains any memories."""
-        try:
-            cursor = self.storage.conn.cursor()
-            # We just need to know if at least one row exists.
-            cursor.execute("SELECT 1 FROM user_memories LIMIT 1")
-            return cursor.fetchone() is None
-        except Exception as e:
-            logger.error(f"Failed to check if profile is empty: {e}")
-            return False  # Safer to assume not empty on error
+        return self.memories.count() == 0
 
     def get_all_topics(self) -> List[str]:
-        """Retrieves a unique list of all topics from the user_memories table."""
+        """Retrieves a unique list of all current memory topics."""
+        return self.memories.topics(status="current")
+
+    def _embed_topics(self, topics: List[str]) -> np.ndarray:
+        """Embeds topics into an L2-normalized float32 matrix."""
+        embeddings = encode_cached(
+            self.topic_matcher_model, self.embedding_model_name, topics
+        )
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def _build_topic_index(self):
+        """
+        Builds the topic embedding matrix for all current topics.
+
+        Topic vectors go through the persistent embedding cache, so after a
+        restart this is a disk read rather than a full re-encode.
+        """
+        if not self.topic_matcher_model:
+            return
+        topics = self.get_all_topics()
+        embeddings = self._embed_topics(topics) if topics else None
+        with self._topic_index_lock:
+            self.all_topics = topics
+            self._topic_embeddings = embeddings
+        logger.info(f"Built topic embedding index for {len(topics)} topics.")
+
+    def _add_topic_to_index(self, topic: Optional[str]):
+        """Adds a topic to the embedding index if it isn't indexed yet."""
+        if not topic or not self.topic_matcher_model:
+            return
+        if topic in self.all_topics:
+            return
         try:
-            with self.storage.conn:
-                cursor = self.storage.conn.cursor()
-                cursor.execute(
-                    "SELECT DISTINCT topic FROM user_memories WHERE status ="
-                    " 'current'"
+            embedding = self._embed_topics([topic])
+        except Exception as e:
+            logger.error(f"Failed to embed new topic '{topic}': {e}")
+            return
+        with self._topic_index_lock:
+            if topic in self.all_topics:
+                return
+            # Replace rather than mutate, so readers holding the previous
+            # list/matrix pair keep a consistent snapshot.
+            if self._topic_embeddings is None:
+                self._topic_embeddings = embedding
+            else:
+                self._topic_embeddings = np.vstack(
+                    [self._topic_embeddings, embedding]
                 )
-                topics = [row[0] for row in cursor.fetchall()]
-                return topics
+            self.all_topics = self.all_topics + [topic]
+        logger.info(f"Added new topic '{topic}' to topic embedding index.")
+
+    def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        """
+        Embeds a retrieval query once, so topic boosting and the vector
+        search can share the vector. Returns None without a model.
+
+        Not stored in the persistent embedding cache: the query is built
+        from the latest turns and is rarely seen again.
+        """
+        if not self.topic_matcher_model:
+            return None
+        try:
+            return np.asarray(
+                self.topic_matcher_model.encode([query]), dtype=np.float32
+            )[0]
         except Exception as e:
-            logger.error(f"Failed to retrieve memory topics: {e}")
-            return []
+            logger.error(f"Failed to embed retrieval query: {e}")
+            return None
+
+    def _search_memories(
+        self,
+        query: str,
+        limit: int,
+        filter_dict: Optional[Dict] = None,
+        query_embedding: Optional[np.ndarray] = None,
+    ) -> List[tuple]:
+        """
+        Vector search over memories, reusing a precomputed query embedding
+        when the vector store embeds with the same model.
+        """
+        if (
+            query_embedding is not None
+            and getattr(self.vector_storage, "supports_vector_search", False)
+            and getattr(self.vector_storage, "embedding_model_name", None)
+            == self.embedding_model_name
+        ):
+            return self.vector_storage.search_by_vector(
+                query_embedding, limit=limit, filter_dict=filter_dict
+            )
+        return self.vector_storage.search_with_scores(
+            query, limit=limit, filter_dict=filter_dict
+        )
 
     def get_relevant_topics_for_context(
-        self, context: str, threshold: float = 0.3
+        self,
+        context: str,
+        threshold: float = 0.3,
+        context_embedding: Optional[np.ndarray] = None,
     ) -> List[str]:
         """
         Identifies relevant memory topics for a given conversation context using
         semantic similarity.
+
+        Args:
+            context: The conversation context
+            threshold: Minimum cosine similarity for a topic to be relevant
+            context_embedding: Optional precomputed embedding of the context
         """
         if not self.topic_matcher_model:
             return []
 
-        all_topics = self.all_topics
-        if not all_topics:
+        with self._topic_index_lock:
+            all_topics = self.all_topics
+            topic_embeddings = self._topic_embeddings
+        if not all_topics or topic_embeddings is None:
             return []
 
         logger.info("Checking relevant topics...")
 
         try:
-            context_embedding = self.topic_matcher_model.encode(
-                context, convert_to_tensor=True
-            )
-            topic_embeddings = self.topic_matcher_model.encode(
-                all_topics, convert_to_tensor=True
+            if context_embedding is None:
+                context_embedding = self._embed_query(context)
+                if context_embedding is None:
+                    return []
+            context_embedding = context_embedding / max(
+                float(np.linalg.norm(context_embedding)), 1e-12
             )
+            similarities = topic_embeddings @ context_embedding
 
-            similarities = cos_sim(context_embedding, topic_embeddings)
-
-            relevant_indices = (
-                (similarities[0] > threshold)
-                .nonzero(as_tuple=True)[0]
-                .tolist()
-            )
+            relevant_indices = np.nonzero(similarities > threshold)[0]
             relevant_topics = [all_topics[i] for i in relevant_indices]
 
             return relevant_topics
@@ -752,10 +1352,8 @@ class GREENMemories:
             )
             return []
 
-    def _normalize_memory_text(self, text: str) -> str:
-        """Cleans and normalizes memory text using spaCy for better duplicate detection."""
-        text = text.lower()  # Lowercase first
-        doc = self.nlp(text)
+    def _normalize_doc(self, doc, text: str) -> str:
+        """Builds the normalized text from an already processed spaCy Doc."""
         normalized_tokens = []
         for token in doc:
             if (
@@ -769,6 +1367,19 @@ class GREENMemories:
             normalized_text if normalized_text else text
         )  # Fallback to original if empty
 
+    def _normalize_memory_text(self, text: str) -> str:
+        """Cleans and normalizes memory text using spaCy for better duplicate detection."""
+        text = text.lower()  # Lowercase first
+        return self._normalize_doc(self.nlp(text), text)
+
+    def _normalize_memory_texts(self, texts: List[str]) -> List[str]:
+        """Batched version of _normalize_memory_text for bulk callers."""
+        lowered = [text.lower() for text in texts]
+        return [
+            self._normalize_doc(doc, text)
+            for doc, text in zip(self.nlp.pipe(lowered), lowered)
+        ]
+
     def get_relevant_memories(
         self,
         query: str,
@@ -781,14 +1392,14 @@ class GREENMemories:
         It combines the most important 'key memories' (reflex) with memories
         found via semantic search (contextual).
         """
-        relevant_topics = []
-        if topic_boost:
-            relevant_topics = self.get_relevant_topics_for_context(query)
-            if relevant_topics:
-                logger.info(
-                    "Identified relevant topics via semantic search:"
-                    f" {relevant_topics}"
-                )
+        if not self.wait_until_ready(timeout=0):
+            logger.info(
+                "Memory warm-up is"
+                f" {self._warm_up_status['state']}, skipping contextual"
+                " memory retrieval."
+            )
+            return []
+
         if not self.vector_storage:
             raise RuntimeError(
                 "Vector storage is required for memory retrieval."
@@ -801,6 +1412,9 @@ class GREENMemories:
             )
             return []
 
+        # Embed the query once for both topic boosting and the vector search
+        query_embedding = self._embed_query(query)
+
         if top_k is None:
             # Dynamically determine top_k for memories based on context window
             if self.context_window <= 4096:
@@ -817,102 +1431,81 @@ class GREENMemories:
             )
 
         try:
-            # Fetch more results initially to allow for re-ranking
-            initial_results_count = top_k * 3
-            logger.info(
-                f"Performing semantic search to find the best {top_k}"
-                f" contextual memories (fetching {initial_results_count}"
-                f" candidates) with query: '{query}'"
-            )
-
-            # Build the filter dynamically to support multiple conditions.
-            filter_conditions = []
-
-            # Exclude IDs from reflex memories and any initially passed IDs.
-            if exclude_ids is not None and exclude_ids:
-                filter_conditions.append({"id": {"$nin": exclude_ids}})
-
-            # ChromaDB requires a logical operator ($and, $or) for multiple filters.
-            if len(filter_conditions) > 1:
-                filter_dict = {"$and": filter_conditions}
-            elif filter_conditions:
-                filter_dict = filter_conditions[0]
+            # A follow-up close to a recent query reuses its candidates,
+            # unless a memory was written since
+            memory_version = self._memory_version
+            cache_options = (top_k, topic_boost, frozenset(exclude_ids or ()))
+            cached = None
+            if self.retrieval_cache and query_embedding is not None:
+                cached = self.retrieval_cache.lookup(
+                    query_embedding, memory_version, cache_options
+                )
+            if cached:
+                logger.info(
+                    "Reusing the memory candidates of a similar recent query."
+                )
+                (
+                    candidates,
+                    distances,
+                    is_key,
+                    topic_match,
+                    is_past,
+                    last_updated_ts,
+                ) = cached
             else:
-                filter_dict = None
-
-            results_with_distances = self.vector_storage.search_with_scores(
-                query,
-                limit=initial_results_count,
-                filter_dict=filter_dict,
-            )
-
-            if not results_with_distances:
-                return []
-
-            ranked_memories = []
-            for doc, score in results_with_distances:
-                memory = doc.get("metadata", {})
-                memory_type = memory.get("memory_type")
-                memory_status = memory.get("status", "current")
-                relevance = memory.get("relevance", 1.0)
-                memory_topic = memory.get("topic")
-                last_updated_str = memory.get("last_updated")
-
-                if memory_type == "key_memories":
-                    relevance *= self.scoring_config["key_memory_boost"]
-
-                # Boost relevance if the memory's topic is currently active
-                if relevant_topics and memory_topic in relevant_topics:
-                    relevance *= self.scoring_config["key_memory_boost"]
-                    logger.debug(
-                        f"Boosting memory {memory.get('id')} due to relevant"
-                        f" topic: {memory_topic}"
+                gathered = self._gather_memory_candidates(
+                    query,
+                    query_embedding,
+                    top_k,
+                    exclude_ids,
+                    topic_boost,
+                )
+                if gathered is None:
+                    return []
+                if self.retrieval_cache and query_embedding is not None:
+                    self.retrieval_cache.store(
+                        query_embedding,
+                        memory_version,
+                        cache_options,
+                        gathered,
                     )
+                (
+                    candidates,
+                    distances,
+                    is_key,
+                    topic_match,
+                    is_past,
+                    last_updated_ts,
+                ) = gathered
+
+            # The vector copy of relevance is only as fresh as the last
+            # write; the mirror has the decayed current value
+            relevances = np.empty(len(candidates))
+            for i, memory in enumerate(candidates):
+                relevance = self.memories.relevance(memory.get("id"))
+                if relevance is None:
+                    relevance = memory.get("relevance", 1.0)
+                relevances[i] = relevance
+
+            scores = score_memory_candidates(
+                self.scoring_config,
+                distances,
+                relevances,
+                is_key,
+                topic_match,
+                is_past,
+                last_updated_ts,
+                now=datetime.now(timezone.utc).timestamp(),
+            )
+            # Stable, so ties keep the vector search order
+            ranking = np.argsort(-scores, kind="stable")
+            ranked_memories = [
+                (candidates[i], float(scores[i])) for i in ranking
+            ]
 
-                # For normalized vectors, cosine similarity can be calculated from
-                # squared L2 distance using: 1 - (distance / 2)
-                semantic_score = 1 - (score / 2)
-
-                base_score = (
-                    semantic_score * (1 - self.scoring_config["relevance_weight"])
-                ) + (relevance * self.scoring_config["relevance_weight"])
-
-                # Calculate and apply recency boost
-                recency_boost = 1.0
-                if last_updated_str:
-                    try:
-                        last_updated_dt = datetime.fromisoformat(
-                            last_updated_str
-                        )
-                        time_delta = datetime.now(
-                            timezone.utc
-                        ) - last_updated_dt
-                        hours_since_update = time_delta.total_seconds() / 3600
-                        recency_boost = 1 + (
-                            self.scoring_config["max_recency_boost"] - 1
-                        ) * math.exp(
-                            -self.scoring_config["recency_decay_rate"]
-                            * hours_since_update
-                        )
-                    except (ValueError, TypeError):
-                        logger.warning(
-                            f"Could not parse last_updated timestamp: {last_updated_str}"
-                        )
-
-                combined_score = base_score * recency_boost
-
-                # Demote past memories in ranking so current ones are preferred.
-                if memory_status == "past":
-                    combined_score *= self.scoring_config[
-                        "past_memory_penalty"
-                    ]  # Apply a penalty
-
-                ranked_memories.append((memory, combined_score))
-
-            ranked_memories.sort(key=lambda x: x[1], reverse=True)
-
+            # Copies, the candidates may be cached
             semantic_memories = [
-                memory for memory, score in ranked_memories[:top_k]
+                dict(memory) for memory, score in ranked_memories[:top_k]
             ]
 
             # Prefix past memories that make it into the top results for clarity.
@@ -947,7 +1540,99 @@ class GREENMemories:
             )
             return []
 
-    def get_turn_counter(self) -> int:
+    def _gather_memory_candidates(
+        self,
+        query: str,
+        query_embedding: Optional[np.ndarray],
+        top_k: int,
+        exclude_ids: Optional[List[str]],
+        topic_boost: bool,
+    ) -> Optional[tuple]:
+        """
+        Runs the vector search of get_relevant_memories() and collects the
+        scoring inputs that depend only on the query and the memories.
+
+        Returns:
+            Optional[tuple]: (candidates, distances, is_key, topic_match,
+                             is_past, last_updated_ts), or None if nothing
+                             was found
+        """
+        relevant_topics = []
+        if topic_boost:
+            relevant_topics = self.get_relevant_topics_for_context(
+                query, context_embedding=query_embedding
+            )
+            if relevant_topics:
+                logger.info(
+                    "Identified relevant topics via semantic search:"
+                    f" {relevant_topics}"
+                )
+
+        # Fetch more results initially to allow for re-ranking
+        initial_results_count = top_k * 3
+        logger.info(
+            f"Performing semantic search to find the best {top_k}"
+            f" contextual memories (fetching {initial_results_count}"
+            f" candidates) with query: '{query}'"
+        )
+
+        # Build the filter dynamically to support multiple conditions.
+        filter_conditions = []
+
+        # Exclude IDs from reflex memories and any initially passed IDs.
+        if exclude_ids is not None and exclude_ids:
+            filter_conditions.append({"id": {"$nin": exclude_ids}})
+
+        # ChromaDB requires a logical operator ($and, $or) for multiple filters.
+        if len(filter_conditions) > 1:
+            filter_dict = {"$and": filter_conditions}
+        elif filter_conditions:
+            filter_dict = filter_conditions[0]
+        else:
+            filter_dict = None
+
+        results_with_distances = self._search_memories(
+            query,
+            limit=initial_results_count,
+            filter_dict=filter_dict,
+            query_embedding=query_embedding,
+        )
+
+        if not results_with_distances:
+            return None
+
+        candidates = [
+            doc.get("metadata", {}) for doc, _ in results_with_distances
+        ]
+        distances = np.fromiter(
+            (distance for _, distance in results_with_distances),
+            dtype=np.float64,
+            count=len(candidates),
+        )
+        is_key = np.empty(len(candidates), dtype=bool)
+        topic_match = np.empty(len(candidates), dtype=bool)
+        is_past = np.empty(len(candidates), dtype=bool)
+        last_updated_ts = np.empty(len(candidates))
+        relevant_topics = set(relevant_topics)
+        for i, memory in enumerate(candidates):
+            is_key[i] = memory.get("memory_type") == "key_memories"
+            topic_match[i] = memory.get("topic") in relevant_topics
+            is_past[i] = memory.get("status", "current") == "past"
+            timestamp = memory.get("last_updated_ts")
+            if timestamp is None:
+                # Vectors indexed before the numeric timestamp existed
+                timestamp = _timestamp_seconds(memory.get("last_updated"))
+            last_updated_ts[i] = timestamp
+        return (
+            candidates,
+            distances,
+            is_key,
+            topic_match,
+            is_past,
+            last_updated_ts,
+        )
+
+    def get_turn_counter(self) -> int:
         """Retrieves the persisted turn counter for memory decay."""
         with self._db_lock:
             value = self.storage.get_metadata("profile_decay_turn_counter")
@@ -971,7 +1656,55 @@ class GREENMemories:
         """
         Fetches all new messages since the last update, processes them in
         conversation turns, and updates the user profile.
+
+        Turns go through a pipeline: the vector lookups, prompt rendering and
+        LLM calls of several turns run concurrently on a bounded worker pool,
+        while the resulting actions are applied one at a time in turn order.
+        A decision that touches memories changed by a turn of another group
+        applied after it was planned is planned again. The processed timestamp is
+        checkpointed as each turn is applied, so an interrupted run resumes
+        where it stopped. Only one update runs at a time, once the warm-up
+        is done.
         """
+        if not self._assimilation_lock.acquire(blocking=False):
+            logger.info("A profile update is already running, skipping.")
+            return
+        try:
+            # Writes need the vector store and spaCy loaded by the warm-up
+            if not self.wait_until_ready():
+                logger.error(
+                    "Memory warm-up failed, skipping the profile update."
+                )
+                return
+            self._process_new_messages(progress_callback, max_progress)
+        finally:
+            self._assimilation_status["running"] = False
+            self._assimilation_lock.release()
+
+    def start_background_update(
+        self, progress_callback=None, max_progress=100
+    ) -> threading.Thread:
+        """
+        Runs process_new_messages_for_update() on a daemon thread, so the
+        caller can start serving while past turns are still assimilated.
+        """
+        thread = threading.Thread(
+            target=self.process_new_messages_for_update,
+            kwargs={
+                "progress_callback": progress_callback,
+                "max_progress": max_progress,
+            },
+            name="MemoryAssimilationThread",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def get_assimilation_status(self) -> Dict[str, Any]:
+        """Returns the progress of the current or last profile update."""
+        return dict(self._assimilation_status)
+
+    def _process_new_messages(self, progress_callback, max_progress):
         last_timestamp = self.storage.get_metadata(
             "profile_last_processed_timestamp"
         )
@@ -980,99 +1713,226 @@ class GREENMemories:
             f" {last_timestamp}"
         )
 
-        # Fetch all messages since the last processed timestamp
-        new_messages = self.chat_memory.storage.get_messages_since(
-            last_timestamp
+        # Stream the new messages instead of loading them all. Every turn
+        # ends with an assistant message, so their count bounds the number
+        # of turns for progress reporting. Both stop at the newest message
+        # stored now: turns added while this runs are left for the next run.
+        message_storage = self.chat_memory.storage
+        newest, _ = message_storage.get_messages_page(limit=1)
+        cutoff = newest[0]["timestamp"] if newest else None
+        total_turns = message_storage.count_messages(
+            since=last_timestamp, role="assistant", end_date=cutoff
+        )
+        new_messages = message_storage.iter_messages(
+            since=last_timestamp, end_date=cutoff
+        )
+        self._assimilation_status.update(
+            running=True, processed=0, total=total_turns
         )
 
-        if not new_messages:
+        newly_created_or_updated_memories_in_batch = []
+        session_update_counts = {}  # Track updates per memory_id in this session
+        # Sliding window of context. A value of 0 means no extra context.
+        context_window = deque(maxlen=self.extraction_context_turns + 1)
+        # Planned groups of turns waiting to be applied, in turn order:
+        # (future, turn windows, number of turns applied when planned)
+        pending = deque()
+        # Changes of recently applied turns: (apply index, ids, topics)
+        applied_changes = deque()
+        applied = 0
+        max_in_flight = self.assimilation_max_workers * 2
+
+        def apply_turn(turns, decision, planned_at, group_start):
+            user_msg, assistant_msg = turns[-1]
+            # Turns planned in the same LLM call were decided together, so
+            # only the changes of other groups applied meanwhile count
+            if decision and self._decision_conflicts(
+                decision,
+                [
+                    c
+                    for c in applied_changes
+                    if planned_at <= c[0] < group_start
+                ],
+            ):
+                logger.info(
+                    "Memory decision conflicts with changes applied"
+                    " since it was planned, planning the turn again."
+                )
+                decision = self._plan_memory_assimilation(
+                    turns, newly_created_or_updated_memories_in_batch
+                )
+            processed_memory, touched_ids = self._apply_memory_decision(
+                decision, user_msg, assistant_msg, session_update_counts
+            )
+            if touched_ids:
+                topics = {processed_memory["topic"]} if (
+                    processed_memory and processed_memory.get("topic")
+                ) else set()
+                applied_changes.append((applied, touched_ids, topics))
+
+            if processed_memory:
+                # If a memory was created or updated, update our batch context list
+                existing_index = next(
+                    (
+                        idx
+                        for idx, mem in enumerate(
+                            newly_created_or_updated_memories_in_batch
+                        )
+                        if mem["id"] == processed_memory["id"]
+                    ),
+                    -1,
+                )
+                if existing_index != -1:
+                    # It was an update, replace the old version
+                    newly_created_or_updated_memories_in_batch[
+                        existing_index
+                    ] = processed_memory
+                else:
+                    # It was a creation, add it
+                    newly_created_or_updated_memories_in_batch.append(
+                        processed_memory
+                    )
+
+        def apply_next():
+            nonlocal applied
+            future, windows, planned_at = pending.popleft()
+            group_start = applied
+            try:
+                decisions = future.result()
+            except Exception as e:
+                logger.error(
+                    f"Failed to plan memories for {len(windows)} turns. They"
+                    f" will be skipped. Error: {e}"
+                )
+                decisions = None
+
+            for index, turns in enumerate(windows):
+                # Move timestamp forward BEFORE applying to avoid getting
+                # stuck. If processing fails, this turn will be skipped on
+                # the next run.
+                current_timestamp = turns[-1][1].get("timestamp")
+                if current_timestamp:
+                    self.storage.set_metadata(
+                        "profile_last_processed_timestamp", current_timestamp
+                    )
+                if decisions is not None:
+                    try:
+                        apply_turn(
+                            turns, decisions[index], planned_at, group_start
+                        )
+                    except Exception as e:
+                        logger.error(
+                            "Failed to process memory for turn ending with"
+                            f" message at timestamp {current_timestamp}. This"
+                            f" turn will be skipped. Error: {e}"
+                        )
+                        # The timestamp is already updated, so we just move on.
+
+                applied += 1
+                self._assimilation_status["processed"] = applied
+                if progress_callback:
+                    # A message sharing the cutoff timestamp can add a turn
+                    total = max(total_turns, applied, 1)
+                    progress = min(
+                        int((applied / total) * max_progress), max_progress
+                    )
+                    progress_callback(progress, applied, total)
+
+            # Changes every pending turn already saw aren't needed anymore
+            oldest_planned = pending[0][2] if pending else applied
+            while applied_changes and applied_changes[0][0] < oldest_planned:
+                applied_changes.popleft()
+
+        # Consecutive turns are planned together, up to a token budget, when
+        # batching is enabled (batch_max_turns > 1)
+        group = []
+        group_tokens = 0
+
+        def submit_group():
+            nonlocal group, group_tokens
+            pending.append(
+                (
+                    executor.submit(
+                        self._plan_memory_batch,
+                        group,
+                        list(newly_created_or_updated_memories_in_batch),
+                    ),
+                    group,
+                    applied,
+                )
+            )
+            group, group_tokens = [], 0
+            if len(pending) >= max_in_flight:
+                apply_next()
+
+        prev_message = None
+        message_count = 0
+        i = -1
+        with ThreadPoolExecutor(
+            max_workers=self.assimilation_max_workers,
+            thread_name_prefix="MemoryPlanThread",
+        ) as executor:
+            for message in new_messages:
+                message_count += 1
+                last_message_timestamp = message.get("timestamp")
+                previous, prev_message = prev_message, message
+                if not (
+                    message.get("role") == "assistant"
+                    and previous is not None
+                    and previous.get("role") == "user"
+                ):
+                    continue
+
+                i += 1
+                context_window.append((previous, message))
+                if i == 0:
+                    logger.info(
+                        f"Processing up to {total_turns} new conversation"
+                        f" turns with {self.assimilation_max_workers}"
+                        f" workers, up to {self.batch_max_turns} turns per"
+                        " LLM call."
+                    )
+
+                # The last turn in the window is the one we are primarily
+                # analyzing. The preceding turns provide the context.
+                tokens = 0
+                if self.batch_max_turns > 1:
+                    tokens = self._estimate_tokens(
+                        f"{previous.get('content', '')}\n"
+                        f"{message.get('content', '')}"
+                    )
+                if group and (
+                    len(group) >= self.batch_max_turns
+                    or group_tokens + tokens > self.batch_max_tokens
+                ):
+                    submit_group()
+                group.append(list(context_window))
+                group_tokens += tokens
+
+            if group:
+                submit_group()
+            while pending:
+                apply_next()
+
+        if message_count == 0:
             logger.info("No new messages to process for profile update.")
             return
 
-        logger.info(f"Found {len(new_messages)} new messages to process.")
-
-        # Group messages into user/assistant turns
-        conversation_turns = []
-        for i, message in enumerate(new_messages):
-            if message.get("role") == "assistant" and i > 0:
-                prev_message = new_messages[i - 1]
-                if prev_message.get("role") == "user":
-                    conversation_turns.append((prev_message, message))
+        logger.info(f"Found {message_count} new messages to process.")
 
-        if not conversation_turns:
+        if i < 0:
             logger.info(
                 "No complete user/assistant turns found in new messages."
             )
             # Update timestamp anyway to avoid reprocessing these single messages
             self.storage.set_metadata(
-                "profile_last_processed_timestamp",
-                new_messages[-1].get("timestamp"),
+                "profile_last_processed_timestamp", last_message_timestamp
             )
             return
 
-        logger.info(
-            f"Processing {len(conversation_turns)} new conversation turns."
-        )
-        total_turns = len(conversation_turns)
-        newly_created_or_updated_memories_in_batch = []
-        session_update_counts = {}  # Track updates per memory_id in this session
-        for i, (user_msg, assistant_msg) in enumerate(conversation_turns):
-            # Move timestamp forward BEFORE processing to avoid getting stuck.
-            # If processing fails, this message will be skipped on the next run.
-            current_timestamp = assistant_msg.get("timestamp")
-            if current_timestamp:
-                self.storage.set_metadata(
-                    "profile_last_processed_timestamp", current_timestamp
-                )
-
-            try:
-                # Create a sliding window of context. A value of 0 means no extra context.
-                start_index = max(0, i - self.extraction_context_turns)
-                context_turns = conversation_turns[start_index: i + 1]
-
-                # The last turn in the window is the one we are primarily analyzing.
-                # The preceding turns provide the context.
-                processed_memory = self._extract_and_assimilate_memory(
-                    context_turns,
-                    newly_created_or_updated_memories_in_batch,
-                    session_update_counts,
-                )
-
-                if processed_memory:
-                    # If a memory was created or updated, update our batch context list
-                    existing_index = next(
-                        (
-                            idx
-                            for idx, mem in enumerate(
-                                newly_created_or_updated_memories_in_batch
-                            )
-                            if mem["id"] == processed_memory["id"]
-                        ),
-                        -1,
-                    )
-                    if existing_index != -1:
-                        # It was an update, replace the old version
-                        newly_created_or_updated_memories_in_batch[
-                            existing_index
-                        ] = processed_memory
-                    else:
-                        # It was a creation, add it
-                        newly_created_or_updated_memories_in_batch.append(
-                            processed_memory
-                        )
-
-            except Exception as e:
-                logger.error(
-                    "Failed to process memory for turn ending with message at"
-                    f" timestamp {current_timestamp}. This turn will be"
-                    f" skipped. Error: {e}"
-                )
-                # The timestamp is already updated, so we just continue to the next turn.
-                continue
-
-            if progress_callback:
-                progress = int(((i + 1) / total_turns) * max_progress)
-                progress_callback(progress, i + 1, total_turns)
+        if progress_callback and applied < total_turns:
+            # total_turns was an upper bound; report completion
+            progress_callback(max_progress, applied, applied)
 
         logger.info(
             "Profile update processing loop complete. Final timestamp is set"
@@ -1086,30 +1946,19 @@ class GREENMemories:
             self._decay_memory_relevance(decay_factor)
 
     def _decay_memory_relevance(self, decay_factor: float = 0.998):
-        """Applies a decay factor to the relevance of all memories."""
+        """
+        Applies a decay factor to the relevance of all memories.
+
+        Decay is lazy: this only advances the global decay epoch, and each
+        memory's relevance is decayed when read (past memories at four
+        times the rate). Rows are rewritten only when they change.
+        """
         logger.info(f"Applying relevance decay (factor: {decay_factor})...")
         try:
-            with self.storage.conn:
-                cursor = self.storage.conn.cursor()
-                cursor.execute(
-                    "UPDATE user_memories SET relevance = relevance * ? WHERE"
-                    " status = 'current'",
-                    (decay_factor,),
-                )
-                current_updated_count = cursor.rowcount
-                cursor.execute(
-                    "UPDATE user_memories SET relevance = relevance * ? WHERE"
-                    " status = 'past'",
-                    (decay_factor**4,),
-                )
-                past_updated_count = cursor.rowcount
-                total_updated = current_updated_count + past_updated_count
-            if total_updated > 0:
-                logger.info(
-                    f"Decayed relevance for {total_updated} memories"
-                    f" ({current_updated_count} current,"
-                    f" {past_updated_count} past)."
-                )
+            epoch = self.memories.epoch + decay_epochs(decay_factor)
+            self.storage.set_metadata("memory_decay_epoch", repr(epoch))
+            self.memories.advance_epoch(epoch - self.memories.epoch)
+            logger.info(f"Advanced memory decay epoch to {epoch:.2f}.")
         except Exception as e:
             logger.error(f"Failed to decay memory relevance: {e}")
 
@@ -1118,18 +1967,34 @@ class GREENMemories:
     ) -> bool:
         """Finds a memory by ID and increases its relevance."""
         try:
-            with self.storage.conn:
-                cursor = self.storage.conn.execute(
-                    # Relevance limited up to 200
-                    "UPDATE user_memories SET relevance = relevance + ?,"
-                    " last_updated = ? WHERE id = ? AND relevance < 200",
+            memory = self.memories.get(memory_id)
+            # Relevance limited up to 200
+            if not memory or memory["relevance"] >= MAX_REINFORCED_RELEVANCE:
+                return False
+            # Materialize the decayed relevance along with the increment
+            relevance = memory["relevance"] + increment
+            last_updated = datetime.now(timezone.utc).isoformat()
+            with self.storage.write() as conn:
+                cursor = conn.execute(
+                    "UPDATE user_memories SET relevance = ?, decay_epoch = ?,"
+                    " last_updated = ? WHERE id = ?",
                     (
-                        increment,
-                        datetime.now(timezone.utc).isoformat(),
+                        relevance,
+                        memory["decay_epoch"],
+                        last_updated,
                         memory_id,
                     ),
                 )
-            return cursor.rowcount > 0
+            if cursor.rowcount == 0:
+                return False
+            self.memories.update(
+                memory_id,
+                relevance=relevance,
+                decay_epoch=memory["decay_epoch"],
+                last_updated=last_updated,
+            )
+            self._bump_memory_version()
+            return True
         except Exception as e:
             logger.error(f"Failed to reinforce memory {memory_id}: {e}")
             return False
@@ -1145,18 +2010,13 @@ class GREENMemories:
         """Updates an existing memory's text and boosts its relevance."""
         try:
             # First, get the existing memory to preserve other metadata
-            cursor = self.storage.conn.cursor()
-            cursor.execute(
-                "SELECT * FROM user_memories WHERE id = ?", (memory_id,)
-            )
-            row = cursor.fetchone()
-            if not row:
+            existing_memory = self.memories.get(memory_id)
+            if not existing_memory:
                 logger.error(
                     f"Attempted to update non-existent memory: {memory_id}"
                 )
                 return None
 
-            existing_memory = self._dict_from_row(row)
             new_last_updated = datetime.now(timezone.utc).isoformat()
 
             # Handle source_message_ids
@@ -1174,18 +2034,21 @@ class GREENMemories:
                 if new_id not in source_ids:
                     source_ids.append(new_id)
             updated_source_ids_json = json.dumps(source_ids)
+            # Boost the decayed relevance, materializing it in the row
+            new_relevance = existing_memory["relevance"] + increment
 
             # Update in SQLite, boosting relevance
-            with self.storage.conn:
-                cursor = self.storage.conn.execute(
+            with self.storage.write() as conn:
+                cursor = conn.execute(
                     """
                     UPDATE user_memories
-                    SET memory = ?, relevance = relevance + ?, last_updated = ?, source_message_ids = ?
+                    SET memory = ?, relevance = ?, decay_epoch = ?, last_updated = ?, source_message_ids = ?
                     WHERE id = ?
                     """,
                     (
                         new_text,
-                        increment,
+                        new_relevance,
+                        existing_memory["decay_epoch"],
                         new_last_updated,
                         updated_source_ids_json,
                         memory_id,
@@ -1195,7 +2058,19 @@ class GREENMemories:
             if cursor.rowcount == 0:
                 return None  # Should not happen if row was found
 
+            self.memories.update(
+                memory_id,
+                memory=new_text,
+                relevance=new_relevance,
+                decay_epoch=existing_memory["decay_epoch"],
+                last_updated=new_last_updated,
+                source_message_ids=source_ids,
+            )
+            self._bump_memory_version()
             logger.info(f"Updated memory {memory_id} in SQLite.")
+            # The updated memory is treated as current, so make sure its topic
+            # is visible to topic boosting.
+            self._add_topic_to_index(existing_memory.get("topic"))
 
             # Update in vector store
             if self.vector_storage:
@@ -1205,20 +2080,11 @@ class GREENMemories:
                 updated_memory_obj["source_message_ids"] = source_ids
                 # Fetch new relevance to keep vector store metadata in sync
                 updated_memory_obj["status"] = "current"
-                cursor.execute(
-                    "SELECT relevance FROM user_memories WHERE id = ?",
-                    (memory_id,),
-                )
-                updated_memory_obj["relevance"] = cursor.fetchone()[0]
+                updated_memory_obj["relevance"] = new_relevance
 
-                normalized_text_for_vector = self._normalize_memory_text(
-                    new_text
+                self.vector_storage.upsert_documents(
+                    self._memory_documents([updated_memory_obj])
                 )
-                document_to_update = {
-                    "page_content": normalized_text_for_vector,
-                    "metadata": updated_memory_obj,
-                }
-                self.vector_storage.add_documents([document_to_update])
                 logger.info(f"Updated memory {memory_id} in vector store.")
 
             return updated_memory_obj
@@ -1262,12 +2128,14 @@ class GREENMemories:
             ]
         )
 
+        decay_epoch = self.memories.epoch
+
         try:
-            with self.storage.conn:
-                self.storage.conn.execute(
+            with self.storage.write() as conn:
+                conn.execute(
                     """
-                    INSERT INTO user_memories (id, memory_type, topic, memory, relevance, created_at, last_updated, source_message_ids)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO user_memories (id, memory_type, topic, memory, relevance, decay_epoch, created_at, last_updated, source_message_ids)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
                     (
                         memory_id,
@@ -1275,39 +2143,39 @@ class GREENMemories:
                         topic,
                         memory_text,
                         1.0,
+                        decay_epoch,
                         now_timestamp,
                         now_timestamp,
                         source_ids,
                     ),
                 )
+            # The full memory object, for the mirror and vector metadata
+            new_memory_obj = {
+                "id": memory_id,
+                "memory_type": target_section,
+                "topic": topic,
+                "memory": memory_text,
+                "relevance": 1.0,
+                "decay_epoch": decay_epoch,
+                "created_at": now_timestamp,
+                "last_updated": now_timestamp,
+                "source_message_ids": json.loads(source_ids),
+                "status": "current",
+            }
+            self.memories.upsert(new_memory_obj)
+            self._bump_memory_version()
             logger.info(
                 f"Added new memory to '{target_section}' under topic: {topic}"
             )
+            self._add_topic_to_index(topic)
 
             full_memory_obj = None
             # Add to vector store regardless of type for de-duplication
             if self.vector_storage:
-                # We need the full memory object for metadata
-                full_memory_obj = {
-                    "id": memory_id,
-                    "memory_type": target_section,
-                    "topic": topic,
-                    "memory": memory_text,
-                    "relevance": 1.0,
-                    "created_at": now_timestamp,
-                    "last_updated": now_timestamp,
-                    "source_message_ids": json.loads(source_ids),
-                    "status": "current",
-                }
-                # Normalize the text ONLY for the vector embedding
-                normalized_text_for_vector = self._normalize_memory_text(
-                    memory_text
+                full_memory_obj = new_memory_obj
+                self.vector_storage.add_documents(
+                    self._memory_documents([full_memory_obj])
                 )
-                document_to_add = {
-                    "page_content": normalized_text_for_vector,
-                    "metadata": full_memory_obj,
-                }
-                self.vector_storage.add_documents([document_to_add])
                 logger.info(
                     f"Indexed new memory (ID: {memory_id}) in vector store."
                 )
@@ -1323,42 +2191,40 @@ class GREENMemories:
 
         logger.info(f"Marking {len(memory_ids)} memories as past.")
         try:
-            placeholders = ",".join("?" for _ in memory_ids)
+            # Relevance decayed so far at the current rate is materialized,
+            # from here on it decays at the faster rate of past memories
+            memories = self.memories.get_many(memory_ids)
             # Step 1: Update status in SQLite
-            with self.storage.conn:
-                cursor = self.storage.conn.execute(
-                    "UPDATE user_memories SET status = 'past' WHERE id IN"
-                    f" ({placeholders})",
-                    memory_ids,
+            with self.storage.write() as conn:
+                cursor = conn.executemany(
+                    "UPDATE user_memories SET status = 'past', relevance = ?,"
+                    " decay_epoch = ? WHERE id = ?",
+                    [
+                        (mem["relevance"], mem["decay_epoch"], mem["id"])
+                        for mem in memories
+                    ],
                 )
                 logger.info(
                     f"Marked {cursor.rowcount} memories as past in SQLite."
                 )
+            for mem in memories:
+                self.memories.update(
+                    mem["id"],
+                    status="past",
+                    relevance=mem["relevance"],
+                    decay_epoch=mem["decay_epoch"],
+                )
+            self._bump_memory_version()
 
             # Step 2: Update in vector store by re-adding (upserting) with new status
             if self.vector_storage:
-                # Fetch the updated memories from SQLite to get all fields
-                with self.storage.conn:
-                    cursor = self.storage.conn.execute(
-                        "SELECT * FROM user_memories WHERE id IN"
-                        f" ({placeholders})",
-                        memory_ids,
-                    )
-                    updated_memories = [
-                        self._dict_from_row(row) for row in cursor.fetchall()
-                    ]
+                # Take the updated memories from the mirror to get all fields
+                updated_memories = self.memories.get_many(memory_ids)
 
                 if updated_memories:
-                    documents_to_update = [
-                        {
-                            "page_content": self._normalize_memory_text(
-                                mem["memory"]
-                            ),
-                            "metadata": mem,
-                        }
-                        for mem in updated_memories
-                    ]
-                    self.vector_storage.add_documents(documents_to_update)
+                    self.vector_storage.upsert_documents(
+                        self._memory_documents(updated_memories)
+                    )
                     logger.info(
                         f"Updated {len(updated_memories)} memories in vector"
                         " store to 'past' status."
@@ -1379,24 +2245,28 @@ class GREENMemories:
         logger.info(f"Deleting {len(memory_ids)} duplicate memories.")
         try:
             placeholders = ",".join("?" for _ in memory_ids)
-            with self.storage.conn:
+            kept_memory = None
+            with self.storage.write() as conn:
                 if consolidate_into_id:
-                    cursor = self.storage.conn.cursor()
+                    cursor = conn.cursor()
                     # Sum relevance from duplicates
-                    cursor.execute(
-                        "SELECT SUM(relevance) FROM user_memories WHERE id IN"
-                        f" ({placeholders})",
-                        memory_ids,
+                    total_relevance_from_duplicates = sum(
+                        mem["relevance"]
+                        for mem in self.memories.get_many(memory_ids)
                     )
-                    total_relevance_from_duplicates = cursor.fetchone()[0]
+                    kept_memory = self.memories.get(consolidate_into_id)
 
-                    if total_relevance_from_duplicates:
+                    if total_relevance_from_duplicates and kept_memory:
                         # Add to the kept memory
+                        kept_memory["relevance"] += (
+                            total_relevance_from_duplicates
+                        )
                         cursor.execute(
-                            "UPDATE user_memories SET relevance = relevance +"
-                            " ? WHERE id = ?",
+                            "UPDATE user_memories SET relevance = ?,"
+                            " decay_epoch = ? WHERE id = ?",
                             (
-                                total_relevance_from_duplicates,
+                                kept_memory["relevance"],
+                                kept_memory["decay_epoch"],
                                 consolidate_into_id,
                             ),
                         )
@@ -1407,7 +2277,7 @@ class GREENMemories:
                             f" {consolidate_into_id}."
                         )
 
-                cursor = self.storage.conn.execute(
+                cursor = conn.execute(
                     f"DELETE FROM user_memories WHERE id IN ({placeholders})",
                     memory_ids,
                 )
@@ -1415,6 +2285,14 @@ class GREENMemories:
                 logger.info(
                     f"Deleted {deleted_count} memories from SQLite."
                 )
+            if kept_memory:
+                self.memories.update(
+                    consolidate_into_id,
+                    relevance=kept_memory["relevance"],
+                    decay_epoch=kept_memory["decay_epoch"],
+                )
+            self.memories.remove(memory_ids)
+            self._bump_memory_version()
 
             if deleted_count > 0 and self.vector_storage:
                 self.vector_storage.delete(memory_ids)
@@ -1440,8 +2318,228 @@ class GREENMemories:
         """
         if not conversation_turns:
             return None
-
+        decision = self._plan_memory_assimilation(
+            conversation_turns, batch_context_memories
+        )
         user_message, assistant_message = conversation_turns[-1]
+        processed_memory, _ = self._apply_memory_decision(
+            decision, user_message, assistant_message, session_update_counts
+        )
+        return processed_memory
+
+    def _find_related_memories(self, query_text: str) -> List[Dict]:
+        """
+        Returns the memories most similar to a user message, to give the LLM
+        context for its memory decision. Empty for non-substantive messages.
+        """
+        # # !!! DEBUG
+        # logger.info(f"Memory assimilation query: '{query_text}'")
+        existing_memories = []
+        is_substantive = self._is_query_substantive(query_text)
+        # # !!! DEBUG
+        # logger.info(f"Is query substantive? {is_substantive}")
+        if self.vector_storage and is_substantive:
+            # Fetch a few relevant memories to provide context to the LLM
+            search_limit = self._memory_search_limit()
+            search_results = self.vector_storage.search_with_scores(
+                query_text,
+                limit=search_limit,
+            )
+            # # !!! DEBUG
+            # logger.info(
+            #     f"Vector search raw results: {search_results}"
+            # )
+            if search_results:
+                existing_memories = [
+                    doc.get("metadata", {})
+                    for doc, score in search_results
+                ]
+                logger.info(
+                    f"Found {len(existing_memories)} related memories for"
+                    " context."
+                )
+
+        return existing_memories
+
+    def _memory_search_limit(self) -> int:
+        """Number of related memories given to the LLM per turn."""
+        if self.context_window <= 8192:
+            search_limit = 20
+        elif self.context_window <= 32768:
+            search_limit = 35
+        else:
+            search_limit = 60
+        logger.info(
+            f"Context window is {self.context_window}, dynamically"
+            " setting memory search limit for LLM context to"
+            f" {search_limit}"
+        )
+        return search_limit
+
+    @staticmethod
+    def _merge_batch_context(
+        existing_memories: List[Dict], batch_context_memories: List[Dict]
+    ):
+        """
+        Merges memories created/updated earlier in this same batch run.
+        This gives the LLM immediate context to prevent duplicates.
+        """
+        if not batch_context_memories:
+            return
+        existing_ids = {mem["id"] for mem in existing_memories}
+        for mem in batch_context_memories:
+            if mem["id"] not in existing_ids:
+                existing_memories.append(mem)
+        logger.info(
+            f"Added {len(batch_context_memories)} memories from"
+            " current batch to LLM context."
+        )
+
+    def _estimate_tokens(self, text: str) -> int:
+        """Token count of a text for the current LLM, or an estimate."""
+        try:
+            return self.llm._get_token_count(text, "user")
+        except Exception:
+            return len(text) // 4
+
+    def _plan_memory_batch(
+        self,
+        turn_windows: List[List[tuple[Dict, Dict]]],
+        batch_context_memories: List[Dict] = None,
+    ) -> List[Optional[Dict]]:
+        """
+        Plans several consecutive turns with a single LLM call, so the
+        system prompt, context and related memories are sent once.
+
+        Args:
+            turn_windows: The conversation window of each turn, in order;
+                          the last pair of each window is the turn itself
+
+        Returns:
+            List: One decision per turn. If the batched response can't be
+                  parsed, each turn is planned on its own instead.
+        """
+        if len(turn_windows) == 1:
+            return [
+                self._plan_memory_assimilation(
+                    turn_windows[0], batch_context_memories
+                )
+            ]
+
+        # The turns before the first one only give context
+        context_snippet = "\n".join(
+            f"User: {u['content']}\nAssistant: {a['content']}"
+            for u, a in turn_windows[0][:-1]
+        )
+        turns = [
+            {
+                "number": number,
+                "snippet": f"User: {u['content']}\nAssistant: {a['content']}",
+            }
+            for number, (u, a) in enumerate(
+                (window[-1] for window in turn_windows), 1
+            )
+        ]
+
+        # Related memories of every turn, best matches of each turn first
+        related = [
+            self._find_related_memories(window[-1][0].get("content", ""))
+            for window in turn_windows
+        ]
+        existing_memories = []
+        seen_ids = set()
+        for rank in range(max(len(memories) for memories in related)):
+            for memories in related:
+                if rank < len(memories) and (
+                    memories[rank]["id"] not in seen_ids
+                ):
+                    seen_ids.add(memories[rank]["id"])
+                    existing_memories.append(memories[rank])
+        del existing_memories[2 * self._memory_search_limit():]
+        self._merge_batch_context(existing_memories, batch_context_memories)
+
+        processing_prompt = self.template_manager.render(
+            "framework.green_memories.batched_memory_processing",
+            {
+                "context_snippet": context_snippet,
+                "turns": turns,
+                "existing_memories": existing_memories,
+            },
+        )
+        system_prompt = self.template_manager.render(
+            "framework.green_memories.extract_memory_candidate_system"
+        )
+        llm_response_str = self.llm.chat(
+            chat_history=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": processing_prompt},
+            ],
+            stream=False,
+        )
+        decisions = self._parse_batched_decisions(
+            llm_response_str, len(turn_windows)
+        )
+        if decisions is not None:
+            logger.info(
+                f"Planned {len(turn_windows)} turns with one LLM call."
+            )
+            return decisions
+
+        logger.warning(
+            "LLM returned an invalid batched memory response, planning the"
+            f" {len(turn_windows)} turns one by one:"
+            f" {llm_response_str}"
+        )
+        return [
+            self._plan_memory_assimilation(window, batch_context_memories)
+            for window in turn_windows
+        ]
+
+    @staticmethod
+    def _parse_batched_decisions(
+        response: str, turn_count: int
+    ) -> Optional[List[Dict]]:
+        """
+        Parses the decisions of a batched memory response.
+
+        Returns:
+            Optional[List]: The decisions in turn order, or None unless there
+                            is exactly one decision per turn
+        """
+        try:
+            data = json.loads(response)
+        except (json.JSONDecodeError, TypeError):
+            return None
+        decisions = data.get("decisions") if isinstance(data, dict) else data
+        if not isinstance(decisions, list) or len(decisions) != turn_count:
+            return None
+        if not all(isinstance(decision, dict) for decision in decisions):
+            return None
+        if all("turn" not in decision for decision in decisions):
+            return decisions
+        try:
+            numbers = [int(decision["turn"]) for decision in decisions]
+        except (KeyError, TypeError, ValueError):
+            return None
+        if sorted(numbers) != list(range(1, turn_count + 1)):
+            return None
+        order = sorted(range(turn_count), key=numbers.__getitem__)
+        return [decisions[index] for index in order]
+
+    def _plan_memory_assimilation(
+        self,
+        conversation_turns: List[tuple[Dict, Dict]],
+        batch_context_memories: List[Dict] = None,
+    ) -> Optional[Dict]:
+        """
+        Asks the LLM what to do with a conversation turn, given the related
+        memories. Doesn't write anything, so turns can be planned
+        concurrently.
+
+        Returns:
+            Optional[Dict]: The LLM decision, or None if it wasn't valid JSON
+        """
+        user_message = conversation_turns[-1][0]
         llm_response_str = ""
 
         try:
@@ -1456,55 +2554,11 @@ class GREENMemories:
             # Step 2: Find potentially related memories via semantic search
             # We use the last user message as the query to find relevant context.
             query_text = user_message.get("content", "")
-            # # !!! DEBUG
-            # logger.info(f"Memory assimilation query: '{query_text}'")
-            existing_memories = []
-            is_substantive = self._is_query_substantive(query_text)
-            # # !!! DEBUG
-            # logger.info(f"Is query substantive? {is_substantive}")
-            if self.vector_storage and is_substantive:
-                # Fetch a few relevant memories to provide context to the LLM
-                if self.context_window <= 8192:
-                    search_limit = 20
-                elif self.context_window <= 32768:
-                    search_limit = 35
-                else:
-                    search_limit = 60
-                logger.info(
-                    f"Context window is {self.context_window}, dynamically"
-                    " setting memory search limit for LLM context to"
-                    f" {search_limit}"
-                )
-
-                search_results = self.vector_storage.search_with_scores(
-                    query_text,
-                    limit=search_limit,
-                )
-                # # !!! DEBUG
-                # logger.info(
-                #     f"Vector search raw results: {search_results}"
-                # )
-                if search_results:
-                    existing_memories = [
-                        doc.get("metadata", {})
-                        for doc, score in search_results
-                    ]
-                    logger.info(
-                        f"Found {len(existing_memories)} related memories for"
-                        " context."
-                    )
+            existing_memories = self._find_related_memories(query_text)
 
-            # Merge memories created/updated earlier in this same batch run.
-            # This gives the LLM immediate context to prevent duplicates.
-            if batch_context_memories:
-                existing_ids = {mem["id"] for mem in existing_memories}
-                for mem in batch_context_memories:
-                    if mem["id"] not in existing_ids:
-                        existing_memories.append(mem)
-                logger.info(
-                    f"Added {len(batch_context_memories)} memories from"
-                    " current batch to LLM context."
-                )
+            self._merge_batch_context(
+                existing_memories, batch_context_memories
+            )
 
             # Step 3: Use the LLM to decide on the action
             processing_prompt = self.template_manager.render(
@@ -1531,87 +2585,143 @@ class GREENMemories:
             )
             # !!! DEBUG
             logger.info(f"LLM raw response for memory processing:\n--------------\n{llm_response_str}\n-----------")
-            decision = json.loads(llm_response_str)
-            action = decision.get("action")
-
-            # Check for memories to mark as past, regardless of action (except ignore)
-            past_ids = decision.get("past_memory_ids", [])
-            if past_ids:
-                self._mark_memories_as_past(past_ids)
+            return json.loads(llm_response_str)
+        except json.JSONDecodeError:
+            logger.warning(
+                "LLM returned invalid JSON for memory processing:"
+                f" {llm_response_str}"
+            )
+            return None
+        except Exception as e:
+            logger.error(f"Failed to assimilate memory from conversation: {e}")
+            # Re-raise to be caught by the main loop for poison-pill handling
+            raise
 
-            # Step 4: Execute the decided action
-            if action == "ignore":
-                logger.info(
-                    "LLM decided to ignore the conversation for memory."
-                )
-                return None
+    @staticmethod
+    def _decision_referenced_ids(decision: Dict) -> set:
+        """Returns the ids of the existing memories a decision acts on."""
+        ids = set(decision.get("past_memory_ids") or [])
+        if decision.get("action") == "reinforce":
+            if decision.get("memory_id"):
+                ids.add(decision["memory_id"])
+            ids.update(decision.get("duplicates") or [])
+        return ids
+
+    def _decision_conflicts(self, decision: Dict, changes: List) -> bool:
+        """
+        Checks a planned decision against the changes applied after it was
+        planned: it conflicts if it acts on a memory those changes rewrote,
+        marked as past or deleted, or creates a memory in a topic they
+        created or updated.
 
-            elif action == "reinforce":
-                memory_id = decision.get("memory_id")
-                new_text = decision.get("new_memory_text")
+        Args:
+            decision: The LLM decision
+            changes: (apply index, touched ids, topics) of the changes
+        """
+        if not changes:
+            return False
+        referenced = self._decision_referenced_ids(decision)
+        topic = None
+        if decision.get("action") == "create":
+            topic = (decision.get("memory_data") or {}).get("topic")
+        for _, touched_ids, topics in changes:
+            if referenced & touched_ids or (topic and topic in topics):
+                return True
+        return False
 
-                if not memory_id:
-                    logger.warning(
-                        "LLM chose 'reinforce' but provided no memory_id."
-                    )
-                else:
-                    # Calculate decayed relevance increment for this session
-                    if session_update_counts is None:
-                        session_update_counts = {}
-                    update_count = session_update_counts.get(memory_id, 0)
-                    increment = self.scoring_config[
-                        "session_relevance_increment"
-                    ] * (
-                        self.scoring_config["session_relevance_decay_rate"]
-                        ** update_count
-                    )
-                    session_update_counts[memory_id] = update_count + 1
+    def _apply_memory_decision(
+        self,
+        decision: Optional[Dict],
+        user_message: Dict,
+        assistant_message: Dict,
+        session_update_counts: Dict[str, int] = None,
+    ) -> tuple[Optional[Dict], set]:
+        """
+        Executes a decision from _plan_memory_assimilation().
 
-                    if new_text:
-                        # This is a reinforcement that also updates the memory text.
-                        logger.info(
-                            f"LLM decided to update memory: {memory_id}"
-                        )
-                        # The return from _update_memory is the updated memory object
-                        # which needs to be passed back to the main loop.
-                        return self._update_memory(
+        Returns:
+            tuple: The created or updated memory object (or None), and the
+                   ids of the memories whose text or status changed (a plain
+                   reinforcement only changes relevance, so it's left out)
+        """
+        if not decision:
+            return None, set()
+        action = decision.get("action")
+        touched_ids = set()
+
+        # Check for memories to mark as past, regardless of action (except ignore)
+        past_ids = decision.get("past_memory_ids", [])
+        if past_ids:
+            self._mark_memories_as_past(past_ids)
+            touched_ids.update(past_ids)
+
+        # Step 4: Execute the decided action
+        if action == "ignore":
+            logger.info("LLM decided to ignore the conversation for memory.")
+            return None, touched_ids
+
+        elif action == "reinforce":
+            memory_id = decision.get("memory_id")
+            new_text = decision.get("new_memory_text")
+
+            if not memory_id:
+                logger.warning(
+                    "LLM chose 'reinforce' but provided no memory_id."
+                )
+            else:
+                # Calculate decayed relevance increment for this session
+                if session_update_counts is None:
+                    session_update_counts = {}
+                update_count = session_update_counts.get(memory_id, 0)
+                increment = self.scoring_config[
+                    "session_relevance_increment"
+                ] * (
+                    self.scoring_config["session_relevance_decay_rate"]
+                    ** update_count
+                )
+                session_update_counts[memory_id] = update_count + 1
+
+                if new_text:
+                    # This is a reinforcement that also updates the memory text.
+                    logger.info(f"LLM decided to update memory: {memory_id}")
+                    touched_ids.add(memory_id)
+                    # The return from _update_memory is the updated memory object
+                    # which needs to be passed back to the main loop.
+                    return (
+                        self._update_memory(
                             memory_id,
                             new_text,
                             user_message,
                             assistant_message,
                             increment=increment,
-                        )
-                    else:
-                        # This is a simple reinforcement, just boosting the score.
-                        logger.info(
-                            f"LLM decided to reinforce memory: {memory_id}"
-                        )
-                        self._reinforce_memory(memory_id, increment=increment)
-
-                # Handle duplicates for deletion
-                duplicates_to_delete = decision.get("duplicates", [])
-                if duplicates_to_delete:
-                    self._delete_memories(
-                        duplicates_to_delete, consolidate_into_id=memory_id
+                        ),
+                        touched_ids,
+                    )
+                else:
+                    # This is a simple reinforcement, just boosting the score.
+                    logger.info(
+                        f"LLM decided to reinforce memory: {memory_id}"
                     )
+                    self._reinforce_memory(memory_id, increment=increment)
 
-            elif action == "create":
-                logger.info("LLM decided to create a new memory.")
-                return self._create_new_memory(
-                    decision, user_message, assistant_message
+            # Handle duplicates for deletion
+            duplicates_to_delete = decision.get("duplicates", [])
+            if duplicates_to_delete:
+                self._delete_memories(
+                    duplicates_to_delete, consolidate_into_id=memory_id
                 )
+                touched_ids.update(duplicates_to_delete)
 
-            else:
-                logger.warning(f"LLM returned an unknown action: '{action}'")
-
-            return None
-        except json.JSONDecodeError:
-            logger.warning(
-                "LLM returned invalid JSON for memory processing:"
-                f" {llm_response_str}"
+        elif action == "create":
+            logger.info("LLM decided to create a new memory.")
+            new_memory = self._create_new_memory(
+                decision, user_message, assistant_message
             )
-            return None
-        except Exception as e:
-            logger.error(f"Failed to assimilate memory from conversation: {e}")
-            # Re-raise to be caught by the main loop for poison-pill handling
-            raise
+            if new_memory:
+                touched_ids.add(new_memory["id"])
+            return new_memory, touched_ids
+
+        else:
+            logger.warning(f"LLM returned an unknown action: '{action}'")
+
+        return None, touched_ids
@@ -19,7 +19,7 @@
 import logging
 from abc import ABC, abstractmethod
 from collections import Counter
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +46,18 @@ class OrakleMatcherBase(ABC):
         """
         pass
 
+    def register_skills(
+        self, skills: List[Tuple[str, str, Optional[Dict]]]
+    ):
+        """
+        Register several skills at once.
+
+        Args:
+            skills: List of (skill_id, description, metadata) tuples
+        """
+        for skill_id, description, metadata in skills:
+            self.register_skill(skill_id, description, metadata)
+
     @abstractmethod
     def match(
         self, query: str, threshold: float = 0.6, top_k: int = 5
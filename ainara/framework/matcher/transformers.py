@@ -16,21 +16,29 @@
 # MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
 # Lesser General Public License for more details.
 
+import hashlib
 import logging
+import os
 import pprint
 import re
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 try:
-    from sentence_transformers import SentenceTransformer
-    from sentence_transformers.util import cos_sim
+    import sentence_transformers  # noqa: F401
     SENTENCE_TRANSFORMERS_AVAILABLE = True
 except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
 from ainara.framework.config import ConfigManager
-from ainara.framework.utils import load_spacy_model
+from ainara.framework.embeddings import (
+    LRUEmbeddingCache,
+    embedding_model_id,
+    encode_cached,
+    get_embedding_model,
+)
+from ainara.framework.nlp import analyze_query, get_nlp
 
 from .base import OrakleMatcherBase
 
@@ -51,10 +59,32 @@ class OrakleMatcherTransformers(OrakleMatcherBase):
             model_name: The name of the transformer model to use
         """
         super().__init__()
-        self.embeddings_cache = {}
         self.model = None
+        self.model_name = model_name
         self.config = ConfigManager()
 
+        # Skill description embeddings are pinned for the process lifetime,
+        # while query embeddings live in a bounded LRU and age out.
+        self.skill_embeddings: Dict[str, np.ndarray] = {}
+        self.query_embeddings_cache = LRUEmbeddingCache(
+            max_entries=self.config.get(
+                "orakle.matcher.query_cache.max_entries", 1000
+            ),
+            max_mb=self.config.get("orakle.matcher.query_cache.max_mb", 16),
+        )
+
+        # Contiguous index of all skill embeddings, used to score every skill
+        # with a single matrix product. Rebuilt lazily after registrations.
+        self._skill_ids: List[str] = []
+        self._skill_matrix: Optional[np.ndarray] = None
+        self._boost_factors: Optional[np.ndarray] = None
+        self._index_dirty = True
+        self._index_lock = threading.Lock()
+
+        # Skill embeddings persisted across restarts, keyed by skill id and
+        # validated against a hash of the text that was embedded.
+        self._persisted_skills: Dict[str, Tuple[str, np.ndarray]] = {}
+
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise ImportError(
                 "sentence-transformers library not found. Please run 'pip"
@@ -62,7 +92,7 @@ class OrakleMatcherTransformers(OrakleMatcherBase):
             )
 
         try:
-            self.model = SentenceTransformer(
+            self.model = get_embedding_model(
                 model_name,
                 cache_folder=self.config.get("cache.directory")
             )
@@ -74,20 +104,31 @@ class OrakleMatcherTransformers(OrakleMatcherBase):
             logger.error(f"Failed to load model {model_name}: {e}")
             raise
 
-        self.nlp = load_spacy_model()
+        # The file name includes the encoder backend, so switching backends
+        # never mixes their vectors
+        model_slug = re.sub(
+            r"[^\w.-]", "_", embedding_model_id(self.model, model_name)
+        )
+        self._persisted_skills_path = os.path.join(
+            self.config.get("cache.directory"),
+            "matcher",
+            f"skill_embeddings_{model_slug}.npz",
+        )
+        self._load_persisted_skills()
+
+        # Query cleaning needs lemmas and token shapes, but no parse or NER
+        self.nlp = get_nlp("lemmas")
         if not self.nlp:
             logger.error("Failed to load spaCy model. Some functionality may be limited.")
 
-    def register_skill(
-        self, skill_id: str, description: str, metadata: Optional[Dict] = None
-    ):
+    def _prepare_skill_text(
+        self, skill_id: str, description: str, metadata: Optional[Dict]
+    ) -> Tuple[str, str, List[str]]:
         """
-        Register a new skill with enhanced domain context from its module path.
+        Builds the enhanced description and the text to embed for a skill.
 
-        Args:
-            skill_id: Unique identifier for the skill
-            description: Natural language description of the skill
-            metadata: Additional skill metadata
+        Returns:
+            Tuple of (enhanced_description, text_to_embed, boost_keywords)
         """
         # Extract domain context from module path
         domain_parts = skill_id.replace("/", " ").replace("_", " ").split()
@@ -129,19 +170,147 @@ class OrakleMatcherTransformers(OrakleMatcherBase):
         #     if matcher_info_text:
         #         text_to_embed += " " + matcher_info_text
 
-        self.skills_registry[skill_id] = {
-            "description": enhanced_description,
-            "metadata": metadata or {},
-            # "boost_keywords": boost_keywords,
-            "embedding": self._get_embedding(text_to_embed),
-        }
-        loginfo = {
-            "description": enhanced_description,
-            "boost_keywords": boost_keywords,
-            "text_to_embed": text_to_embed,
-            # "metadata": metadata or {},
-        }
-        logger.info(f"Registered skill: {skill_id} with data: {loginfo}")
+        return enhanced_description, text_to_embed, boost_keywords
+
+    def register_skill(
+        self, skill_id: str, description: str, metadata: Optional[Dict] = None
+    ):
+        """
+        Register a new skill with enhanced domain context from its module path.
+
+        Args:
+            skill_id: Unique identifier for the skill
+            description: Natural language description of the skill
+            metadata: Additional skill metadata
+        """
+        self.register_skills([(skill_id, description, metadata)])
+
+    def register_skills(
+        self, skills: List[Tuple[str, str, Optional[Dict]]]
+    ):
+        """
+        Register several skills at once.
+
+        Embeddings persisted by a previous run are reused when the text to
+        embed hasn't changed; only new or changed skills are encoded, in a
+        single batch.
+
+        Args:
+            skills: List of (skill_id, description, metadata) tuples
+        """
+        prepared = []
+        to_encode = []
+        for skill_id, description, metadata in skills:
+            enhanced_description, text_to_embed, boost_keywords = (
+                self._prepare_skill_text(skill_id, description, metadata)
+            )
+            text_hash = hashlib.sha256(
+                text_to_embed.encode("utf-8")
+            ).hexdigest()
+            if text_to_embed not in self.skill_embeddings:
+                persisted = self._persisted_skills.get(skill_id)
+                if persisted and persisted[0] == text_hash:
+                    self.skill_embeddings[text_to_embed] = persisted[1]
+                else:
+                    to_encode.append(text_to_embed)
+            prepared.append(
+                (
+                    skill_id,
+                    metadata,
+                    enhanced_description,
+                    text_to_embed,
+                    text_hash,
+                    boost_keywords,
+                )
+            )
+
+        if to_encode:
+            to_encode = list(dict.fromkeys(to_encode))
+            logger.info(f"Encoding {len(to_encode)} new or changed skills")
+            embeddings = encode_cached(self.model, self.model_name, to_encode)
+            for text, embedding in zip(to_encode, embeddings):
+                self.skill_embeddings[text] = embedding
+
+        persisted_changed = False
+        for (
+            skill_id,
+            metadata,
+            enhanced_description,
+            text_to_embed,
+            text_hash,
+            boost_keywords,
+        ) in prepared:
+            embedding = self._get_skill_embedding(text_to_embed)
+            self.skills_registry[skill_id] = {
+                "description": enhanced_description,
+                "metadata": metadata or {},
+                # "boost_keywords": boost_keywords,
+                "embedding": embedding,
+            }
+            persisted = self._persisted_skills.get(skill_id)
+            if not persisted or persisted[0] != text_hash:
+                self._persisted_skills[skill_id] = (text_hash, embedding)
+                persisted_changed = True
+            loginfo = {
+                "description": enhanced_description,
+                "boost_keywords": boost_keywords,
+                "text_to_embed": text_to_embed,
+                # "metadata": metadata or {},
+            }
+            logger.info(f"Registered skill: {skill_id} with data: {loginfo}")
+
+        self._index_dirty = True
+        if persisted_changed:
+            self._save_persisted_skills()
+
+    def _load_persisted_skills(self):
+        """Loads skill embeddings persisted by a previous run."""
+        if not os.path.exists(self._persisted_skills_path):
+            return
+        try:
+            with np.load(self._persisted_skills_path, allow_pickle=False) as data:
+                for skill_id, text_hash, embedding in zip(
+                    data["skill_ids"], data["hashes"], data["embeddings"]
+                ):
+                    self._persisted_skills[str(skill_id)] = (
+                        str(text_hash),
+                        embedding,
+                    )
+            logger.info(
+                f"Loaded {len(self._persisted_skills)} persisted skill"
+                f" embeddings from {self._persisted_skills_path}"
+            )
+        except Exception as e:
+            logger.warning(
+                "Could not load persisted skill embeddings, all skills will"
+                f" be re-embedded: {e}"
+            )
+            self._persisted_skills = {}
+
+    def _save_persisted_skills(self):
+        """Writes the persisted skill embeddings atomically."""
+        if not self._persisted_skills:
+            return
+        try:
+            os.makedirs(
+                os.path.dirname(self._persisted_skills_path), exist_ok=True
+            )
+            skill_ids = list(self._persisted_skills.keys())
+            tmp_path = self._persisted_skills_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    skill_ids=np.array(skill_ids),
+                    hashes=np.array(
+                        [self._persisted_skills[sid][0] for sid in skill_ids]
+                    ),
+                    embeddings=np.vstack(
+                        [self._persisted_skills[sid][1] for sid in skill_ids]
+                    ).astype(np.float32),
+                )
+            os.replace(tmp_path, self._persisted_skills_path)
+        except Exception as e:
+            logger.error(f"Failed to persist skill embeddings: {e}")
 
     def _get_embedding(self, text: str) -> np.ndarray:
         """
@@ -153,20 +322,84 @@ class OrakleMatcherTransformers(OrakleMatcherBase):
         Returns:
             Numpy array containing the text embedding
         """
-        if text in self.embeddings_cache:
-            return self.embeddings_cache[text]
+        return encode_cached(self.model, self.model_name, [text])[0]
+
+    def _get_skill_embedding(self, text: str) -> np.ndarray:
+        """Returns a skill description embedding, pinned in memory."""
+        embedding = self.skill_embeddings.get(text)
+        if embedding is None:
+            embedding = self._get_embedding(text)
+            self.skill_embeddings[text] = embedding
+        return embedding
+
+    def _get_query_embedding(self, text: str) -> np.ndarray:
+        """
+        Returns a query embedding through the bounded LRU cache.
 
-        embedding = self.model.encode(text)
-        self.embeddings_cache[text] = embedding
+        Queries are mostly one-off, so they bypass the persistent embedding
+        cache, which is kept for recurring content like skill descriptions.
+        """
+        embedding = self.query_embeddings_cache.get(text)
+        if embedding is None:
+            embedding = np.asarray(
+                self.model.encode([text]), dtype=np.float32
+            )[0]
+            self.query_embeddings_cache.put(text, embedding)
         return embedding
 
-    def _calculate_similarity(
-        self, query_embedding: np.ndarray, skill_embedding: np.ndarray
-    ) -> float:
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Returns embedding cache statistics for health reporting."""
+        return {
+            "skill_embeddings": len(self.skill_embeddings),
+            "query_embeddings": self.query_embeddings_cache.stats(),
+        }
+
+    def _rebuild_skill_index(self):
         """
-        Calculate cosine similarity between query and skill embeddings
+        Rebuilds the skill embedding matrix and boost factor vector.
+
+        Skill embeddings are stacked into a contiguous, L2-normalized float32
+        matrix so that cosine similarity against every skill is a single
+        matrix-vector product.
         """
-        return cos_sim(query_embedding, skill_embedding).item()
+        skill_ids = list(self.skills_registry.keys())
+        if not skill_ids:
+            self._skill_ids = []
+            self._skill_matrix = None
+            self._boost_factors = None
+            self._index_dirty = False
+            return
+
+        matrix = np.ascontiguousarray(
+            np.vstack(
+                [self.skills_registry[sid]["embedding"] for sid in skill_ids]
+            ),
+            dtype=np.float32,
+        )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.maximum(norms, 1e-12)
+        boost_factors = np.array(
+            [
+                self.skills_registry[sid]
+                .get("metadata", {})
+                .get("embeddings_boost_factor", 1.0)
+                for sid in skill_ids
+            ],
+            dtype=np.float32,
+        )
+
+        self._skill_ids = skill_ids
+        self._skill_matrix = matrix
+        self._boost_factors = boost_factors
+        self._index_dirty = False
+        logger.info(f"Rebuilt skill embedding index ({len(skill_ids)} skills)")
+
+    def _get_skill_index(self):
+        """Returns a consistent (ids, matrix, boosts) snapshot of the index."""
+        with self._index_lock:
+            if self._index_dirty:
+                self._rebuild_skill_index()
+            return self._skill_ids, self._skill_matrix, self._boost_factors
 
     def _clean_query(self, query: str) -> str:
         """
@@ -186,22 +419,11 @@ class OrakleMatcherTransformers(OrakleMatcherBase):
             )
             return query  # Fallback if spaCy failed to load
 
-        doc = self.nlp(query)
-        cleaned_tokens = []
-
-        for token in doc:
-            if token.like_url:
-                cleaned_tokens.append("[URL]")
-            elif token.like_email:
-                cleaned_tokens.append("[EMAIL]")
-            elif token.is_stop or token.is_punct:
-                # Skip stopwords and punctuation
-                continue
-            else:
-                # Use the lemma for normalization and convert to lowercase
-                cleaned_tokens.append(token.lemma_.lower())
-
-        return " ".join(cleaned_tokens)
+        # The analysis is shared with the other consumers of the same query
+        analysis = analyze_query(query)
+        if analysis is None:
+            return query
+        return analysis.cleaned_query
 
     def match(
         self, query: str, threshold: float = 0.15, top_k: int = 5
@@ -223,7 +445,9 @@ class OrakleMatcherTransformers(OrakleMatcherBase):
         logger.info(f"Original query: {query}")
         logger.info(f"Cleaned query: {cleaned_query}")
 
-        query_embedding = self._get_embedding(cleaned_query)
+        query_embedding = np.asarray(
+            self._get_query_embedding(cleaned_query), dtype=np.float32
+        )
         matches = []
 
         logger.info("MATCH query: " + query)  # Original query for context
@@ -231,30 +455,38 @@ class OrakleMatcherTransformers(OrakleMatcherBase):
         logger.info("MATCH threshold: " + str(threshold))
         logger.info("MATCH top_k: " + str(top_k))
 
-        for skill_id, skill_data in self.skills_registry.items():
-            embeddings_boost_factor = skill_data.get("metadata", {}).get(
-                "embeddings_boost_factor", 1.0
-            )
-            # logger.info(f"MATCH embeddings_boost_factor: {embeddings_boost_factor}")
-            similarity = (
-                self._calculate_similarity(
-                    query_embedding, skill_data["embedding"]
-                )
-                * embeddings_boost_factor
-            )
+        skill_ids, skill_matrix, boost_factors = self._get_skill_index()
+        if skill_matrix is None:
+            return []
 
-            # skills with a boost factor of 3 or more get always included
-            if similarity >= threshold or embeddings_boost_factor >= 3:
-                matches.append(
-                    {
-                        "skill_id": skill_id,
-                        "score": similarity,
-                        "usage_count": self.usage_stats[skill_id],
-                        "description": skill_data[
-                            "description"
-                        ],  # Original enhanced description
-                    }
-                )
+        query_embedding = query_embedding / max(
+            float(np.linalg.norm(query_embedding)), 1e-12
+        )
+        scores = (skill_matrix @ query_embedding) * boost_factors
+
+        # skills with a boost factor of 3 or more get always included
+        eligible = np.nonzero((scores >= threshold) | (boost_factors >= 3))[0]
+        if len(eligible) > top_k > 0:
+            # Keep only the top_k scores, plus any ties with the k-th score
+            # so the usage count tie-break below stays exact.
+            eligible_scores = scores[eligible]
+            kth_score = eligible_scores[
+                np.argpartition(-eligible_scores, top_k - 1)[top_k - 1]
+            ]
+            eligible = eligible[eligible_scores >= kth_score]
+
+        for idx in eligible:
+            skill_id = skill_ids[idx]
+            matches.append(
+                {
+                    "skill_id": skill_id,
+                    "score": float(scores[idx]),
+                    "usage_count": self.usage_stats[skill_id],
+                    "description": self.skills_registry[skill_id][
+                        "description"
+                    ],  # Original enhanced description
+                }
+            )
 
         # Sort by score and usage count
         matches.sort(
@@ -0,0 +1,340 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+import bisect
+import heapq
+import math
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Upper bound _reinforce_memory keeps relevance under
+MAX_REINFORCED_RELEVANCE = 200
+
+# Relevance is multiplied by DECAY_BASE ** rate once per decay epoch; past
+# memories fade four times faster than current ones.
+DECAY_BASE = 0.998
+DECAY_RATES = {"current": 1.0, "past": 4.0}
+
+
+def decay_epochs(decay_factor: float) -> float:
+    """Number of epochs equivalent to one decay by `decay_factor`."""
+    return math.log(decay_factor) / math.log(DECAY_BASE)
+
+
+class MemoryMirror:
+    """
+    In-process copy of the user_memories table.
+
+    GREENMemories is the only writer of the table, so it applies every
+    change here right after committing it to SQLite (write-through), and
+    the per-turn reads (key memories, topics, recent memories, counts) are
+    served from memory.
+
+    Relevance decays lazily. Rows keep the relevance they had when last
+    written and the decay epoch of that write; decaying only advances the
+    global epoch. The effective relevance is
+    `relevance * DECAY_BASE ** (rate * (epoch - row_epoch))`, and every
+    memory this class returns carries it, stamped with the current epoch
+    so that writing it back materializes the row.
+
+    Besides the id map the mirror keeps:
+    - ids per topic and per status
+    - (topic, status) counts for the distinct topic list
+    - ids ordered by relevance within each status, keyed by the
+      epoch-independent log of the relevance at epoch 0, so advancing the
+      epoch doesn't reorder them
+    - ids ordered by last_updated
+
+    All methods are thread-safe and return copies of the stored memories.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.epoch = 0.0
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_topic: Dict[str, set] = {}
+        self._by_status: Dict[str, set] = {}
+        self._topic_status = Counter()
+        # Per status, sorted (-log relevance at epoch 0, id) keys
+        self._relevance_order: Dict[str, List[Tuple[float, str]]] = {}
+        # Sorted (last_updated, id) keys
+        self._recency_order: List[Tuple[str, str]] = []
+
+    def load(self, memories: Iterable[Dict[str, Any]], epoch: float = 0.0):
+        """Replaces the mirror's contents and sets the decay epoch."""
+        with self._lock:
+            self.epoch = epoch
+            self._by_id = {}
+            self._by_topic = {}
+            self._by_status = {}
+            self._topic_status = Counter()
+            for memory in memories:
+                memory = self._copy(memory)
+                self._by_id[memory["id"]] = memory
+                self._index(memory)
+            self._relevance_order = {}
+            for memory in self._by_id.values():
+                self._relevance_order.setdefault(
+                    memory["status"], []
+                ).append(self._relevance_key(memory))
+            for keys in self._relevance_order.values():
+                keys.sort()
+            self._recency_order = sorted(
+                self._recency_key(m) for m in self._by_id.values()
+            )
+
+    @staticmethod
+    def _copy(memory: Dict[str, Any]) -> Dict[str, Any]:
+        memory = dict(memory)
+        if isinstance(memory.get("source_message_ids"), list):
+            memory["source_message_ids"] = list(memory["source_message_ids"])
+        memory.setdefault("status", "current")
+        memory["decay_epoch"] = float(memory.get("decay_epoch") or 0.0)
+        memory["relevance"] = float(memory.get("relevance") or 0.0)
+        return memory
+
+    @staticmethod
+    def _rate(status: str) -> float:
+        return DECAY_RATES.get(status, 1.0)
+
+    def _log_base_relevance(self, memory: Dict[str, Any]) -> float:
+        """Log of the memory's relevance extrapolated back to epoch 0."""
+        if memory["relevance"] <= 0:
+            return -math.inf
+        return math.log(memory["relevance"]) - self._rate(
+            memory["status"]
+        ) * memory["decay_epoch"] * math.log(DECAY_BASE)
+
+    def _relevance_key(self, memory: Dict[str, Any]) -> Tuple[float, str]:
+        return (-self._log_base_relevance(memory), memory["id"])
+
+    @staticmethod
+    def _recency_key(memory: Dict[str, Any]) -> Tuple[str, str]:
+        return (memory.get("last_updated") or "", memory["id"])
+
+    def _effective_relevance(self, memory: Dict[str, Any]) -> float:
+        elapsed = self.epoch - memory["decay_epoch"]
+        return memory["relevance"] * DECAY_BASE ** (
+            self._rate(memory["status"]) * elapsed
+        )
+
+    def _view(self, memory: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a memory with its relevance decayed to the current epoch."""
+        view = dict(memory)
+        if isinstance(view.get("source_message_ids"), list):
+            view["source_message_ids"] = list(view["source_message_ids"])
+        view["relevance"] = self._effective_relevance(memory)
+        view["decay_epoch"] = self.epoch
+        return view
+
+    def _index(self, memory: Dict[str, Any]):
+        """Adds a memory to the topic and status indexes."""
+        topic, status = memory.get("topic"), memory["status"]
+        self._by_topic.setdefault(topic, set()).add(memory["id"])
+        self._by_status.setdefault(status, set()).add(memory["id"])
+        self._topic_status[(topic, status)] += 1
+
+    def _unindex(self, memory: Dict[str, Any]):
+        """Removes a memory from the topic and status indexes."""
+        topic, status = memory.get("topic"), memory["status"]
+        self._by_topic[topic].discard(memory["id"])
+        if not self._by_topic[topic]:
+            del self._by_topic[topic]
+        self._by_status[status].discard(memory["id"])
+        self._topic_status[(topic, status)] -= 1
+        if self._topic_status[(topic, status)] <= 0:
+            del self._topic_status[(topic, status)]
+
+    @staticmethod
+    def _sorted_remove(keys: List[Tuple], key: Tuple):
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            del keys[index]
+
+    def _insert(self, memory: Dict[str, Any]):
+        self._by_id[memory["id"]] = memory
+        self._index(memory)
+        bisect.insort(
+            self._relevance_order.setdefault(memory["status"], []),
+            self._relevance_key(memory),
+        )
+        bisect.insort(self._recency_order, self._recency_key(memory))
+
+    def _remove(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        memory = self._by_id.pop(memory_id, None)
+        if memory is not None:
+            self._unindex(memory)
+            self._sorted_remove(
+                self._relevance_order[memory["status"]],
+                self._relevance_key(memory),
+            )
+            self._sorted_remove(
+                self._recency_order, self._recency_key(memory)
+            )
+        return memory
+
+    def upsert(self, memory: Dict[str, Any]):
+        """
+        Adds a memory or replaces the stored one with the same id.
+
+        The memory's relevance is taken as of its `decay_epoch`.
+        """
+        with self._lock:
+            self._remove(memory["id"])
+            self._insert(self._copy(memory))
+
+    def update(self, memory_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """
+        Changes fields of a stored memory, as written to SQLite.
+
+        Returns:
+            The updated memory, or None if it isn't mirrored
+        """
+        with self._lock:
+            memory = self._remove(memory_id)
+            if memory is None:
+                return None
+            memory.update(fields)
+            memory = self._copy(memory)
+            self._insert(memory)
+            return self._view(memory)
+
+    def remove(self, memory_ids: Iterable[str]):
+        """Drops memories from the mirror."""
+        with self._lock:
+            for memory_id in memory_ids:
+                self._remove(memory_id)
+
+    def advance_epoch(self, epochs: float = 1.0) -> float:
+        """
+        Decays every memory by moving the global epoch forward.
+
+        Returns:
+            The new epoch
+        """
+        with self._lock:
+            self.epoch += epochs
+            return self.epoch
+
+    def get(self, memory_id: str) -> Optional[Dict[str, Any]]:
+        """Returns a memory, or None."""
+        with self._lock:
+            memory = self._by_id.get(memory_id)
+            return self._view(memory) if memory is not None else None
+
+    def get_many(self, memory_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Returns the mirrored memories among the given ids."""
+        with self._lock:
+            return [
+                self._view(self._by_id[memory_id])
+                for memory_id in memory_ids
+                if memory_id in self._by_id
+            ]
+
+    def relevance(self, memory_id: str) -> Optional[float]:
+        """A memory's current effective relevance, or None."""
+        with self._lock:
+            memory = self._by_id.get(memory_id)
+            if memory is None:
+                return None
+            return self._effective_relevance(memory)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Returns every memory."""
+        with self._lock:
+            return [self._view(memory) for memory in self._by_id.values()]
+
+    def count(self, status: Optional[str] = None) -> int:
+        """Number of memories, optionally only with a given status."""
+        with self._lock:
+            if status is None:
+                return len(self._by_id)
+            return len(self._by_status.get(status, ()))
+
+    def topics(self, status: Optional[str] = "current") -> List[str]:
+        """Distinct topics, optionally of memories with a given status."""
+        with self._lock:
+            if status is None:
+                return list(self._by_topic)
+            return list(
+                dict.fromkeys(
+                    topic
+                    for topic, topic_status in self._topic_status
+                    if topic_status == status
+                )
+            )
+
+    def _by_relevance(self, status: Optional[str]) -> Iterable[str]:
+        """Memory ids by descending effective relevance."""
+        if status is not None:
+            return (
+                memory_id
+                for _, memory_id in self._relevance_order.get(status, ())
+            )
+        # Each status decays at its own rate, so merge on the effective value
+        return (
+            memory_id
+            for _, memory_id in heapq.merge(
+                *self._relevance_order.values(),
+                key=lambda key: -self._effective_relevance(
+                    self._by_id[key[1]]
+                ),
+            )
+        )
+
+    def top_by_relevance(
+        self,
+        limit: Optional[int] = None,
+        memory_type: Optional[str] = None,
+        status: Optional[str] = "current",
+        min_relevance: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Memories by descending effective relevance, filtered and limited."""
+        results = []
+        with self._lock:
+            for memory_id in self._by_relevance(status):
+                if limit is not None and len(results) >= limit:
+                    break
+                memory = self._by_id[memory_id]
+                if (
+                    min_relevance is not None
+                    and self._effective_relevance(memory) < min_relevance
+                ):
+                    break
+                if memory_type is not None and (
+                    memory.get("memory_type") != memory_type
+                ):
+                    continue
+                results.append(self._view(memory))
+        return results
+
+    def most_recent(
+        self, limit: Optional[int] = None, status: Optional[str] = "current"
+    ) -> List[Dict[str, Any]]:
+        """Memories by descending last_updated, filtered and limited."""
+        results = []
+        with self._lock:
+            for _, memory_id in reversed(self._recency_order):
+                if limit is not None and len(results) >= limit:
+                    break
+                memory = self._by_id[memory_id]
+                if status is not None and memory["status"] != status:
+                    continue
+                results.append(self._view(memory))
+        return results
@@ -0,0 +1,117 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+
+
+class RetrievalCache:
+    """
+    Turn-to-turn cache of contextual memory retrievals.
+
+    Entries are keyed by the embedding of the retrieval query: a new query
+    whose embedding is within `similarity_threshold` (cosine) of a cached
+    one reuses its candidates, as long as no memory was written since (the
+    memory version is unchanged) and the retrieval options match. Only the
+    parts of the ranking that don't depend on time or relevance are cached,
+    so the caller re-scores the candidates on every hit.
+
+    Thread-safe; the least recently used entry is evicted first.
+    """
+
+    def __init__(
+        self, similarity_threshold: float = 0.95, max_entries: int = 4
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # id -> (unit embedding, memory version, options, data)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _unit(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def lookup(
+        self, embedding: np.ndarray, version: int, options: Hashable
+    ) -> Optional[Any]:
+        """
+        Returns the data of the most similar matching entry, or None.
+
+        Args:
+            embedding: Embedding of the retrieval query
+            version: Current memory version
+            options: Retrieval options the entry must have been stored with
+        """
+        vector = self._unit(embedding)
+        with self._lock:
+            best_id, best_similarity = None, self.similarity_threshold
+            for entry_id, (cached, entry_version, entry_options, _) in (
+                self._entries.items()
+            ):
+                if entry_version != version or entry_options != options:
+                    continue
+                similarity = float(np.dot(vector, cached))
+                if similarity >= best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            if best_id is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best_id)
+            return self._entries[best_id][3]
+
+    def store(
+        self, embedding: np.ndarray, version: int, options: Hashable, data
+    ):
+        """Caches the data of a retrieval made at a memory version."""
+        vector = self._unit(embedding)
+        with self._lock:
+            self._entries[self._next_id] = (vector, version, options, data)
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drops every entry, e.g. after a memory write."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns usage counters for the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "similarity_threshold": self.similarity_threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
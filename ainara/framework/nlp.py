@@ -0,0 +1,214 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+import logging
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional
+
+from ainara.framework.utils import load_spacy_model
+
+logger = logging.getLogger(__name__)
+
+# Pipeline components each task can do without. Components not present in
+# the loaded model are ignored.
+PROFILES: Dict[str, List[str]] = {
+    # Everything enabled
+    "full": [],
+    # Dependency parse (reasoning heuristic), no entities
+    "syntax": ["ner"],
+    # Sentence boundaries come from the dependency parser
+    "sentences": ["tagger", "attribute_ruler", "lemmatizer", "ner"],
+    # Part-of-speech tags only
+    "pos": ["parser", "lemmatizer", "ner"],
+    # Lemmas, stopwords and token shapes for text normalization
+    "lemmas": ["parser", "ner"],
+}
+
+
+class NLPView:
+    """
+    A task-specific view over the shared spaCy pipeline.
+
+    Components not needed by the task are disabled per call, which leaves
+    the shared pipeline untouched and makes views safe to use from several
+    threads at once.
+    """
+
+    def __init__(self, nlp, profile: str, disable: List[str]):
+        self.nlp = nlp
+        self.profile = profile
+        self.disable = [name for name in disable if name in nlp.pipe_names]
+
+    def __call__(self, text: str):
+        return self.nlp(text, disable=self.disable)
+
+    def pipe(
+        self, texts: Iterable[str], batch_size: int = 64
+    ) -> Iterator:
+        """Processes texts as a stream of Docs, in batches."""
+        return self.nlp.pipe(
+            texts, disable=self.disable, batch_size=batch_size
+        )
+
+
+# Parts of speech that make a query worth a semantic search
+SUBSTANTIVE_POS = frozenset({"NOUN", "PROPN", "VERB", "ADJ"})
+
+
+class QueryAnalysis:
+    """
+    The linguistic analysis of one query, shared by every consumer in a turn.
+
+    Holds the parsed Doc and derives the features the reasoning heuristic,
+    the memory retrieval and the skill matcher need on first access.
+    """
+
+    def __init__(self, text: str, doc):
+        self.text = text
+        self.doc = doc
+
+    @cached_property
+    def lemmas(self) -> List[str]:
+        """Lowercased lemmas of every token."""
+        return [token.lemma_.lower() for token in self.doc]
+
+    @cached_property
+    def pos_set(self) -> FrozenSet[str]:
+        """Coarse part-of-speech tags present in the query."""
+        return frozenset(token.pos_ for token in self.doc)
+
+    @cached_property
+    def root_verb(self) -> str:
+        """Lowercased lemma of the root token when it is a verb."""
+        for token in self.doc:
+            if token.dep_ == "ROOT" and token.pos_ == "VERB":
+                return token.lemma_.lower()
+        return ""
+
+    @cached_property
+    def cleaned_query(self) -> str:
+        """
+        Lemmatized query without stopwords or punctuation, with URLs and
+        emails replaced by placeholders.
+        """
+        cleaned_tokens = []
+        for token in self.doc:
+            if token.like_url:
+                cleaned_tokens.append("[URL]")
+            elif token.like_email:
+                cleaned_tokens.append("[EMAIL]")
+            elif token.is_stop or token.is_punct:
+                continue
+            else:
+                cleaned_tokens.append(token.lemma_.lower())
+        return " ".join(cleaned_tokens)
+
+    @cached_property
+    def is_substantive(self) -> bool:
+        """True if the query has at least one noun, verb or adjective."""
+        return bool(self.pos_set & SUBSTANTIVE_POS)
+
+
+class NLPService:
+    """Loads the spaCy model once per process and hands out task views."""
+
+    def __init__(
+        self, model_name: str = "en_core_web_sm", analysis_cache_size: int = 32
+    ):
+        self.model_name = model_name
+        self._nlp = None
+        self._loaded = False
+        self._views: Dict[str, NLPView] = {}
+        self._lock = threading.Lock()
+        # Recent query analyses, so every consumer of a turn reuses one parse
+        self.analysis_cache_size = analysis_cache_size
+        self._analyses: "OrderedDict[str, QueryAnalysis]" = OrderedDict()
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if not self._loaded:
+                self._nlp = load_spacy_model(self.model_name)
+                self._loaded = True
+                if self._nlp:
+                    logger.info(
+                        "Shared spaCy pipeline ready:"
+                        f" {', '.join(self._nlp.pipe_names)}"
+                    )
+
+    def view(self, profile: str = "full") -> Optional[NLPView]:
+        """
+        Returns the view for a task profile, or None if spaCy isn't available.
+
+        Args:
+            profile: One of the keys in PROFILES
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown NLP profile: {profile}")
+        self._ensure_loaded()
+        if not self._nlp:
+            return None
+        with self._lock:
+            if profile not in self._views:
+                self._views[profile] = NLPView(
+                    self._nlp, profile, PROFILES[profile]
+                )
+            return self._views[profile]
+
+    def analyze(self, text: str) -> Optional[QueryAnalysis]:
+        """
+        Returns the shared analysis of a query, parsing it on first use.
+
+        Args:
+            text: The query text, analyzed as given (case preserved)
+
+        Returns:
+            The QueryAnalysis, or None if spaCy isn't available
+        """
+        with self._lock:
+            analysis = self._analyses.get(text)
+            if analysis is not None:
+                self._analyses.move_to_end(text)
+                return analysis
+
+        nlp = self.view("syntax")
+        if not nlp:
+            return None
+        analysis = QueryAnalysis(text, nlp(text))
+
+        with self._lock:
+            self._analyses[text] = analysis
+            self._analyses.move_to_end(text)
+            while len(self._analyses) > self.analysis_cache_size:
+                self._analyses.popitem(last=False)
+        return analysis
+
+
+# Global NLP service instance
+nlp_service = NLPService()
+
+
+def get_nlp(profile: str = "full") -> Optional[NLPView]:
+    """Returns a view over the shared spaCy pipeline for a task profile."""
+    return nlp_service.view(profile)
+
+
+def analyze_query(text: str) -> Optional[QueryAnalysis]:
+    """Returns the shared, per-turn analysis of a query."""
+    return nlp_service.analyze(text)
@@ -108,17 +108,24 @@ class OrakleMiddleware:
         self.system_skills = {}
         self._load_system_skills()
 
-        # Register skills with the matcher
-        for skill in self.capabilities:
-            self.matcher.register_skill(
-                skill["name"],
-                skill["description"],
-                metadata={
-                    "run_info": skill["run_info"],
-                    "matcher_info": skill["matcher_info"],
-                    "embeddings_boost_factor": skill.get("embeddings_boost_factor", 1.0),
-                },
-            )
+        # Register skills with the matcher (in one batch, so only new or
+        # changed skills get embedded)
+        self.matcher.register_skills(
+            [
+                (
+                    skill["name"],
+                    skill["description"],
+                    {
+                        "run_info": skill["run_info"],
+                        "matcher_info": skill["matcher_info"],
+                        "embeddings_boost_factor": skill.get(
+                            "embeddings_boost_factor", 1.0
+                        ),
+                    },
+                )
+                for skill in self.capabilities
+            ]
+        )
 
         # logger.info("-----------------")
         # logger.info(pprint.pformat(skill))
@@ -22,7 +22,6 @@
 import argparse
 import re
 import atexit
-import bisect
 import json
 import logging
 import os
@@ -30,7 +29,9 @@ import shutil
 import requests
 import signal
 import sys
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 
 from flask import Flask, Response, jsonify, request, send_file
@@ -42,6 +43,7 @@ from ainara.framework.backup import BackupManager
 from ainara.framework.chat_manager import ChatManager
 from ainara.framework.chat_memory import ChatMemory
 from ainara.framework.dependency_checker import DependencyChecker
+from ainara.framework.embeddings import get_embedding_cache, model_registry
 from ainara.framework.green_memories import GREENMemories
 from ainara.framework.health_monitor import HealthMonitor
 from ainara.framework.llm import create_llm_backend
@@ -490,6 +492,35 @@ def check_download_capability():
         }
 
 
+# Number of rendered days kept by the chat history view
+HISTORY_MARKDOWN_CACHE_SIZE = 64
+
+
+def _render_history_markdown(target_date, messages_for_day) -> str:
+    """Formats one day of chat history into a concise Markdown string."""
+    markdown_lines = [
+        f"### History for {target_date.strftime('%A, %B %d, %Y')}\n"
+    ]
+    if not messages_for_day:
+        markdown_lines.append("\n_No messages for this day._")
+        return "\n".join(markdown_lines)
+
+    for msg in messages_for_day:
+        role = msg.get("role", "unknown")
+        role_prefix = "U" if role == "user" else "A"
+        content = msg.get("content", "")
+        content = re.sub(r"\n+", "\n", content)
+        timestamp = msg.get("timestamp")
+
+        dt_object = datetime.fromisoformat(timestamp)
+        if dt_object.tzinfo is None:
+            dt_object = dt_object.replace(tzinfo=timezone.utc)
+
+        time_str = dt_object.astimezone().strftime("%H:%M:%S")
+        markdown_lines.append(f"`{time_str}` **{role_prefix}:** {content}")
+    return "\n".join(markdown_lines)
+
+
 def create_app():
     llm = create_llm_backend(config.get("llm", {}))
     app.llm = llm
@@ -616,9 +647,14 @@ def create_app():
     green_memories = None
     user_profile_summary = None
     if chat_memory:
+        # Models and the vector store load in the background, so the first
+        # chat only waits for the LLM
         green_memories = GREENMemories(
             llm=app.llm,
             chat_memory=chat_memory,
+            background_warm_up=config.get(
+                "user_profile.green_memories.background_warm_up", True
+            ),
         )
         logger.info("User Memories Manager initialized")
         # Perform initial consolidation at startup
@@ -633,16 +669,25 @@ def create_app():
                 f"Learning from last chat... ({current}/{total})",
             )
 
-        green_memories.process_new_messages_for_update(
-            progress_callback=memory_progress_callback,
-            max_progress=90
-        )
-        logger.info("Message processing complete.")
+        if config.get(
+            "user_profile.green_memories.assimilation.background", True
+        ):
+            # Serve chat right away; new turns are learned meanwhile
+            green_memories.start_background_update()
+            logger.info("Message processing continues in the background.")
+        else:
+            green_memories.process_new_messages_for_update(
+                progress_callback=memory_progress_callback,
+                max_progress=90
+            )
+            logger.info("Message processing complete.")
 
-        # Generate the narrative user profile summary
-        user_profile_summary = green_memories.generate_user_profile_summary()
+        # Narrative user profile summary, cached across restarts
+        user_profile_summary = green_memories.get_user_profile_summary(
+            wait_if_missing=True
+        )
         if user_profile_summary:
-            logger.info("User profile summary generated successfully.")
+            logger.info("User profile summary loaded successfully.")
 
     # Create chat_manager as app attribute so it's accessible to all routes
     app.chat_manager = ChatManager(
@@ -720,6 +765,28 @@ def create_app():
         else:
             status["backup"] = {"enabled": False, "status": "disabled"}
 
+        # Embedding cache statistics (informational, never degrade status)
+        caches = {}
+        try:
+            caches["matcher"] = (
+                app.chat_manager.orakle_middleware.matcher.get_cache_stats()
+            )
+        except AttributeError:
+            pass
+        embedding_cache = get_embedding_cache()
+        if embedding_cache:
+            caches["embeddings"] = embedding_cache.stats()
+        green_memories = getattr(app.chat_manager, "green_memories", None)
+        if green_memories and green_memories.retrieval_cache:
+            caches["memory_retrieval"] = green_memories.retrieval_cache.stats()
+        status["caches"] = caches
+        status["embedding_batching"] = model_registry.batching_stats()
+        if green_memories:
+            status["memory_warm_up"] = green_memories.get_warm_up_status()
+            status["memory_assimilation"] = (
+                green_memories.get_assimilation_status()
+            )
+
         # Check if all essential services are available
         all_services_ok = all(status["services"].values())
         all_dependencies_ok = all(status["dependencies"].values())
@@ -831,6 +898,12 @@ def create_app():
 
         return Response(generate(), mimetype="text/event-stream")
 
+    # Rendered history by day, with the message count it was rendered from:
+    # messages are only ever added, so an unchanged count means an
+    # unchanged day, including past days that got imported messages
+    history_markdown_cache = OrderedDict()
+    history_cache_lock = threading.Lock()
+
     @app.route("/framework/chat/history", methods=["GET"])
     def get_chat_history():
         """
@@ -851,9 +924,8 @@ def create_app():
 
         try:
             memory = app.chat_manager.chat_memory
-            total_messages = memory.get_total_messages()
-            logger.info(f"total_messages: {total_messages}")
-            if total_messages == 0:
+            latest_day = memory.get_adjacent_history_day(None, "previous")
+            if latest_day is None:
                 return jsonify(
                     {
                         "history": "# Chat History\n\nNo history found.",
@@ -865,99 +937,55 @@ def create_app():
                     }
                 )
 
-            # Fetch all messages and group by date
-            all_messages = memory.get_chat_history(
-                limit=total_messages, offset=0
-            )
-            messages_by_date = {}
-            for msg in all_messages:
-                # TODO get messages by day instead of getting all together
-                # logger.info(f"msg: {msg}")
-                timestamp_str = msg.get("timestamp")
-                # logger.info(f"timestamp_str: {timestamp_str}")
-                if timestamp_str:
-                    # Ensure timestamp is timezone-aware before converting
-                    dt_object = datetime.fromisoformat(timestamp_str)
-                    if dt_object.tzinfo is None:
-                        dt_object = dt_object.replace(tzinfo=timezone.utc)
-
-                    msg_date = dt_object.astimezone().date()
-                    if msg_date not in messages_by_date:
-                        messages_by_date[msg_date] = []
-                    messages_by_date[msg_date].append(msg)
-
-            if not messages_by_date:
-                return jsonify(
-                    {
-                        "history": (
-                            "# Chat History\n\nNo history found for today."
-                        ),
-                        "date": (
-                            datetime.now(timezone.utc).strftime("%Y-%m-%d")
-                        ),
-                        "has_previous": False,
-                        "has_next": False,
-                    }
-                )
-
-            sorted_dates = sorted(messages_by_date.keys())
-
-            # Determine target date
+            # Determine target date, defaulting to the most recent day with
+            # messages
             date_str = request.args.get("date")
             if date_str:
                 target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
             else:
-                # Default to the most recent day with messages
-                target_date = sorted_dates[-1]
-
-            # Get messages for the target day
-            messages_for_day = messages_by_date.get(target_date, [])
-            messages_for_day.sort(key=lambda m: m.get("timestamp"))
-
-            # Format into a concise Markdown string
-            markdown_lines = [
-                f"### History for {target_date.strftime('%A, %B %d, %Y')}\n"
-            ]
-            if not messages_for_day:
-                markdown_lines.append("\n_No messages for this day._")
-            else:
-                for msg in messages_for_day:
-                    role = msg.get("role", "unknown")
-                    role_prefix = "U" if role == "user" else "A"
-                    content = msg.get("content", "")
-                    content = re.sub(r"\n+", "\n", content)
-                    # content = re.sub(r"^\n+", "", content)
-                    timestamp = msg.get("timestamp")
-
-                    dt_object = datetime.fromisoformat(timestamp)
-                    if dt_object.tzinfo is None:
-                        dt_object = dt_object.replace(tzinfo=timezone.utc)
-
-                    time_str = dt_object.astimezone().strftime(
-                        "%H:%M:%S"
-                    )
-                    markdown_lines.append(
-                        f"`{time_str}` **{role_prefix}:** {content}"
+                target_date = datetime.strptime(
+                    latest_day, "%Y-%m-%d"
+                ).date()
+            target_day = target_date.isoformat()
+
+            message_count = memory.get_history_day_count(target_day)
+            history_md = None
+            with history_cache_lock:
+                cached = history_markdown_cache.get(target_day)
+                if cached and cached[0] == message_count:
+                    history_md = cached[1]
+                    history_markdown_cache.move_to_end(target_day)
+
+            if history_md is None:
+                messages = memory.get_history_for_day(target_day)
+                history_md = _render_history_markdown(target_date, messages)
+                with history_cache_lock:
+                    # Keyed on the count of the messages actually rendered
+                    history_markdown_cache[target_day] = (
+                        len(messages),
+                        history_md,
                     )
-
-            history_md = "\n".join(markdown_lines)
+                    history_markdown_cache.move_to_end(target_day)
+                    while (
+                        len(history_markdown_cache)
+                        > HISTORY_MARKDOWN_CACHE_SIZE
+                    ):
+                        history_markdown_cache.popitem(last=False)
 
             # Determine if previous/next days with history exist
-            try:
-                current_date_index = sorted_dates.index(target_date)
-                has_previous = current_date_index > 0
-                has_next = current_date_index < len(sorted_dates) - 1
-            except ValueError:
-                # This can happen if a date is requested that has no messages.
-                # Find where it would be inserted to determine prev/next.
-                insertion_point = bisect.bisect_left(sorted_dates, target_date)
-                has_previous = insertion_point > 0
-                has_next = insertion_point < len(sorted_dates)
+            has_previous = (
+                memory.get_adjacent_history_day(target_day, "previous")
+                is not None
+            )
+            has_next = (
+                memory.get_adjacent_history_day(target_day, "next")
+                is not None
+            )
 
             return jsonify(
                 {
                     "history": history_md,
-                    "date": target_date.strftime("%Y-%m-%d"),
+                    "date": target_day,
                     "has_previous": has_previous,
                     "has_next": has_next,
                 }
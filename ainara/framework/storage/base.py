@@ -18,7 +18,23 @@
 
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def local_day(timestamp: str) -> Optional[str]:
+    """
+    Returns the local calendar day (YYYY-MM-DD) of a stored timestamp.
+
+    Naive timestamps are taken as UTC, as the chat history view does.
+    """
+    try:
+        dt_object = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    if dt_object.tzinfo is None:
+        dt_object = dt_object.replace(tzinfo=timezone.utc)
+    return dt_object.astimezone().date().isoformat()
 
 
 class StorageBackend(ABC):
@@ -77,6 +93,95 @@ class StorageBackend(ABC):
         """
         pass
 
+    def iter_messages(
+        self, batch_size: int = 500, since: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream all messages, oldest first
+
+        Backends should page through storage so memory use stays constant.
+        This default falls back to get_messages with offsets.
+
+        Args:
+            batch_size: Number of messages fetched per page
+            since: Only messages strictly after this timestamp
+
+        Yields:
+            Message dictionaries
+        """
+        total = self.get_message_count()
+        for offset in range(total - batch_size, -batch_size, -batch_size):
+            page = self.get_messages(
+                limit=batch_size + min(offset, 0), offset=max(offset, 0)
+            )
+            for message in reversed(page):
+                if not since or message["timestamp"] > since:
+                    yield message
+
+    def get_message_days(self) -> List[str]:
+        """
+        List the local days that have messages
+
+        This default scans every message; backends should keep an index.
+
+        Returns:
+            Days as YYYY-MM-DD strings, ascending
+        """
+        days = {local_day(m["timestamp"]) for m in self.iter_messages()}
+        days.discard(None)
+        return sorted(days)
+
+    def get_message_day_count(self, day: str) -> int:
+        """
+        Count the messages of one local day
+
+        Args:
+            day: The day as YYYY-MM-DD
+
+        Returns:
+            Number of messages
+        """
+        return len(self.get_messages_for_day(day))
+
+    def get_adjacent_message_day(
+        self, day: Optional[str] = None, direction: str = "previous"
+    ) -> Optional[str]:
+        """
+        Find the closest day with messages before or after a day
+
+        Args:
+            day: Reference day (YYYY-MM-DD), or None for the latest/earliest
+            direction: "previous" or "next"
+
+        Returns:
+            The day, or None if there is none
+        """
+        if direction not in ("previous", "next"):
+            raise ValueError(f"Invalid direction: {direction}")
+        days = self.get_message_days()
+        if direction == "previous":
+            days = [d for d in days if day is None or d < day]
+            return days[-1] if days else None
+        days = [d for d in days if day is None or d > day]
+        return days[0] if days else None
+
+    def get_messages_for_day(self, day: str) -> List[Dict]:
+        """
+        Retrieve the messages of one local day, oldest first
+
+        This default scans every message; backends should query by
+        timestamp range.
+
+        Args:
+            day: The day as YYYY-MM-DD
+
+        Returns:
+            List of message dictionaries
+        """
+        return [
+            m for m in self.iter_messages() if local_day(m["timestamp"]) == day
+        ]
+
     @abstractmethod
     def close(self):
         """Close any open resources"""
@@ -22,13 +22,21 @@ import os
 import uuid
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from .vector_base import VectorStorageBackend
 
 from ainara.framework.config import config
+from ainara.framework.embeddings import (
+    embedding_model_id,
+    encode_cached,
+    get_embedding_model,
+    release_embedding_model,
+)
 
 try:
     import chromadb
-    from sentence_transformers import SentenceTransformer
+    import sentence_transformers  # noqa: F401
 
     VECTOR_DB_AVAILABLE = True
 except ImportError:
@@ -40,6 +48,9 @@ logger = logging.getLogger(__name__)
 class ChromaVectorStorage(VectorStorageBackend):
     """Direct ChromaDB implementation for semantic search"""
 
+    supports_vector_search = True
+    supports_metadata_listing = True
+
     def __init__(
         self,
         vector_db_path: str = None,
@@ -66,8 +77,9 @@ class ChromaVectorStorage(VectorStorageBackend):
 
         self.collection_name = collection_name
 
-        # Initialize embeddings
-        self.embedding_model = SentenceTransformer(
+        # Initialize embeddings (shared with the rest of the process)
+        self.embedding_model_name = embedding_model
+        self.embedding_model = get_embedding_model(
             embedding_model,
             cache_folder=config.get("cache.directory")
         )
@@ -81,21 +93,85 @@ class ChromaVectorStorage(VectorStorageBackend):
             name=collection_name
         )
 
+        # Vectors are only comparable within one encoder (model + backend)
+        self.embedding_model_id = embedding_model_id(
+            self.embedding_model, embedding_model
+        )
+        self.needs_reindex = self._check_embedding_model()
+
         logger.info(
             f"Vector storage initialized at {vector_db_path} with collection"
             f" {collection_name}"
         )
 
+    def _check_embedding_model(self) -> bool:
+        """
+        Compares the encoder the collection was indexed with against the
+        current one, recording it on collections that don't have it yet.
+
+        Returns:
+            True if the stored vectors come from a different encoder and
+            the collection must be re-indexed
+        """
+        metadata = self.collection.metadata or {}
+        indexed_with = metadata.get("embedding_model")
+        if indexed_with is None:
+            # Collections from before the encoder was recorded were indexed
+            # by the torch encoder of the configured model
+            indexed_with = (
+                self.embedding_model_name
+                if self.collection.count()
+                else self.embedding_model_id
+            )
+        if indexed_with != self.embedding_model_id:
+            logger.warning(
+                f"Collection {self.collection_name} was indexed with"
+                f" '{indexed_with}' but the current encoder is"
+                f" '{self.embedding_model_id}'. It needs to be re-indexed."
+            )
+            return True
+        if metadata.get("embedding_model") != self.embedding_model_id:
+            try:
+                self.collection.modify(
+                    metadata={"embedding_model": self.embedding_model_id}
+                )
+            except Exception as e:
+                logger.warning(f"Could not record collection encoder: {e}")
+        return False
+
+    def _encode(self, texts: List[str]):
+        """Embed texts, reusing vectors from the persistent embedding cache"""
+        return encode_cached(
+            self.embedding_model, self.embedding_model_name, texts
+        )
+
     def add_text(self, text: str, metadata: Dict[str, Any]) -> str:
         """Add a single text to vector database"""
         doc = {"page_content": text, "metadata": metadata}
         ids = self.add_documents([doc])
         return ids[0] if ids else None
 
+    def _prepare_documents(self, documents: List[Dict[str, Any]]):
+        """Splits documents into texts, Chroma-safe metadatas and IDs."""
+        texts = [doc["page_content"] for doc in documents]
+        metadatas = [doc["metadata"] for doc in documents]
+        # ChromaDB requires string IDs
+        ids = [meta.get("id", str(uuid.uuid4())) for meta in metadatas]
+
+        # ChromaDB can't handle non-primitive types in metadata, so we stringify complex values
+        for meta in metadatas:
+            for key, value in meta.items():
+                if not isinstance(value, (str, int, float, bool)):
+                    meta[key] = str(value)
+        return texts, metadatas, ids
+
     def add_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
         """
         Add multiple documents to vector database
 
+        Documents whose ID is already stored are left unchanged; use
+        upsert_documents() to replace them.
+
         Args:
             documents: List of document dictionaries, each with 'page_content' and 'metadata'
 
@@ -105,19 +181,32 @@ class ChromaVectorStorage(VectorStorageBackend):
         if not documents:
             return []
 
-        texts = [doc["page_content"] for doc in documents]
-        metadatas = [doc["metadata"] for doc in documents]
-        # ChromaDB requires string IDs
-        ids = [meta.get("id", str(uuid.uuid4())) for meta in metadatas]
+        texts, metadatas, ids = self._prepare_documents(documents)
+        self.collection.add(
+            embeddings=self._encode(texts).tolist(),
+            documents=texts,
+            metadatas=metadatas,
+            ids=ids,
+        )
 
-        # ChromaDB can't handle non-primitive types in metadata, so we stringify complex values
-        for meta in metadatas:
-            for key, value in meta.items():
-                if not isinstance(value, (str, int, float, bool)):
-                    meta[key] = str(value)
+        return ids
 
-        self.collection.add(
-            embeddings=self.embedding_model.encode(texts).tolist(),
+    def upsert_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add documents, replacing any stored under the same IDs
+
+        Args:
+            documents: List of document dictionaries, each with 'page_content' and 'metadata'
+
+        Returns:
+            List of document IDs
+        """
+        if not documents:
+            return []
+
+        texts, metadatas, ids = self._prepare_documents(documents)
+        self.collection.upsert(
+            embeddings=self._encode(texts).tolist(),
             documents=texts,
             metadatas=metadatas,
             ids=ids,
@@ -125,6 +214,22 @@ class ChromaVectorStorage(VectorStorageBackend):
 
         return ids
 
+    def get_all_metadata(
+        self, batch_size: int = 1000
+    ) -> Dict[str, Dict[str, Any]]:
+        """Returns the metadata of every document, keyed by ID."""
+        all_metadata = {}
+        offset = 0
+        while True:
+            page = self.collection.get(
+                include=["metadatas"], limit=batch_size, offset=offset
+            )
+            for doc_id, metadata in zip(page["ids"], page["metadatas"]):
+                all_metadata[doc_id] = metadata or {}
+            if len(page["ids"]) < batch_size:
+                return all_metadata
+            offset += batch_size
+
     def search(
         self,
         query: str,
@@ -142,10 +247,8 @@ class ChromaVectorStorage(VectorStorageBackend):
         Returns:
             List of search results
         """
-        query_embedding = self.embedding_model.encode([query]).tolist()
-
         results = self.collection.query(
-            query_embeddings=query_embedding,
+            query_embeddings=[self.embed_query(query)],
             n_results=limit,
             where=filter_dict if filter_dict else None,
         )
@@ -187,10 +290,43 @@ class ChromaVectorStorage(VectorStorageBackend):
         Returns:
             List of tuples, where each tuple contains a result dictionary and its distance score.
         """
-        query_embedding = self.embedding_model.encode([query]).tolist()
+        return self.search_by_vector(
+            self.embed_query(query), limit=limit, filter_dict=filter_dict
+        )
+
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embeds a query with the collection's embedding model.
+
+        Queries bypass the persistent embedding cache, which is kept for
+        the stored documents.
+        """
+        return np.asarray(
+            self.embedding_model.encode([query]), dtype=np.float32
+        )[0].tolist()
+
+    def search_by_vector(
+        self,
+        query_embedding: List[float],
+        limit: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None,
+    ) -> List[tuple[Dict[str, Any], float]]:
+        """
+        Search with a precomputed query embedding.
+
+        Args:
+            query_embedding: Query vector from the collection's embedding model
+            limit: Maximum number of results
+            filter_dict: Optional metadata filters for ChromaDB's 'where' clause
+
+        Returns:
+            List of tuples, where each tuple contains a result dictionary and its distance score.
+        """
+        if hasattr(query_embedding, "tolist"):
+            query_embedding = query_embedding.tolist()
 
         results = self.collection.query(
-            query_embeddings=query_embedding,
+            query_embeddings=[query_embedding],
             n_results=limit,
             where=filter_dict if filter_dict else None,
         )
@@ -222,8 +358,10 @@ class ChromaVectorStorage(VectorStorageBackend):
         logger.info(f"Resetting Chroma collection: {self.collection_name}")
         self.client.delete_collection(name=self.collection_name)
         self.collection = self.client.get_or_create_collection(
-            name=self.collection_name
+            name=self.collection_name,
+            metadata={"embedding_model": self.embedding_model_id},
         )
+        self.needs_reindex = False
         logger.info(f"Collection {self.collection_name} has been reset.")
 
     def count(self) -> int:
@@ -234,4 +372,10 @@ class ChromaVectorStorage(VectorStorageBackend):
         """Close vector database"""
         # The PersistentClient in ChromaDB handles persistence automatically.
         # No explicit close or persist method is typically needed.
-        pass
+        # Drop our reference to the shared embedding model.
+        if self.embedding_model is not None:
+            release_embedding_model(
+                self.embedding_model_name,
+                cache_folder=config.get("cache.directory"),
+            )
+            self.embedding_model = None
@@ -20,17 +20,134 @@
 import json
 import logging
 import os
+import re
 import sqlite3
+import threading
 import time
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from ainara.framework.storage.base import StorageBackend
+from ainara.framework.storage.base import StorageBackend, local_day
 
 logger = logging.getLogger(__name__)
 
 
+class _ReaderConnection:
+    """Holds a thread's reader connection and closes it with the thread."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _local_timezone_key() -> str:
+    """Identifies the local timezone the day index was built for."""
+    return f"{'/'.join(time.tzname)}:{time.timezone}"
+
+
+class SQLiteConnectionManager:
+    """
+    One serialized writer connection plus a read connection per thread.
+
+    The database runs in WAL mode, where readers work on the last committed
+    snapshot and never wait for a writer. All writes go through `write()`,
+    which serializes them on the single writer connection; reads go through
+    `reader()`, which returns a connection owned by the calling thread, so a
+    long background UPDATE never holds up reads from the request thread.
+    """
+
+    def __init__(self, db_path: str, timeout: float = 30.0):
+        """
+        Initialize the connection manager
+
+        Args:
+            db_path: Path to the SQLite database file
+            timeout: Seconds a connection waits on a locked database
+        """
+        self.db_path = db_path
+        self.timeout = timeout
+
+        self.writer = sqlite3.connect(
+            db_path, timeout=timeout, check_same_thread=False
+        )
+        self.writer.row_factory = sqlite3.Row
+        self.writer.execute("PRAGMA journal_mode=WAL;")
+        self.writer.execute("PRAGMA synchronous=NORMAL;")
+        # Re-entrant, so a write can call helpers that also write
+        self._write_lock = threading.RLock()
+
+        self._local = threading.local()
+        # Weak references: a reader is closed when its thread goes away
+        self._readers: "weakref.WeakSet[_ReaderConnection]" = weakref.WeakSet()
+        self._readers_lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Runs a write transaction on the writer connection.
+
+        Commits on success and rolls back on error. Reads inside the block
+        see the transaction's own changes.
+        """
+        with self._write_lock:
+            with self.writer:
+                yield self.writer
+
+    def reader(self) -> sqlite3.Connection:
+        """Returns the calling thread's read connection, opening it if needed."""
+        holder = getattr(self._local, "reader", None)
+        if holder is None or holder.conn is None:
+            if self._closed:
+                raise sqlite3.ProgrammingError(
+                    "Cannot operate on a closed database."
+                )
+            conn = sqlite3.connect(
+                self.db_path, timeout=self.timeout, check_same_thread=False
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=ON;")
+            holder = _ReaderConnection(conn)
+            self._local.reader = holder
+            with self._readers_lock:
+                self._readers.add(holder)
+        return holder.conn
+
+    def reader_count(self) -> int:
+        """Number of open per-thread reader connections."""
+        with self._readers_lock:
+            return sum(1 for holder in self._readers if holder.conn)
+
+    def vacuum(self):
+        """Runs VACUUM on the writer connection, outside any transaction."""
+        with self._write_lock:
+            self.writer.execute("VACUUM")
+
+    def close(self):
+        """Closes the writer and every reader connection."""
+        self._closed = True
+        with self._readers_lock:
+            readers = list(self._readers)
+        for holder in readers:
+            holder.close()
+        with self._write_lock:
+            self.writer.close()
+
+
 class SQLiteStorage(StorageBackend):
     """LangChain SQLite implementation of chat storage"""
 
@@ -54,29 +171,39 @@ class SQLiteStorage(StorageBackend):
         db_dir = os.path.dirname(os.path.abspath(db_path))
         os.makedirs(db_dir, exist_ok=True)
 
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.conn.execute("PRAGMA journal_mode=WAL;")
+        self.db = SQLiteConnectionManager(db_path)
+        # The writer connection, kept for callers that predate write()
+        self.conn = self.db.writer
         self._create_table()
+        self.fts_enabled = self._create_search_index()
+        self._check_message_days()
 
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT value FROM db_metadata WHERE key = 'memory_id'")
-        row = cursor.fetchone()
-        if row is None:
-            memory_id = str(uuid.uuid4())
-            with self.conn:
-                self.conn.execute(
+        with self.write() as conn:
+            row = conn.execute(
+                "SELECT value FROM db_metadata WHERE key = 'memory_id'"
+            ).fetchone()
+            if row is None:
+                memory_id = str(uuid.uuid4())
+                conn.execute(
                     "INSERT INTO db_metadata (key, value) VALUES (?, ?)",
                     ("memory_id", memory_id),
                 )
-            self.memory_id = memory_id
-        else:
-            self.memory_id = row[0]
+                self.memory_id = memory_id
+            else:
+                self.memory_id = row[0]
+
+    def write(self):
+        """Context manager for a serialized write transaction."""
+        return self.db.write()
+
+    def reader(self) -> sqlite3.Connection:
+        """The calling thread's read-only connection."""
+        return self.db.reader()
 
     def _create_table(self):
         """Create tables and set schema version if they don't exist."""
-        with self.conn:
-            self.conn.execute(
+        with self.write() as conn:
+            conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS messages (
                     id TEXT PRIMARY KEY,
@@ -85,22 +212,42 @@ class SQLiteStorage(StorageBackend):
                     role TEXT NOT NULL,
                     content TEXT NOT NULL,
                     user TEXT,
-                    metadata TEXT
+                    metadata TEXT,
+                    vector_indexed INTEGER NOT NULL DEFAULT 1
                 )
                 """
             )
-            # Add indexes for faster queries
-            self.conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_context_timestamp ON messages"
-                " (context_id, timestamp);"
+            columns = [
+                row[1]
+                for row in conn.execute("PRAGMA table_info(messages)")
+            ]
+            if "vector_indexed" not in columns:
+                # Existing rows were embedded synchronously when added
+                logger.info("Adding 'vector_indexed' column to messages.")
+                conn.execute(
+                    "ALTER TABLE messages ADD COLUMN vector_indexed INTEGER"
+                    " NOT NULL DEFAULT 1"
+                )
+            # Only rows still waiting for their embedding are indexed
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_messages_vector_pending ON"
+                " messages (context_id, timestamp) WHERE vector_indexed = 0;"
+            )
+            # Add indexes for faster queries. The id column makes
+            # (timestamp, id) keyset pagination an index range scan; it
+            # supersedes the former (context_id, timestamp) index.
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_context_timestamp_id ON"
+                " messages (context_id, timestamp, id);"
             )
-            self.conn.execute(
+            conn.execute("DROP INDEX IF EXISTS idx_context_timestamp;")
+            conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_context_user ON messages"
                 " (context_id, user);"
             )
 
             # Add a metadata table for versioning
-            self.conn.execute(
+            conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS db_metadata (
                     key TEXT PRIMARY KEY,
@@ -109,13 +256,13 @@ class SQLiteStorage(StorageBackend):
                 """
             )
             # Initialize the schema version
-            self.conn.execute(
+            conn.execute(
                 "INSERT OR IGNORE INTO db_metadata (key, value) VALUES (?, ?)",
                 ("schema_version", "1.0"),
             )
 
             # Add a generic cache table
-            self.conn.execute(
+            conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS api_cache (
                     cache_key TEXT PRIMARY KEY,
@@ -125,17 +272,313 @@ class SQLiteStorage(StorageBackend):
                 )
                 """
             )
-            self.conn.execute(
+            conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_cache_provider ON api_cache (provider);"
             )
 
+            # Local days that have messages, with their message counts
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS message_days (
+                    context_id TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    message_count INTEGER NOT NULL,
+                    PRIMARY KEY (context_id, day)
+                ) WITHOUT ROWID
+                """
+            )
+
+    def _create_search_index(self) -> bool:
+        """
+        Creates the FTS5 index over message contents, kept in sync with the
+        messages table by triggers. Existing databases are backfilled once,
+        and indexes of the previous layout are rebuilt in this one.
+
+        Returns:
+            True if full-text search is available
+        """
+        try:
+            with self.write() as conn:
+                row = conn.execute(
+                    "SELECT value FROM db_metadata WHERE key = 'fts_version'"
+                ).fetchone()
+                if row is None or row[0] != "2":
+                    # Version 1 mapped the index to the implicit rowids of
+                    # messages, which VACUUM may renumber
+                    for trigger in ("insert", "delete", "update"):
+                        conn.execute(
+                            f"DROP TRIGGER IF EXISTS messages_fts_{trigger}"
+                        )
+                    conn.execute("DROP TABLE IF EXISTS messages_fts")
+                    conn.execute("DROP TABLE IF EXISTS messages_fts_ids")
+
+                # Contentless index: the text lives only in messages. Index
+                # rows are keyed on the INTEGER PRIMARY KEY of
+                # messages_fts_ids, which maps them to message ids and,
+                # unlike an implicit rowid, is kept as is by VACUUM.
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS messages_fts_ids (
+                        fts_rowid INTEGER PRIMARY KEY,
+                        message_id TEXT NOT NULL UNIQUE
+                    )
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+                        content,
+                        content='',
+                        tokenize='unicode61 remove_diacritics 2'
+                    )
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS messages_fts_insert
+                    AFTER INSERT ON messages BEGIN
+                        INSERT INTO messages_fts_ids (message_id)
+                        VALUES (new.id);
+                        INSERT INTO messages_fts (rowid, content)
+                        VALUES (last_insert_rowid(), new.content);
+                    END
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS messages_fts_delete
+                    AFTER DELETE ON messages BEGIN
+                        INSERT INTO messages_fts (messages_fts, rowid, content)
+                        SELECT 'delete', fts_rowid, old.content
+                        FROM messages_fts_ids WHERE message_id = old.id;
+                        DELETE FROM messages_fts_ids WHERE message_id = old.id;
+                    END
+                    """
+                )
+                conn.execute(
+                    """
+                    CREATE TRIGGER IF NOT EXISTS messages_fts_update
+                    AFTER UPDATE OF content ON messages BEGIN
+                        INSERT INTO messages_fts (messages_fts, rowid, content)
+                        SELECT 'delete', fts_rowid, old.content
+                        FROM messages_fts_ids WHERE message_id = old.id;
+                        INSERT INTO messages_fts (rowid, content)
+                        SELECT fts_rowid, new.content
+                        FROM messages_fts_ids WHERE message_id = new.id;
+                    END
+                    """
+                )
+
+                if row is None or row[0] != "2":
+                    logger.info(
+                        "Building full-text index for existing messages..."
+                    )
+                    self._fill_search_index(conn)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO db_metadata (key, value)"
+                        " VALUES ('fts_version', '2')"
+                    )
+                    logger.info("Full-text index built.")
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(
+                "SQLite FTS5 not available, text search will use LIKE"
+                f" scans: {e}"
+            )
+            return False
+
+    def _check_message_days(self):
+        """
+        Rebuilds the day index on first use, or when the local timezone
+        changed since it was built (days are local calendar days).
+        """
+        if self.get_metadata("message_days_tz") != _local_timezone_key():
+            self.rebuild_message_days()
+
+    def rebuild_message_days(self):
+        """Recomputes the message_days table from all stored messages."""
+        logger.info("Building the chat history day index...")
+        counts = Counter()
+        cursor = self.reader().execute(
+            "SELECT context_id, timestamp FROM messages"
+        )
+        for context_id, timestamp in cursor:
+            day = local_day(timestamp)
+            if day:
+                counts[(context_id, day)] += 1
+
+        with self.write() as conn:
+            conn.execute("DELETE FROM message_days")
+            conn.executemany(
+                "INSERT INTO message_days (context_id, day, message_count)"
+                " VALUES (?, ?, ?)",
+                [(ctx, day, n) for (ctx, day), n in counts.items()],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO db_metadata (key, value) VALUES (?, ?)",
+                ("message_days_tz", _local_timezone_key()),
+            )
+        logger.info(f"Chat history day index built ({len(counts)} days).")
+
+    def _count_message_days(self, conn: sqlite3.Connection, timestamps):
+        """Adds messages to the day index, within the caller's transaction."""
+        counts = Counter(
+            day for day in (local_day(ts) for ts in timestamps) if day
+        )
+        conn.executemany(
+            """
+            INSERT INTO message_days (context_id, day, message_count)
+            VALUES (?, ?, ?)
+            ON CONFLICT (context_id, day)
+            DO UPDATE SET message_count = message_count + excluded.message_count
+            """,
+            [(self.context_id, day, n) for day, n in counts.items()],
+        )
+
+    def get_message_days(self) -> List[str]:
+        """Returns the local days (YYYY-MM-DD) that have messages, ascending."""
+        cursor = self.reader().execute(
+            "SELECT day FROM message_days WHERE context_id = ? ORDER BY day",
+            (self.context_id,),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def get_message_day_count(self, day: str) -> int:
+        """Returns how many messages a local day (YYYY-MM-DD) has."""
+        row = self.reader().execute(
+            "SELECT message_count FROM message_days"
+            " WHERE context_id = ? AND day = ?",
+            (self.context_id, day),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_adjacent_message_day(
+        self, day: Optional[str] = None, direction: str = "previous"
+    ) -> Optional[str]:
+        """
+        Finds the closest day with messages before or after a day.
+
+        Args:
+            day: Reference day (YYYY-MM-DD); None means the latest day when
+                 looking backwards and the earliest when looking forwards
+            direction: "previous" or "next"
+
+        Returns:
+            The day, or None if there is none in that direction
+        """
+        if direction not in ("previous", "next"):
+            raise ValueError(f"Invalid direction: {direction}")
+        query = "SELECT day FROM message_days WHERE context_id = ?"
+        params = [self.context_id]
+        if day is not None:
+            query += " AND day < ?" if direction == "previous" else " AND day > ?"
+            params.append(day)
+        query += (
+            " ORDER BY day DESC LIMIT 1"
+            if direction == "previous"
+            else " ORDER BY day ASC LIMIT 1"
+        )
+        row = self.reader().execute(query, params).fetchone()
+        return row[0] if row else None
+
+    def get_messages_for_day(self, day: str) -> List[Dict[str, Any]]:
+        """
+        Returns the messages of one local day, oldest first.
+
+        Uses a timestamp range on the (context_id, timestamp) index, widened
+        by a day on each side so timestamps stored with any UTC offset are
+        caught, then keeps the ones that fall on the requested local day.
+        """
+        target = date.fromisoformat(day)
+        start = datetime.combine(target, datetime.min.time()).astimezone()
+        end = datetime.combine(
+            target + timedelta(days=1), datetime.min.time()
+        ).astimezone()
+        range_start = (start - timedelta(days=1)).astimezone(timezone.utc)
+        range_end = (end + timedelta(days=1)).astimezone(timezone.utc)
+
+        cursor = self.reader().execute(
+            "SELECT * FROM messages WHERE context_id = ? AND timestamp >= ?"
+            " AND timestamp < ? ORDER BY timestamp ASC",
+            (
+                self.context_id,
+                range_start.strftime("%Y-%m-%dT%H:%M:%S"),
+                range_end.strftime("%Y-%m-%dT%H:%M:%S"),
+            ),
+        )
+        return [
+            self._row_to_message(row)
+            for row in cursor.fetchall()
+            if local_day(row["timestamp"]) == day
+        ]
+
+    @staticmethod
+    def _fill_search_index(conn: sqlite3.Connection):
+        """Indexes every message again, within the caller's transaction."""
+        conn.execute(
+            "INSERT INTO messages_fts (messages_fts) VALUES ('delete-all')"
+        )
+        conn.execute("DELETE FROM messages_fts_ids")
+        conn.execute(
+            "INSERT INTO messages_fts_ids (message_id) SELECT id FROM messages"
+        )
+        conn.execute(
+            "INSERT INTO messages_fts (rowid, content) SELECT f.fts_rowid,"
+            " m.content FROM messages_fts_ids f JOIN messages m ON m.id ="
+            " f.message_id"
+        )
+
+    def rebuild_search_index(self):
+        """Rebuilds the full-text index from the messages table."""
+        if not self.fts_enabled:
+            return
+        with self.write() as conn:
+            self._fill_search_index(conn)
+
+    def vacuum(self):
+        """
+        Compacts the database file.
+
+        The full-text index is keyed on its own INTEGER PRIMARY KEY, which
+        VACUUM leaves unchanged, so it stays valid.
+        """
+        self.db.vacuum()
+
+    @staticmethod
+    def _fts_query(query: str) -> Optional[str]:
+        """
+        Turns free text into an FTS5 MATCH expression.
+
+        Every word must match; words are quoted so user input can't inject
+        FTS syntax. A trailing '*' on a word makes it a prefix query, and
+        the last word always matches as a prefix so partially typed
+        queries still find results.
+
+        Returns:
+            The MATCH expression, or None if the query has no words
+        """
+        terms = re.findall(r"(\w+)(\*?)", query)
+        if not terms:
+            return None
+        parts = []
+        for i, (word, star) in enumerate(terms):
+            prefix = star or i == len(terms) - 1
+            parts.append(f'"{word}"' + ("*" if prefix else ""))
+        return " ".join(parts)
+
     def add_message(
         self,
         content: str,
         role: str = "user",
         metadata: Optional[Dict[str, Any]] = None,
+        vector_indexed: bool = True,
     ) -> str:
-        """Add a message to the conversation"""
+        """
+        Add a message to the conversation
+
+        Messages added with vector_indexed=False are returned by
+        get_unindexed_messages() until mark_vector_indexed() is called.
+        """
         # Generate a unique ID
         message_id = str(uuid.uuid4())
 
@@ -143,11 +586,11 @@ class SQLiteStorage(StorageBackend):
         timestamp = meta.pop("timestamp", datetime.now().isoformat())
         user = meta.get("user")
 
-        with self.conn:
-            self.conn.execute(
+        with self.write() as conn:
+            conn.execute(
                 """
-                INSERT INTO messages (id, context_id, timestamp, role, content, user, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO messages (id, context_id, timestamp, role, content, user, metadata, vector_indexed)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     message_id,
@@ -157,8 +600,10 @@ class SQLiteStorage(StorageBackend):
                     content,
                     user,
                     json.dumps(meta),
+                    int(vector_indexed),
                 ),
             )
+            self._count_message_days(conn, [timestamp])
 
         return message_id
 
@@ -187,22 +632,134 @@ class SQLiteStorage(StorageBackend):
         query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
-        cursor = self.conn.cursor()
+        cursor = self.reader().cursor()
         cursor.execute(query, params)
         rows = cursor.fetchall()
 
-        # Convert rows to dictionaries and parse metadata
-        results = []
-        for row in rows:
-            msg = dict(row)
-            if msg.get("metadata"):
-                msg["metadata"] = json.loads(msg["metadata"])
-            results.append(msg)
-        return results
+        return [self._row_to_message(row) for row in rows]
+
+    def get_messages_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[Tuple[str, str]] = None,
+        descending: bool = True,
+        since: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        users: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, str]]]:
+        """
+        Get one page of messages using keyset pagination.
+
+        Pages are ordered by (timestamp, id) and continue from a cursor
+        instead of an OFFSET, so fetching any page is an index range scan
+        no matter how deep into the history it is.
+
+        Args:
+            limit: Maximum number of messages in the page
+            cursor: (timestamp, id) of the last message of the previous
+                    page, or None for the first page
+            descending: Newest first (True) or oldest first (False)
+            since: Only messages strictly after this timestamp
+            start_date: Only messages at or after this timestamp
+            end_date: Only messages at or before this timestamp
+            users: Only messages from these users
+
+        Returns:
+            Tuple of (messages, cursor for the next page or None at the end)
+        """
+        query = "SELECT * FROM messages WHERE context_id = ?"
+        params: List[Any] = [self.context_id]
+
+        if since:
+            query += " AND timestamp > ?"
+            params.append(since)
+        if start_date:
+            query += " AND timestamp >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND timestamp <= ?"
+            params.append(end_date)
+        if users:
+            query += f" AND user IN ({','.join('?' for _ in users)})"
+            params.extend(users)
+        if cursor is not None:
+            query += (
+                " AND (timestamp, id) < (?, ?)"
+                if descending
+                else " AND (timestamp, id) > (?, ?)"
+            )
+            params.extend(cursor)
+
+        order = "DESC" if descending else "ASC"
+        query += f" ORDER BY timestamp {order}, id {order} LIMIT ?"
+        params.append(limit)
+
+        rows = self.reader().execute(query, params).fetchall()
+        messages = [self._row_to_message(row) for row in rows]
+        next_cursor = (
+            (rows[-1]["timestamp"], rows[-1]["id"])
+            if len(rows) == limit
+            else None
+        )
+        return messages, next_cursor
+
+    def iter_messages(
+        self,
+        batch_size: int = 500,
+        since: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        users: Optional[List[str]] = None,
+        descending: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream messages in (timestamp, id) order, oldest first by default.
+
+        Rows are fetched in keyset pages of `batch_size`, so memory use
+        stays constant however large the history is.
+        """
+        cursor = None
+        while True:
+            messages, cursor = self.get_messages_page(
+                limit=batch_size,
+                cursor=cursor,
+                descending=descending,
+                since=since,
+                start_date=start_date,
+                end_date=end_date,
+                users=users,
+            )
+            yield from messages
+            if cursor is None:
+                return
+
+    def count_messages(
+        self,
+        since: Optional[str] = None,
+        role: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> int:
+        """
+        Count messages, optionally after a timestamp, up to another one
+        (inclusive) and for one role.
+        """
+        query = "SELECT COUNT(id) FROM messages WHERE context_id = ?"
+        params: List[Any] = [self.context_id]
+        if since:
+            query += " AND timestamp > ?"
+            params.append(since)
+        if end_date:
+            query += " AND timestamp <= ?"
+            params.append(end_date)
+        if role:
+            query += " AND role = ?"
+            params.append(role)
+        return self.reader().execute(query, params).fetchone()[0]
 
     def get_message_count(self) -> int:
         """Get total number of messages"""
-        cursor = self.conn.cursor()
+        cursor = self.reader().cursor()
         cursor.execute(
             "SELECT COUNT(id) FROM messages WHERE context_id = ?",
             (self.context_id,),
@@ -217,7 +774,40 @@ class SQLiteStorage(StorageBackend):
         end_date: Optional[str] = None,
         users: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
-        """Basic text search with filtering."""
+        """
+        Full-text search with filtering, ranked by BM25.
+
+        Falls back to a LIKE scan ordered by recency when FTS5 isn't
+        available or the query has no searchable words.
+        """
+        match = self._fts_query(query) if self.fts_enabled else None
+        if match:
+            sql_query = (
+                "SELECT m.* FROM messages_fts JOIN messages_fts_ids f ON"
+                " f.fts_rowid = messages_fts.rowid JOIN messages m ON m.id ="
+                " f.message_id WHERE messages_fts MATCH ? AND"
+                " m.context_id = ?"
+            )
+            params = [match, self.context_id]
+            if start_date:
+                sql_query += " AND m.timestamp >= ?"
+                params.append(start_date)
+            if end_date:
+                sql_query += " AND m.timestamp <= ?"
+                params.append(end_date)
+            if users:
+                sql_query += f" AND m.user IN ({','.join('?' for _ in users)})"
+                params.extend(users)
+            sql_query += " ORDER BY bm25(messages_fts) LIMIT ?"
+            params.append(limit)
+
+            try:
+                cursor = self.reader().cursor()
+                cursor.execute(sql_query, params)
+                return [self._row_to_message(row) for row in cursor.fetchall()]
+            except sqlite3.OperationalError as e:
+                logger.error(f"Full-text search failed, using LIKE scan: {e}")
+
         sql_query = (
             "SELECT * FROM messages WHERE context_id = ? AND content LIKE ?"
         )
@@ -236,32 +826,31 @@ class SQLiteStorage(StorageBackend):
         sql_query += " ORDER BY timestamp DESC LIMIT ?"
         params.append(limit)
 
-        cursor = self.conn.cursor()
+        cursor = self.reader().cursor()
         cursor.execute(sql_query, params)
         rows = cursor.fetchall()
 
-        # Convert rows to dictionaries and parse metadata
-        results = []
-        for row in rows:
-            msg = dict(row)
-            if msg.get("metadata"):
-                msg["metadata"] = json.loads(msg["metadata"])
-            results.append(msg)
-        return results
+        return [self._row_to_message(row) for row in rows]
+
+    @staticmethod
+    def _row_to_message(row: sqlite3.Row) -> Dict[str, Any]:
+        """Converts a messages row to a dictionary with parsed metadata."""
+        msg = dict(row)
+        msg.pop("vector_indexed", None)
+        if msg.get("metadata"):
+            msg["metadata"] = json.loads(msg["metadata"])
+        return msg
 
     def get_message_by_id(self, message_id: str) -> Optional[Dict[str, Any]]:
         """Get a single message by its ID."""
-        cursor = self.conn.cursor()
+        cursor = self.reader().cursor()
         cursor.execute("SELECT * FROM messages WHERE id = ?", (message_id,))
         row = cursor.fetchone()
 
         if not row:
             return None
 
-        msg = dict(row)
-        if msg.get("metadata"):
-            msg["metadata"] = json.loads(msg["metadata"])
-        return msg
+        return self._row_to_message(row)
 
     def get_cache(self, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -273,7 +862,7 @@ class SQLiteStorage(StorageBackend):
         Returns:
             A dictionary representing the cache row, or None if not found.
         """
-        cursor = self.conn.cursor()
+        cursor = self.reader().cursor()
         cursor.execute("SELECT * FROM api_cache WHERE cache_key = ?", (key,))
         row = cursor.fetchone()
 
@@ -291,8 +880,8 @@ class SQLiteStorage(StorageBackend):
             value: The value to store (should be a JSON string).
             provider: The name of the provider storing the data.
         """
-        with self.conn:
-            self.conn.execute(
+        with self.write() as conn:
+            conn.execute(
                 """
                 INSERT OR REPLACE INTO api_cache (cache_key, provider, timestamp, cache_value)
                 VALUES (?, ?, ?, ?)
@@ -308,8 +897,8 @@ class SQLiteStorage(StorageBackend):
             ttl_seconds: The time-to-live for cache entries in seconds.
         """
         expiration_time = int(time.time()) - ttl_seconds
-        with self.conn:
-            cursor = self.conn.cursor()
+        with self.write() as conn:
+            cursor = conn.cursor()
             cursor.execute(
                 "DELETE FROM api_cache WHERE timestamp < ?", (expiration_time,)
             )
@@ -317,15 +906,15 @@ class SQLiteStorage(StorageBackend):
 
     def get_metadata(self, key: str) -> Optional[str]:
         """Get a value from the metadata table."""
-        cursor = self.conn.cursor()
+        cursor = self.reader().cursor()
         cursor.execute("SELECT value FROM db_metadata WHERE key = ?", (key,))
         row = cursor.fetchone()
         return row[0] if row else None
 
     def set_metadata(self, key: str, value: str):
         """Set a value in the metadata table."""
-        with self.conn:
-            self.conn.execute(
+        with self.write() as conn:
+            conn.execute(
                 "INSERT OR REPLACE INTO db_metadata (key, value) VALUES (?, ?)",
                 (key, value),
             )
@@ -335,42 +924,62 @@ class SQLiteStorage(StorageBackend):
         if not keys:
             return
         placeholders = ",".join("?" for _ in keys)
-        with self.conn:
-            self.conn.execute(
+        with self.write() as conn:
+            conn.execute(
                 f"DELETE FROM db_metadata WHERE key IN ({placeholders})",
                 keys,
             )
 
-    def get_messages_since(
-        self, timestamp: Optional[str] = None
+    def get_unindexed_messages(
+        self, limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get all messages since a given timestamp."""
-        query = "SELECT * FROM messages WHERE context_id = ?"
-        params = [self.context_id]
+        """Get messages still waiting to be added to the vector store."""
+        query = (
+            "SELECT * FROM messages WHERE context_id = ? AND"
+            " vector_indexed = 0 ORDER BY timestamp ASC"
+        )
+        params: List[Any] = [self.context_id]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        rows = self.reader().execute(query, params).fetchall()
+        return [self._row_to_message(row) for row in rows]
 
-        if timestamp:
-            query += " AND timestamp > ?"
-            params.append(timestamp)
+    def mark_vector_indexed(self, message_ids: Optional[List[str]] = None):
+        """
+        Flags messages as present in the vector store.
 
-        query += " ORDER BY timestamp ASC"
+        Args:
+            message_ids: The messages to flag, or None for all of them
+        """
+        with self.write() as conn:
+            if message_ids is None:
+                conn.execute(
+                    "UPDATE messages SET vector_indexed = 1 WHERE"
+                    " context_id = ? AND vector_indexed = 0",
+                    (self.context_id,),
+                )
+            elif message_ids:
+                conn.executemany(
+                    "UPDATE messages SET vector_indexed = 1 WHERE id = ?",
+                    [(message_id,) for message_id in message_ids],
+                )
 
-        cursor = self.conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+    def get_messages_since(
+        self, timestamp: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all messages since a given timestamp.
 
-        # Convert rows to dictionaries and parse metadata
-        results = []
-        for row in rows:
-            msg = dict(row)
-            if msg.get("metadata"):
-                msg["metadata"] = json.loads(msg["metadata"])
-            results.append(msg)
-        return results
+        Materializes the whole result; prefer iter_messages(since=...) for
+        scans that can be large.
+        """
+        return list(self.iter_messages(since=timestamp))
 
     def close(self):
         """Close any resources"""
-        if self.conn:
-            self.conn.close()
+        if self.db:
+            self.db.close()
 
     def add_historical_messages(self, messages: List[Dict[str, Any]]):
         """
@@ -405,11 +1014,14 @@ class SQLiteStorage(StorageBackend):
             )
 
         if messages_to_insert:
-            with self.conn:
-                self.conn.executemany(
+            with self.write() as conn:
+                conn.executemany(
                     "INSERT INTO messages (id, context_id, timestamp, role, content, user, metadata) VALUES (?, ?, ?, ?, ?, ?, ?)",
                     messages_to_insert,
                 )
+                self._count_message_days(
+                    conn, [row[2] for row in messages_to_insert]
+                )
             logger.info(
                 f"Inserted {len(messages_to_insert)} historical messages into the database."
             )
@@ -24,6 +24,17 @@ from typing import List, Dict, Any, Optional
 class VectorStorageBackend(ABC):
     """Abstract base class for vector storage backends."""
 
+    # Set by backends whose stored vectors were produced by a different
+    # encoder than the current one; cleared by reset()
+    needs_reindex: bool = False
+
+    # Optional capabilities. Callers check these flags before using the
+    # matching methods, which backends without the capability don't have.
+    # embed_query() and search_by_vector():
+    supports_vector_search: bool = False
+    # get_all_metadata():
+    supports_metadata_listing: bool = False
+
     @abstractmethod
     def add_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
         """Add documents to the vector store."""
@@ -49,6 +60,56 @@ class VectorStorageBackend(ABC):
         """Search for similar documents and return their scores."""
         pass
 
+    def embed_query(self, query: str) -> List[float]:
+        """
+        Embeds a query with the backend's embedding model.
+
+        Only available if supports_vector_search is set.
+        """
+        raise NotImplementedError
+
+    def search_by_vector(
+        self,
+        query_embedding: List[float],
+        limit: int = 5,
+        filter_dict: Optional[Dict[str, Any]] = None,
+    ) -> List[tuple[Dict[str, Any], float]]:
+        """
+        Like search_with_scores, but for an already computed query embedding.
+
+        Lets callers that embedded the query for other purposes skip a
+        second encoder pass. Only available if supports_vector_search is
+        set; otherwise callers use search_with_scores.
+        """
+        raise NotImplementedError
+
+    def upsert_documents(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add documents, replacing any stored under the same IDs.
+
+        Document IDs come from metadata["id"]. This default deletes and
+        re-adds them; backends with a native upsert should override it.
+        """
+        self.delete(
+            [
+                doc["metadata"]["id"]
+                for doc in documents
+                if "id" in doc["metadata"]
+            ]
+        )
+        return self.add_documents(documents)
+
+    def get_all_metadata(
+        self, batch_size: int = 1000
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the metadata of every stored document, keyed by ID,
+        without loading the embeddings.
+
+        Only available if supports_metadata_listing is set.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def delete(self, ids: List[str]) -> None:
         """Delete documents by their IDs."""
@@ -0,0 +1,203 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+import logging
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def vector_metadata(message: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds the vector store metadata for a stored message.
+
+    The message id doubles as the vector id, so every indexing path
+    stores a message under the same id and never adds a duplicate.
+    """
+    meta = dict(message.get("metadata") or {})
+    meta["id"] = message["id"]
+    meta["message_id"] = message["id"]
+    meta["role"] = message["role"]
+    meta["timestamp"] = message["timestamp"]
+    if message.get("user"):
+        meta["user"] = message["user"]
+    return meta
+
+
+class VectorWriteBehind:
+    """
+    Adds chat messages to the vector store off the caller's thread.
+
+    The message row is committed to the text storage first with its
+    `vector_indexed` flag cleared, so the write is durable before anything
+    is embedded. A single worker thread then gathers queued messages for up
+    to `max_wait_ms` (at most `max_batch_size` of them), embeds and inserts
+    them with one `add_documents()` call and sets the flag on the rows.
+
+    Rows left unflagged by a crash or a failed batch are picked up again by
+    `replay()` at startup. Vector ids are the message ids, so replaying a
+    message that did reach the vector store does not duplicate it.
+    """
+
+    def __init__(
+        self,
+        storage,
+        vector_storage,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 50.0,
+        name: str = "",
+    ):
+        """
+        Initialize the write-behind queue
+
+        Args:
+            storage: Text storage backend with get_unindexed_messages() and
+                     mark_vector_indexed()
+            vector_storage: Vector storage backend receiving the documents
+            max_batch_size: Messages per add_documents() call
+            max_wait_ms: How long to wait for more messages after the first
+            name: Label for the worker thread and logs
+        """
+        self.storage = storage
+        self.vector_storage = vector_storage
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._pending = 0
+        self._idle = threading.Condition()
+
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"VectorWriteBehind-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def enqueue(self, message_id: str, text: str, metadata: Dict[str, Any]):
+        """Queues a stored message for embedding and vector insertion."""
+        meta = dict(metadata)
+        meta["id"] = message_id
+        meta["message_id"] = message_id
+        item = (message_id, {"page_content": text, "metadata": meta})
+        with self._idle:
+            self._pending += 1
+        if self._closed:
+            self._index([item])
+        else:
+            self._queue.put(item)
+
+    def replay(self) -> int:
+        """
+        Queues the messages a previous run stored but never indexed.
+
+        Returns:
+            Number of messages queued
+        """
+        messages = self.storage.get_unindexed_messages()
+        for message in messages:
+            self.enqueue(
+                message["id"], message["content"], vector_metadata(message)
+            )
+        if messages:
+            logger.info(
+                f"Replaying {len(messages)} messages missing from the vector"
+                " store."
+            )
+        return len(messages)
+
+    def pending(self) -> int:
+        """Number of queued messages not yet indexed."""
+        with self._idle:
+            return self._pending
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until every queued message has been processed.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def _collect(self, first: Tuple) -> List[Tuple]:
+        """Gathers queued messages to index together with the first one."""
+        items = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(items) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    item = self._queue.get(timeout=timeout)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Finish this batch, then stop
+                self._queue.put(_STOP)
+                break
+            items.append(item)
+        return items
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            self._index(self._collect(first))
+
+        # Index anything that raced with close()
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                items.append(item)
+        for start in range(0, len(items), self.max_batch_size):
+            self._index(items[start:start + self.max_batch_size])
+
+    def _index(self, items: List[Tuple]):
+        """Embeds and inserts a batch, then flags its rows as indexed."""
+        message_ids = [message_id for message_id, _ in items]
+        try:
+            self.vector_storage.add_documents([doc for _, doc in items])
+            self.storage.mark_vector_indexed(message_ids)
+        except Exception as e:
+            # The rows keep their flag cleared and are replayed next start
+            logger.error(
+                f"Failed to add {len(items)} messages to vector storage: {e}"
+            )
+        finally:
+            with self._idle:
+                self._pending -= len(items)
+                self._idle.notify_all()
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Stops the worker after the queued messages are indexed."""
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
@@ -27,7 +27,6 @@ from pathlib import Path
 from typing import Annotated, Any, Dict, List, Optional
 
 try:
-    from sentence_transformers import SentenceTransformer
     from sentence_transformers.util import cos_sim
 
     SENTENCE_TRANSFORMERS_AVAILABLE = True
@@ -35,6 +34,7 @@ except ImportError:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
 
 from ainara.framework.config import config
+from ainara.framework.embeddings import get_embedding_model
 from ainara.framework.llm import create_llm_backend
 from ainara.framework.skill import Skill
 
@@ -316,7 +316,7 @@ Output JSON in this format:
                 "memory.vector_storage.embedding_model"
             )
             try:
-                self.embedding_model = SentenceTransformer(
+                self.embedding_model = get_embedding_model(
                     embedding_model_name,
                     cache_folder=config.get("cache.directory")
                 )
@@ -0,0 +1,103 @@
+"""
+Throughput benchmark of the torch and int8 ONNX embedding encoders.
+
+Encodes the same synthetic sentences with SentenceTransformer.encode and
+with the quantized ONNX export of the same model, then reports sentences
+per second for each, and the cosine similarity between their vectors.
+The ONNX export is written to the cache directory on first run.
+
+Usage:
+    python scripts/evaluation/benchmark_encoders.py \\
+        [--model sentence-transformers/all-mpnet-base-v2] [--sentences 512]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..")
+)
+sys.path.insert(0, project_root)
+
+from ainara.framework.config import config  # noqa: E402
+from ainara.framework.embeddings import get_embedding_model  # noqa: E402
+
+WORDS = (
+    "remember my sister lives in berlin and works as a nurse at the city"
+    " hospital open the calendar schedule a meeting tomorrow with the team"
+    " what is the weather forecast for the weekend play some relaxing jazz"
+    " music I prefer tea over coffee in the morning summarize this article"
+).split()
+
+
+def make_sentences(count: int, seed: int = 0):
+    """Generates sentences of varied length from a fixed vocabulary."""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choices(WORDS, k=rng.randint(4, 40)))
+        for _ in range(count)
+    ]
+
+
+def throughput(model, sentences, batch_size: int, repeats: int):
+    """Returns (sentences per second, embeddings) for the best run."""
+    model.encode(sentences[:batch_size], batch_size=batch_size)  # warm-up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        embeddings = model.encode(sentences, batch_size=batch_size)
+        best = min(best, time.perf_counter() - start)
+    return len(sentences) / best, np.asarray(embeddings, dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--model", default="sentence-transformers/all-mpnet-base-v2"
+    )
+    parser.add_argument("--sentences", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    sentences = make_sentences(args.sentences)
+    cache_folder = config.get("cache.directory")
+
+    results = {}
+    for backend in ("torch", "onnx"):
+        model = get_embedding_model(
+            args.model, cache_folder=cache_folder, device="cpu",
+            backend=backend,
+        )
+        results[backend] = throughput(
+            model, sentences, args.batch_size, args.repeats
+        )
+
+    torch_emb = results["torch"][1]
+    onnx_emb = results["onnx"][1]
+    cosines = np.sum(torch_emb * onnx_emb, axis=1) / (
+        np.linalg.norm(torch_emb, axis=1) * np.linalg.norm(onnx_emb, axis=1)
+    )
+
+    print(f"model: {args.model}, {args.sentences} sentences,"
+          f" batch size {args.batch_size}")
+    print(f"{'backend':>8} {'sentences/s':>12}")
+    for backend, (rate, _) in results.items():
+        print(f"{backend:>8} {rate:>12.1f}")
+    print(f"speedup: {results['onnx'][0] / results['torch'][0]:.2f}x")
+    print(
+        f"cosine(torch, onnx): mean {cosines.mean():.4f},"
+        f" min {cosines.min():.4f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Benchmark for OrakleMatcherTransformers.match() latency.
+
+Registers synthetic capabilities through the public API, with a stub model
+producing random embeddings in place of the embedding model, and measures the
+time spent scoring and ranking skills, which is the part that grows with the
+number of registered capabilities. The previous per-skill Python loop is
+timed alongside for comparison.
+
+Usage:
+    python scripts/evaluation/benchmark_matcher.py [--sizes 100 1000 10000]
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import time
+import types
+from contextlib import ExitStack
+from unittest import mock
+
+import numpy as np
+
+# Add project root to Python path
+project_root = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..")
+)
+sys.path.insert(0, project_root)
+
+from ainara.framework.matcher import transformers  # noqa: E402
+from ainara.framework.matcher.transformers import (  # noqa: E402
+    OrakleMatcherTransformers,
+)
+
+EMBEDDING_DIM = 768
+
+
+class StubModel:
+    """
+    Stands in for the sentence-transformers model: the embedding of a text
+    is drawn from a random generator seeded with a hash of the text.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def encode(self, texts, **kwargs):
+        return np.vstack(
+            [
+                np.random.default_rng(
+                    int.from_bytes(hashlib.sha256(t.encode()).digest()[:8])
+                ).standard_normal(self.dim)
+                for t in texts
+            ]
+        ).astype(np.float32)
+
+
+def build_matcher(skills, model, cache_dir: str) -> OrakleMatcherTransformers:
+    """
+    Creates a matcher with the public constructor and registers skills.
+
+    The embedding model is replaced by `model`, and everything the matcher
+    would write to the user's cache directory goes to `cache_dir`.
+
+    Args:
+        skills: (skill_id, description, metadata) tuples
+        model: Object with an `encode(texts)` method returning a matrix
+        cache_dir: Directory for the persisted skill embeddings
+    """
+    config = transformers.ConfigManager()
+    stub_config = types.SimpleNamespace(
+        get=lambda key, default=None: (
+            cache_dir if key == "cache.directory" else config.get(key, default)
+        )
+    )
+    with ExitStack() as stack:
+        for patch in (
+            mock.patch.object(
+                transformers, "SENTENCE_TRANSFORMERS_AVAILABLE", True
+            ),
+            mock.patch.object(
+                transformers, "ConfigManager", return_value=stub_config
+            ),
+            mock.patch.object(
+                transformers, "get_embedding_model", return_value=model
+            ),
+            # Keep the synthetic texts out of the persistent embedding cache
+            mock.patch.object(
+                transformers,
+                "encode_cached",
+                lambda model, model_id, texts: model.encode(texts),
+            ),
+            # Queries are used as is, without the spaCy cleaning
+            mock.patch.object(transformers, "get_nlp", return_value=None),
+        ):
+            stack.enter_context(patch)
+        matcher = OrakleMatcherTransformers(model_name="stub-model")
+        matcher.register_skills(skills)
+    return matcher
+
+
+def synthetic_skills(num_skills: int):
+    """Skills spread over MCP servers, every 500th one boosted."""
+    return [
+        (
+            f"mcp/server{i // 100}/tool_{i}",
+            f"synthetic tool {i}",
+            {"embeddings_boost_factor": 3.0 if i % 500 == 0 else 1.0},
+        )
+        for i in range(num_skills)
+    ]
+
+
+def legacy_match(matcher, query_embedding, threshold, top_k):
+    """The previous implementation: one cosine similarity per skill."""
+    matches = []
+    q_norm = np.linalg.norm(query_embedding)
+    for skill_id, skill_data in matcher.skills_registry.items():
+        boost = skill_data["metadata"].get("embeddings_boost_factor", 1.0)
+        emb = skill_data["embedding"]
+        similarity = (
+            float(np.dot(query_embedding, emb) / (q_norm * np.linalg.norm(emb)))
+            * boost
+        )
+        if similarity >= threshold or boost >= 3:
+            matches.append((similarity, matcher.usage_stats[skill_id], skill_id))
+    matches.sort(reverse=True)
+    return matches[:top_k]
+
+
+def time_call(fn, repeats: int) -> float:
+    """Returns the median latency of fn() in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000]
+    )
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    # The matcher logs every registration and match, and complains about the
+    # spaCy model, which the benchmark doesn't load
+    logging.disable(logging.ERROR)
+    cache_dir = tempfile.TemporaryDirectory()
+
+    print(
+        f"{'skills':>8} {'vectorized (ms)':>16} {'legacy loop (ms)':>17}"
+        f" {'first match (ms)':>17}"
+    )
+    for size in args.sizes:
+        matcher = build_matcher(
+            synthetic_skills(size), StubModel(), cache_dir.name
+        )
+        query_embedding = matcher.model.encode(["query"])[0]
+
+        # The first match builds the skill index and caches the query
+        # embedding, so the timed calls only score and rank
+        build_start = time.perf_counter()
+        matcher.match("query", args.threshold, args.top_k)
+        build_ms = (time.perf_counter() - build_start) * 1000
+
+        vectorized_ms = time_call(
+            lambda: matcher.match("query", args.threshold, args.top_k),
+            args.repeats,
+        )
+        legacy_ms = time_call(
+            lambda: legacy_match(
+                matcher, query_embedding, args.threshold, args.top_k
+            ),
+            max(1, args.repeats // 5),
+        )
+        print(
+            f"{size:>8} {vectorized_ms:>16.3f} {legacy_ms:>17.3f}"
+            f" {build_ms:>17.3f}"
+        )
+    cache_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
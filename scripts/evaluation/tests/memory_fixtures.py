@@ -0,0 +1,94 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+
+"""
+Shared fixtures for the GREENMemories tests: an instance on a temporary
+SQLite database with the models and vector store replaced by stand-ins.
+"""
+
+import os
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+from ainara.framework.green_memories import GREENMemories
+from ainara.framework.storage.sqlite import SQLiteStorage
+
+
+def fake_warm_up(green):
+    """
+    Stands in for the model warm-up: vector writes are accepted and
+    dropped, and neither spaCy nor an embedding model is loaded.
+    """
+    green.vector_storage = mock.MagicMock()
+    green.vector_storage.search_with_scores.return_value = []
+
+
+class StubLLM:
+    """LLM stand-in whose answers are never valid memory decisions."""
+
+    def get_context_window(self):
+        return 8192
+
+    def chat(self, chat_history, stream=False):
+        return "{}"
+
+
+class GREENMemoriesTestCase(unittest.TestCase):
+    """
+    Base test case with a temporary SQLiteStorage and GREENMemories warm-up
+    patched out. Subclasses build instances with `_green()`.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = SQLiteStorage(
+            db_path=os.path.join(self.tmpdir.name, "chat_memory.db")
+        )
+        patches = [
+            mock.patch.object(
+                GREENMemories,
+                "_load_models_and_vector_store",
+                fake_warm_up,
+            ),
+            mock.patch.object(
+                GREENMemories, "_memory_documents", return_value=[]
+            ),
+        ]
+        for patch in patches:
+            self.start_patch(patch)
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def start_patch(self, patch):
+        """Starts a patch that is undone when the test ends."""
+        started = patch.start()
+        self.addCleanup(patch.stop)
+        return started
+
+    def _green(self, llm=None, **kwargs):
+        """A GREENMemories instance on the test's storage."""
+        return GREENMemories(
+            llm=llm or StubLLM(),
+            chat_memory=types.SimpleNamespace(storage=self.storage),
+            **kwargs,
+        )
@@ -0,0 +1,130 @@
+import os
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.embeddings import cache as embedding_cache
+from ainara.framework.embeddings.cache import EmbeddingCache
+from ainara.framework.storage import chroma
+
+
+class StubModel:
+    """Deterministic 4-dimensional encoder."""
+
+    def encode(self, texts, **kwargs):
+        return np.array(
+            [[len(t), t.count(" "), ord(t[0]), 1.0] for t in texts],
+            dtype=np.float32,
+        )
+
+
+class FakeCollection:
+    """The parts of a Chroma collection the storage backend uses."""
+
+    def __init__(self):
+        self.metadata = None
+        self.rows = {}
+
+    def count(self):
+        return len(self.rows)
+
+    def modify(self, metadata):
+        self.metadata = metadata
+
+    def add(self, embeddings, documents, metadatas, ids):
+        for row in zip(ids, embeddings, documents, metadatas):
+            self.rows.setdefault(row[0], row[1:])
+
+    def query(self, query_embeddings, n_results, where=None):
+        query = np.asarray(query_embeddings[0])
+        ranked = sorted(
+            (float(np.sum((np.asarray(e) - query) ** 2)), doc_id)
+            for doc_id, (e, _, _) in self.rows.items()
+        )[:n_results]
+        return {
+            "ids": [[doc_id for _, doc_id in ranked]],
+            "documents": [[self.rows[doc_id][1] for _, doc_id in ranked]],
+            "metadatas": [[self.rows[doc_id][2] for _, doc_id in ranked]],
+            "distances": [[distance for distance, _ in ranked]],
+        }
+
+
+class TestChromaQueryEmbeddings(unittest.TestCase):
+    """
+    Tests that ChromaVectorStorage embeds stored documents through the
+    persistent embedding cache and one-off queries around it.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = EmbeddingCache(
+            os.path.join(self.tmpdir.name, "embeddings_cache.db")
+        )
+        collection = FakeCollection()
+        client = mock.Mock()
+        client.get_or_create_collection.return_value = collection
+        fake_chromadb = types.SimpleNamespace(
+            PersistentClient=mock.Mock(return_value=client),
+            Settings=mock.Mock(),
+        )
+        patches = [
+            mock.patch.object(chroma, "VECTOR_DB_AVAILABLE", True),
+            mock.patch.object(chroma, "chromadb", fake_chromadb, create=True),
+            mock.patch.object(
+                chroma, "get_embedding_model", return_value=StubModel()
+            ),
+            mock.patch.object(chroma, "release_embedding_model"),
+            mock.patch.object(
+                embedding_cache, "get_embedding_cache", return_value=self.cache
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        self.storage = chroma.ChromaVectorStorage(
+            vector_db_path=os.path.join(self.tmpdir.name, "vector_db"),
+            embedding_model="stub-model",
+        )
+
+    def tearDown(self):
+        self.storage.close()
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def _cached_rows(self):
+        return self.cache.conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()[0]
+
+    def test_documents_are_cached(self):
+        self.storage.add_documents(
+            [
+                {"page_content": "green tea", "metadata": {"id": "a"}},
+                {"page_content": "black coffee", "metadata": {"id": "b"}},
+            ]
+        )
+        self.assertEqual(self._cached_rows(), 2)
+
+    def test_queries_leave_the_cache_unchanged(self):
+        self.storage.add_text("green tea", {"id": "a", "role": "user"})
+        rows = self._cached_rows()
+
+        results = self.storage.search("what do I drink", limit=1)
+        self.assertEqual(results[0]["id"], "a")
+        self.storage.search_with_scores("anything else", limit=1)
+        self.storage.embed_query("one more question")
+
+        self.assertEqual(self._cached_rows(), rows)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+try:
+    import onnxruntime  # noqa: F401
+    import torch  # noqa: F401
+    from sentence_transformers import SentenceTransformer
+
+    BACKENDS_AVAILABLE = True
+except ImportError:
+    BACKENDS_AVAILABLE = False
+
+PARITY_MODEL = os.environ.get(
+    "AINARA_PARITY_MODEL", "sentence-transformers/all-mpnet-base-v2"
+)
+
+CORPUS = [
+    "My sister lives in Berlin and works as a nurse.",
+    "I prefer green tea over coffee in the morning.",
+    "The user is learning to play the piano.",
+    "Our team meeting moved to Thursday afternoon.",
+    "I am allergic to peanuts.",
+    "The project deadline is the end of the month.",
+    "I usually go running by the river on weekends.",
+    "My favourite band released a new album.",
+]
+
+QUERIES = [
+    "Where does my sister live?",
+    "What do I drink in the morning?",
+    "Which instrument am I practicing?",
+    "When is the team meeting?",
+    "Do I have any food allergies?",
+    "What sport do I do on Saturdays?",
+]
+
+
+@unittest.skipUnless(
+    BACKENDS_AVAILABLE, "torch, sentence-transformers and onnxruntime required"
+)
+class TestOnnxEncoderParity(unittest.TestCase):
+    """
+    Checks that the int8 ONNX encoder produces vectors close enough to the
+    torch ones to rank memories the same way.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        from ainara.framework.embeddings import (
+            OnnxSentenceEncoder,
+            export_quantized_onnx,
+        )
+
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        try:
+            cls.torch_model = SentenceTransformer(PARITY_MODEL, device="cpu")
+        except Exception as e:
+            raise unittest.SkipTest(f"Model {PARITY_MODEL} not available: {e}")
+        export_quantized_onnx(PARITY_MODEL, cls.tmpdir.name)
+        cls.onnx_model = OnnxSentenceEncoder(cls.tmpdir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def _both(self, texts):
+        return (
+            self.torch_model.encode(texts, normalize_embeddings=True),
+            self.onnx_model.encode(texts, normalize_embeddings=True),
+        )
+
+    def test_dimension_matches(self):
+        self.assertEqual(
+            self.onnx_model.get_sentence_embedding_dimension(),
+            self.torch_model.get_sentence_embedding_dimension(),
+        )
+
+    def test_vectors_are_close(self):
+        torch_emb, onnx_emb = self._both(CORPUS + QUERIES)
+        cosines = np.sum(torch_emb * onnx_emb, axis=1)
+        self.assertGreater(cosines.min(), 0.97)
+        self.assertGreater(cosines.mean(), 0.98)
+
+    def test_single_sentence_matches_batch(self):
+        batch = self.onnx_model.encode(CORPUS)
+        for i, text in enumerate(CORPUS):
+            np.testing.assert_allclose(
+                self.onnx_model.encode(text), batch[i], atol=1e-4
+            )
+
+    def test_retrieval_ranking_agrees(self):
+        torch_corpus, onnx_corpus = self._both(CORPUS)
+        torch_queries, onnx_queries = self._both(QUERIES)
+        torch_top = np.argmax(torch_queries @ torch_corpus.T, axis=1)
+        onnx_top = np.argmax(onnx_queries @ onnx_corpus.T, axis=1)
+        np.testing.assert_array_equal(torch_top, onnx_top)
+
+    def test_onnx_vectors_have_their_own_id(self):
+        from ainara.framework.embeddings import embedding_model_id
+
+        self.assertEqual(
+            embedding_model_id(self.torch_model, PARITY_MODEL), PARITY_MODEL
+        )
+        self.assertNotEqual(
+            embedding_model_id(self.onnx_model, PARITY_MODEL), PARITY_MODEL
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+import numpy as np
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.embeddings.batcher import EmbeddingBatcher
+
+
+class StubModel:
+    """
+    Encodes a text as [len(text), first character code], records every
+    call, and can hold the first call until released or fail on demand.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.threads = []
+        self.fail = None
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        self.calls.append((texts if single else list(texts), kwargs))
+        self.threads.append(threading.current_thread())
+        self.entered.set()
+        self.release.wait(10)
+        if self.fail:
+            raise self.fail
+        rows = np.array(
+            [[len(t), ord(t[0])] for t in ([texts] if single else texts)],
+            dtype=np.float64,
+        )
+        if kwargs.get("convert_to_numpy") is False:
+            return list(rows)
+        return rows[0] if single else rows
+
+
+class TestEmbeddingBatcher(unittest.TestCase):
+    """
+    Tests EmbeddingBatcher: coalescing of concurrent requests, per-caller
+    results and errors, direct calls for unbatchable options, and shutdown.
+    """
+
+    def setUp(self):
+        self.model = StubModel()
+        self.batcher = EmbeddingBatcher(
+            self.model, max_batch_size=8, max_wait_ms=20, name="test"
+        )
+        self.addCleanup(self.batcher.close)
+
+    def _hold_worker(self):
+        """Blocks the worker inside a model call, so requests queue up."""
+        self.model.release.clear()
+        held = self.batcher.submit(["hold"])
+        self.assertTrue(self.model.entered.wait(5))
+        return held
+
+    def test_concurrent_calls_are_coalesced(self):
+        held = self._hold_worker()
+        requests = [["a", "bb"], ["ccc"], ["dddd", "e", "ff"]]
+        futures = [self.batcher.submit(texts) for texts in requests]
+        self.model.release.set()
+
+        held.result(5)
+        for texts, future in zip(requests, futures):
+            np.testing.assert_array_equal(
+                future.result(5),
+                [[len(t), ord(t[0])] for t in texts],
+            )
+            self.assertEqual(future.result().dtype, np.float32)
+        # The queued requests went out in one model call
+        self.assertEqual(
+            [call for call, _ in self.model.calls],
+            [["hold"], ["a", "bb", "ccc", "dddd", "e", "ff"]],
+        )
+        stats = self.batcher.stats()
+        self.assertEqual(stats["requests"], 4)
+        self.assertEqual(stats["batches"], 2)
+
+    def test_concurrent_threads_get_their_own_rows(self):
+        results = {}
+
+        def caller(n):
+            texts = [chr(ord("a") + n) * (i + 1) for i in range(n % 3 + 1)]
+            results[n] = (texts, self.batcher.encode(texts))
+
+        threads = [
+            threading.Thread(target=caller, args=(n,)) for n in range(12)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(len(results), 12)
+        for texts, embeddings in results.values():
+            np.testing.assert_array_equal(
+                embeddings, [[len(t), ord(t[0])] for t in texts]
+            )
+
+    def test_single_string(self):
+        embedding = self.batcher.encode("hello")
+        self.assertEqual(embedding.shape, (2,))
+        np.testing.assert_array_equal(embedding, [5, ord("h")])
+        self.assertEqual(self.model.calls[-1][0], ["hello"])
+
+    def test_errors_reach_every_waiting_caller(self):
+        held = self._hold_worker()
+        futures = [self.batcher.submit([t]) for t in ("x", "y", "z")]
+        self.model.fail = RuntimeError("encoder crashed")
+        self.model.release.set()
+
+        for future in [held] + futures:
+            with self.assertRaises(RuntimeError):
+                future.result(5)
+        # The worker survives a failed batch
+        self.model.fail = None
+        np.testing.assert_array_equal(self.batcher.encode(["ok"]), [[2, 111]])
+
+    def test_unbatchable_options_go_to_the_model(self):
+        result = self.batcher.encode(["a", "b"], convert_to_numpy=False)
+        self.assertIsInstance(result, list)
+        self.batcher.encode(["a"], batch_size=4)
+        self.batcher.encode("a", convert_to_tensor=True)
+        self.assertEqual(
+            [kwargs for _, kwargs in self.model.calls],
+            [
+                {"convert_to_numpy": False},
+                {"batch_size": 4},
+                {"convert_to_tensor": True},
+            ],
+        )
+        self.assertTrue(
+            all(t is threading.current_thread() for t in self.model.threads)
+        )
+
+        # Options that don't change the result are still batched
+        self.batcher.encode(["a"], show_progress_bar=False)
+        self.assertEqual(self.model.calls[-1], (["a"], {}))
+        self.assertIsNot(self.model.threads[-1], threading.current_thread())
+
+    def test_large_requests_run_on_the_caller_thread(self):
+        texts = [f"text {i}" for i in range(8)]
+        self.assertEqual(len(self.batcher.encode(texts)), 8)
+        self.assertIs(self.model.threads[-1], threading.current_thread())
+
+    def test_lone_requests_do_not_wait(self):
+        batcher = EmbeddingBatcher(self.model, max_wait_ms=2000)
+        self.addCleanup(batcher.close)
+        start = time.monotonic()
+        for text in ("a", "b", "c"):
+            batcher.encode([text])
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_close_serves_pending_requests(self):
+        held = self._hold_worker()
+        futures = [self.batcher.submit([t]) for t in ("x", "y")]
+        closer = threading.Thread(target=self.batcher.close)
+        closer.start()
+        self.model.release.set()
+        closer.join(10)
+
+        self.assertEqual(held.result(5).shape, (1, 2))
+        for future in futures:
+            self.assertEqual(future.result(5).shape, (1, 2))
+
+        # After close() requests are encoded on the caller's thread
+        np.testing.assert_array_equal(
+            self.batcher.encode(["late"]), [[4, ord("l")]]
+        )
+        self.assertIs(self.model.threads[-1], threading.current_thread())
+
+
+if __name__ == '__main__':
+    unittest.main()
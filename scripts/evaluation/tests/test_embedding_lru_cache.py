@@ -0,0 +1,94 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.embeddings.cache import LRUEmbeddingCache
+
+
+def vector(value, dims=4):
+    """A float32 embedding of `dims` copies of `value` (4 bytes each)."""
+    return np.full(dims, value, dtype=np.float32)
+
+
+class TestLRUEmbeddingCache(unittest.TestCase):
+    """
+    Tests LRUEmbeddingCache: least recently used entries are evicted first,
+    by entry count or by size, and lookups are counted as hits or misses.
+    """
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = LRUEmbeddingCache(max_entries=3)
+        for text in ("a", "b", "c"):
+            cache.put(text, vector(ord(text)))
+        # Reading "a" makes "b" the least recently used
+        cache.get("a")
+        cache.put("d", vector(4))
+
+        self.assertIsNone(cache.get("b"))
+        for text in ("a", "c", "d"):
+            self.assertIsNotNone(cache.get(text))
+        self.assertEqual(len(cache), 3)
+
+        # Replacing an entry also refreshes it
+        cache.put("c", vector(5))
+        cache.put("e", vector(6))
+        self.assertIsNone(cache.get("a"))
+        np.testing.assert_array_equal(cache.get("c"), vector(5))
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_size_bound(self):
+        # Room for 4 embeddings of 64 float32 values (256 bytes each)
+        cache = LRUEmbeddingCache(max_entries=100, max_mb=1024 / 2**20)
+        for i in range(6):
+            cache.put(f"text {i}", vector(i, dims=64))
+
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 4)
+        self.assertEqual(stats["evictions"], 2)
+        self.assertEqual(
+            [cache.get(f"text {i}") is None for i in range(6)],
+            [True, True, False, False, False, False],
+        )
+
+        # Replacing an entry with a larger one frees room by eviction too
+        cache.put("text 5", vector(5, dims=128))
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get("text 2"))
+
+        # An entry larger than the bound doesn't stay
+        cache.put("huge", vector(0, dims=512))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats()["size_mb"], 0.0)
+
+    def test_hit_and_miss_counters(self):
+        cache = LRUEmbeddingCache(max_entries=10, max_mb=1)
+        self.assertEqual(cache.stats()["hit_rate"], 0.0)
+        cache.put("known", vector(1))
+
+        cache.get("known")
+        cache.get("known")
+        cache.get("unknown")
+        cache.get("known")
+
+        self.assertEqual(
+            cache.stats(),
+            {
+                "entries": 1,
+                "max_entries": 10,
+                "size_mb": 0.0,
+                "max_size_mb": 1.0,
+                "hits": 3,
+                "misses": 1,
+                "evictions": 0,
+                "hit_rate": 0.75,
+            },
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
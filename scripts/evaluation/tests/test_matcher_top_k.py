@@ -0,0 +1,113 @@
+import logging
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from scripts.evaluation.benchmark_matcher import build_matcher
+
+
+class GroupModel:
+    """
+    Embeds every text mentioning "group<n>" as the n-th of a few fixed
+    vectors, so skills of the same group score exactly the same.
+    """
+
+    def __init__(self, groups=6, dim=16):
+        rng = np.random.default_rng(7)
+        self.vectors = rng.standard_normal((groups, dim)).astype(np.float32)
+
+    def encode(self, texts, **kwargs):
+        return np.vstack(
+            [self.vectors[int(re.search(r"group(\d+)", t)[1])] for t in texts]
+        )
+
+
+class TestMatcherTopK(unittest.TestCase):
+    """
+    Tests that OrakleMatcherTransformers.match() ranks the same skills as a
+    full sort when it narrows the candidates with argpartition, including
+    ties on the k-th score and top_k above the number of skills.
+    """
+
+    def setUp(self):
+        logging.disable(logging.ERROR)
+        self.addCleanup(logging.disable, logging.NOTSET)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.model = GroupModel()
+        # Five skills per group; two boosted skills are always included
+        self.skills = [
+            (
+                f"mcp/server{i % 3}/tool_{i}",
+                f"tool {i} of group{i % 6}",
+                {"embeddings_boost_factor": 3.0 if i in (4, 17) else 1.0},
+            )
+            for i in range(30)
+        ]
+        self.matcher = build_matcher(
+            self.skills, self.model, self.tmpdir.name
+        )
+        # Usage counts break some of the score ties
+        for skill_id in ("mcp/server1/tool_7", "mcp/server0/tool_12"):
+            self.matcher.record_usage(skill_id)
+
+    def _full_ranking(self, query, threshold):
+        # With top_k >= the number of skills nothing is partitioned
+        return self.matcher.match(query, threshold, top_k=len(self.skills))
+
+    def test_top_k_matches_full_sort(self):
+        for query in ("group0", "group3", "group5"):
+            for threshold in (-1.0, 0.0, 0.2):
+                ranking = self._full_ranking(query, threshold)
+                scores = [m["score"] for m in ranking]
+                self.assertEqual(scores, sorted(scores, reverse=True))
+                for top_k in range(1, len(ranking) + 1):
+                    self.assertEqual(
+                        self.matcher.match(query, threshold, top_k),
+                        ranking[:top_k],
+                        (query, threshold, top_k),
+                    )
+
+    def test_ties_on_kth_score_keep_usage_order(self):
+        ranking = self._full_ranking("group1", -1.0)
+        # The five group1 skills tie on score and are ordered by usage count
+        group = [m for m in ranking if m["description"].endswith("group1")]
+        self.assertEqual(len(group), 5)
+        self.assertEqual(len({m["score"] for m in group}), 1)
+        self.assertEqual(group[0]["skill_id"], "mcp/server1/tool_7")
+        self.assertEqual(group[0]["usage_count"], 1)
+
+        for top_k in range(3, 8):
+            self.assertEqual(
+                self.matcher.match("group1", -1.0, top_k), ranking[:top_k]
+            )
+
+    def test_top_k_above_skill_count(self):
+        ranking = self._full_ranking("group2", -1.0)
+        self.assertEqual(len(ranking), len(self.skills))
+        for top_k in (len(self.skills) + 1, 100):
+            self.assertEqual(
+                self.matcher.match("group2", -1.0, top_k), ranking
+            )
+
+        # Only the boosted skills and the ones above the threshold remain
+        ranking = self._full_ranking("group2", 0.99)
+        self.assertEqual(
+            sorted(m["skill_id"] for m in ranking),
+            sorted(
+                [skill_id for skill_id, _, _ in self.skills[2::6]]
+                + ["mcp/server1/tool_4", "mcp/server2/tool_17"]
+            ),
+        )
+        self.assertEqual(self.matcher.match("group2", 0.99, 100), ranking)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,279 @@
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.green_memories import GREENMemories
+from scripts.evaluation.tests.memory_fixtures import (
+    GREENMemoriesTestCase,
+    StubLLM,
+)
+
+
+class AbortRun(BaseException):
+    """Stops an assimilation run midway, like a crash would."""
+
+
+class TopicLLM(StubLLM):
+    """
+    Deterministic stand-in for the memory LLM: each user message names a
+    topic ("topic=<name>"); a related memory listed in the prompt is
+    reinforced, otherwise a memory is created for the topic.
+    """
+
+    def __init__(self, jitter: float = 0.0):
+        self.jitter = jitter
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def chat(self, chat_history, stream=False):
+        with self._lock:
+            self.calls += 1
+        if self.jitter:
+            time.sleep(random.random() * self.jitter)
+        prompt = chat_history[-1]["content"]
+        if "**Conversation Turns:**" in prompt:
+            # Batched prompts always get an unusable answer
+            return "Sorry, I can only handle one turn at a time."
+        snippet = prompt.split("**Conversation Snippet:**", 1)[1]
+        topic = re.findall(r"topic=(\w+)", snippet.split("**Step 2")[0])[-1]
+        match = re.search(
+            r"- ID: ([\w-]+), Relevance: [^,]*, Memory: \"about "
+            + topic
+            + '"',
+            prompt,
+        )
+        if match:
+            return '{"action": "reinforce", "memory_id": "%s"}' % match[1]
+        return (
+            '{"action": "create", "target": "extended_memories",'
+            ' "memory_data": {"topic": "%s", "memory": "about %s"}}'
+            % (topic, topic)
+        )
+
+
+class BatchLLM(StubLLM):
+    """Answers every batched prompt with a fixed list of decisions."""
+
+    def __init__(self, decisions):
+        self.decisions = decisions
+        self.calls = 0
+
+    def chat(self, chat_history, stream=False):
+        self.calls += 1
+        return json.dumps(self.decisions)
+
+
+class TestMemoryAssimilation(GREENMemoriesTestCase):
+    """
+    Tests the assimilation pipeline of process_new_messages_for_update:
+    concurrent planning, in-order application, conflict re-planning and
+    checkpointed resumption.
+    """
+
+    def _green(self, llm, workers=4):
+        green = super()._green(llm)
+        green.extraction_context_turns = 0
+        green.assimilation_max_workers = workers
+        green.batch_max_turns = 1
+        return green
+
+    def _add_turns(self, topics):
+        for topic in topics:
+            self.storage.add_message(f"I talk about topic={topic}", "user")
+            self.storage.add_message("Noted.", "assistant")
+
+    def _record_applied(self, green):
+        applied = []
+        apply = green._apply_memory_decision
+
+        def record(decision, user_message, *args, **kwargs):
+            applied.append(user_message["content"])
+            return apply(decision, user_message, *args, **kwargs)
+
+        green._apply_memory_decision = record
+        return applied
+
+    def test_turns_are_applied_in_order(self):
+        topics = [f"t{i}" for i in range(12)]
+        self._add_turns(topics)
+        green = self._green(TopicLLM(jitter=0.02))
+        applied = self._record_applied(green)
+
+        green.process_new_messages_for_update()
+
+        self.assertEqual(
+            applied, [f"I talk about topic={topic}" for topic in topics]
+        )
+        self.assertEqual(
+            sorted(memory["topic"] for memory in green.memories.all()),
+            sorted(topics),
+        )
+        status = green.get_assimilation_status()
+        self.assertEqual(status["processed"], 12)
+        self.assertFalse(status["running"])
+
+    def test_conflicting_decision_is_planned_again(self):
+        # Both turns are planned before either is applied, so both decide to
+        # create the topic; the second one must see the first's memory
+        self._add_turns(["coffee", "coffee"])
+        llm = TopicLLM()
+        green = self._green(llm, workers=2)
+
+        green.process_new_messages_for_update()
+
+        memories = green.memories.all()
+        self.assertEqual(len(memories), 1)
+        self.assertEqual(llm.calls, 3)
+        self.assertGreater(memories[0]["relevance"], 1.0)
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        topics = [f"t{i}" for i in range(6)]
+        self._add_turns(topics)
+        green = self._green(TopicLLM(), workers=2)
+        applied = self._record_applied(green)
+        record = green._apply_memory_decision
+
+        def crash_on_fourth(decision, user_message, *args, **kwargs):
+            if user_message["content"].endswith("topic=t3"):
+                raise AbortRun()
+            return record(decision, user_message, *args, **kwargs)
+
+        green._apply_memory_decision = crash_on_fourth
+        with self.assertRaises(AbortRun):
+            green.process_new_messages_for_update()
+        self.assertEqual(len(applied), 3)
+
+        # The checkpoint moved past the failing turn before it was applied
+        applied.clear()
+        green._apply_memory_decision = record
+        green.process_new_messages_for_update()
+        self.assertEqual(
+            applied, ["I talk about topic=t4", "I talk about topic=t5"]
+        )
+
+    def test_turns_added_during_run_are_left_for_next_run(self):
+        self._add_turns(["a", "b"])
+        green = self._green(TopicLLM(), workers=1)
+        progress = []
+
+        def on_progress(percent, current, total):
+            progress.append((current, total))
+            if current == 1:
+                self._add_turns(["late"])
+
+        green.process_new_messages_for_update(progress_callback=on_progress)
+        self.assertEqual(progress, [(1, 2), (2, 2)])
+        self.assertNotIn("late", green.memories.topics())
+
+        green.process_new_messages_for_update()
+        self.assertIn("late", green.memories.topics())
+
+    def test_unparseable_batch_is_planned_turn_by_turn(self):
+        self._add_turns(["a", "b", "c"])
+        llm = TopicLLM()
+        green = self._green(llm, workers=1)
+        green.batch_max_turns = 3
+        plan_turn = mock.Mock(wraps=green._plan_memory_assimilation)
+        green._plan_memory_assimilation = plan_turn
+
+        green.process_new_messages_for_update()
+
+        # One batched call, then one call per turn
+        self.assertEqual(llm.calls, 4)
+        self.assertEqual(plan_turn.call_count, 3)
+        self.assertEqual(sorted(green.memories.topics()), ["a", "b", "c"])
+
+    def test_batched_turns_do_not_conflict_with_each_other(self):
+        # Turns planned in one call already know about each other's
+        # decisions, so two new memories in one topic are both kept
+        self._add_turns(["tea", "tea"])
+        llm = BatchLLM(
+            [
+                {
+                    "action": "create",
+                    "target": "extended_memories",
+                    "memory_data": {"topic": "tea", "memory": memory},
+                }
+                for memory in ("likes green tea", "drinks tea at night")
+            ]
+        )
+        green = self._green(llm, workers=1)
+        green.batch_max_turns = 2
+        plan_turn = mock.Mock(wraps=green._plan_memory_assimilation)
+        green._plan_memory_assimilation = plan_turn
+
+        green.process_new_messages_for_update()
+
+        self.assertEqual(llm.calls, 1)
+        plan_turn.assert_not_called()
+        self.assertEqual(
+            sorted(memory["memory"] for memory in green.memories.all()),
+            ["drinks tea at night", "likes green tea"],
+        )
+
+
+class TestParseBatchedDecisions(unittest.TestCase):
+    """
+    Tests GREENMemories._parse_batched_decisions, which accepts a batched
+    LLM response only if it has exactly one decision per turn.
+    """
+
+    parse = staticmethod(GREENMemories._parse_batched_decisions)
+
+    def test_bare_list(self):
+        response = '[{"action": "ignore"}, {"action": "reinforce"}]'
+        self.assertEqual(
+            self.parse(response, 2),
+            [{"action": "ignore"}, {"action": "reinforce"}],
+        )
+
+    def test_decisions_object(self):
+        response = (
+            '{"decisions": [{"turn": 1, "action": "ignore"},'
+            ' {"turn": 2, "action": "create"}]}'
+        )
+        self.assertEqual(
+            [d["action"] for d in self.parse(response, 2)],
+            ["ignore", "create"],
+        )
+
+    def test_out_of_order_turns_are_sorted(self):
+        response = (
+            '[{"turn": 3, "action": "c"}, {"turn": "1", "action": "a"},'
+            ' {"turn": 2, "action": "b"}]'
+        )
+        self.assertEqual(
+            [d["action"] for d in self.parse(response, 3)], ["a", "b", "c"]
+        )
+
+    def test_wrong_count_is_rejected(self):
+        self.assertIsNone(self.parse('[{"action": "ignore"}]', 2))
+        self.assertIsNone(self.parse('{"decisions": []}', 1))
+
+    def test_duplicate_turns_are_rejected(self):
+        response = '[{"turn": 1, "action": "a"}, {"turn": 1, "action": "b"}]'
+        self.assertIsNone(self.parse(response, 2))
+
+    def test_invalid_responses_are_rejected(self):
+        for response in (
+            "not json",
+            None,
+            '{"action": "ignore"}',
+            '["ignore", "ignore"]',
+            '[{"turn": 1}, {"action": "b"}]',
+            '[{"turn": "x"}, {"turn": 2}]',
+        ):
+            self.assertIsNone(self.parse(response, 2), response)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import os
+import sys
+import unittest
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.memory_mirror import (
+    DECAY_BASE,
+    DECAY_RATES,
+    MemoryMirror,
+)
+from scripts.evaluation.tests.memory_fixtures import GREENMemoriesTestCase
+
+
+def memory(
+    memory_id,
+    topic="general",
+    relevance=1.0,
+    status="current",
+    last_updated="2024-01-01T00:00:00",
+    decay_epoch=0.0,
+    **fields,
+):
+    return {
+        "id": memory_id,
+        "topic": topic,
+        "memory": f"memory {memory_id}",
+        "memory_type": "extended_memories",
+        "relevance": relevance,
+        "status": status,
+        "last_updated": last_updated,
+        "decay_epoch": decay_epoch,
+        **fields,
+    }
+
+
+class TestMemoryMirror(unittest.TestCase):
+    """
+    Tests MemoryMirror's secondary indexes and its lazy relevance decay.
+    """
+
+    def setUp(self):
+        self.mirror = MemoryMirror()
+
+    def assertIds(self, memories, ids):
+        self.assertEqual([m["id"] for m in memories], ids)
+
+    def test_upsert_update_remove_keep_indexes_consistent(self):
+        self.mirror.upsert(memory("a", "food", 3.0, last_updated="2024-01-03"))
+        self.mirror.upsert(memory("b", "food", 2.0, last_updated="2024-01-02"))
+        self.mirror.upsert(memory("c", "work", 1.0, last_updated="2024-01-01"))
+        self.assertEqual(sorted(self.mirror.topics()), ["food", "work"])
+        self.assertIds(self.mirror.top_by_relevance(), ["a", "b", "c"])
+
+        # Replacing a memory moves it in every index
+        self.mirror.upsert(
+            memory("c", "hobby", 5.0, last_updated="2024-01-05")
+        )
+        self.assertEqual(sorted(self.mirror.topics()), ["food", "hobby"])
+        self.assertIds(self.mirror.top_by_relevance(), ["c", "a", "b"])
+        self.assertIds(self.mirror.most_recent(limit=1), ["c"])
+
+        # current -> past leaves the current indexes
+        updated = self.mirror.update("a", status="past")
+        self.assertEqual(updated["status"], "past")
+        self.assertEqual(self.mirror.count(), 3)
+        self.assertEqual(self.mirror.count("current"), 2)
+        self.assertEqual(self.mirror.count("past"), 1)
+        self.assertIds(self.mirror.top_by_relevance(), ["c", "b"])
+        self.assertIds(self.mirror.top_by_relevance(status="past"), ["a"])
+        self.assertIds(self.mirror.most_recent(), ["c", "b"])
+        self.assertEqual(self.mirror.topics(status="past"), ["food"])
+
+        # Removing the last current memory of a topic drops the topic
+        self.mirror.remove(["b"])
+        self.assertEqual(self.mirror.topics(), ["hobby"])
+        self.assertEqual(
+            sorted(self.mirror.topics(status=None)), ["food", "hobby"]
+        )
+        self.mirror.remove(["a", "missing"])
+        self.assertEqual(self.mirror.topics(status=None), ["hobby"])
+        self.assertIds(self.mirror.all(), ["c"])
+        self.assertIsNone(self.mirror.update("a", relevance=9.0))
+
+    def test_returned_memories_are_copies(self):
+        self.mirror.upsert(memory("a", source_message_ids=["m1"]))
+        view = self.mirror.get("a")
+        view["relevance"] = 100.0
+        view["source_message_ids"].append("m2")
+
+        stored = self.mirror.get("a")
+        self.assertEqual(stored["relevance"], 1.0)
+        self.assertEqual(stored["source_message_ids"], ["m1"])
+
+    def test_effective_relevance_decays_lazily(self):
+        self.mirror.load(
+            [
+                memory("a", relevance=10.0),
+                memory("b", relevance=10.0, status="past"),
+                memory("c", relevance=4.0, decay_epoch=2.0),
+            ],
+            epoch=2.0,
+        )
+        self.mirror.advance_epoch(3.0)
+        self.assertEqual(self.mirror.epoch, 5.0)
+
+        for memory_id, relevance, rate, elapsed in (
+            ("a", 10.0, DECAY_RATES["current"], 5.0),
+            ("b", 10.0, DECAY_RATES["past"], 5.0),
+            ("c", 4.0, DECAY_RATES["current"], 3.0),
+        ):
+            expected = relevance * DECAY_BASE ** (rate * elapsed)
+            self.assertAlmostEqual(self.mirror.relevance(memory_id), expected)
+            view = self.mirror.get(memory_id)
+            self.assertAlmostEqual(view["relevance"], expected)
+            self.assertEqual(view["decay_epoch"], 5.0)
+
+        # Writing a view back materializes it without changing the value
+        self.mirror.upsert(self.mirror.get("a"))
+        self.assertAlmostEqual(
+            self.mirror.relevance("a"), 10.0 * DECAY_BASE ** 5.0
+        )
+
+    def test_top_by_relevance_after_advancing_epoch(self):
+        # A past memory starts ahead but decays four times faster
+        self.mirror.load(
+            [
+                memory("current", relevance=1.0),
+                memory("past", relevance=1.1, status="past"),
+                memory("low", relevance=0.5),
+            ]
+        )
+        self.assertIds(
+            self.mirror.top_by_relevance(status=None),
+            ["past", "current", "low"],
+        )
+
+        # 1.1 * 0.998 ** (4 * 100) ~ 0.49, below 0.998 ** 100 ~ 0.82
+        self.mirror.advance_epoch(100)
+        self.assertIds(
+            self.mirror.top_by_relevance(status=None),
+            ["current", "past", "low"],
+        )
+        self.assertIds(self.mirror.top_by_relevance(), ["current", "low"])
+        self.assertIds(
+            self.mirror.top_by_relevance(status=None, min_relevance=0.45),
+            ["current", "past"],
+        )
+
+        # A reinforced memory materialized at the new epoch moves up
+        reinforced = self.mirror.get("low")
+        self.mirror.update(
+            "low",
+            relevance=reinforced["relevance"] + 1,
+            decay_epoch=reinforced["decay_epoch"],
+        )
+        self.assertIds(
+            self.mirror.top_by_relevance(status=None),
+            ["low", "current", "past"],
+        )
+        self.assertIds(self.mirror.top_by_relevance(limit=1), ["low"])
+
+
+class TestMemoryMirrorWriteThrough(GREENMemoriesTestCase):
+    """
+    Tests that GREENMemories writes every memory change through to SQLite,
+    so a fresh instance loads the same memories its mirror held.
+    """
+
+    def _create(self, green, topic):
+        return green._create_new_memory(
+            {"memory_data": {"topic": topic, "memory": f"about {topic}"}},
+            {"id": f"u-{topic}"},
+            {"id": f"a-{topic}"},
+        )["id"]
+
+    def _snapshot(self, green):
+        fields = ("topic", "memory", "status", "source_message_ids")
+        return {
+            m["id"]: (round(m["relevance"], 9),)
+            + tuple(m.get(field) for field in fields)
+            for m in green.memories.all()
+        }
+
+    def test_round_trip(self):
+        green = self._green()
+        ids = {
+            topic: self._create(green, topic)
+            for topic in ("tea", "chess", "paris", "dup")
+        }
+        green.decay_all_memories(0.9)
+        self.assertTrue(green._reinforce_memory(ids["tea"], 2.0))
+        green._mark_memories_as_past([ids["paris"]])
+        green.decay_all_memories(0.9)
+        green._delete_memories([ids["dup"]], consolidate_into_id=ids["chess"])
+
+        self.assertNotIn(ids["dup"], self._snapshot(green))
+        self.assertEqual(green.memories.get(ids["paris"])["status"], "past")
+        self.assertAlmostEqual(
+            green.memories.relevance(ids["tea"]), (0.9 + 2.0) * 0.9
+        )
+
+        reloaded = self._green()
+        self.assertAlmostEqual(reloaded.memories.epoch, green.memories.epoch)
+        self.assertEqual(self._snapshot(reloaded), self._snapshot(green))
+        self.assertEqual(
+            [m["id"] for m in reloaded.memories.top_by_relevance(status=None)],
+            [m["id"] for m in green.memories.top_by_relevance(status=None)],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.green_memories import GREENMemories
+from ainara.framework.memory_retrieval_cache import RetrievalCache
+from scripts.evaluation.tests.memory_fixtures import GREENMemoriesTestCase
+
+
+def rotated(angle_degrees):
+    """A unit vector at the given angle from [1, 0, 0]."""
+    angle = np.radians(angle_degrees)
+    return np.array([np.cos(angle), np.sin(angle), 0.0], dtype=np.float32)
+
+
+class TestRetrievalCache(unittest.TestCase):
+    """
+    Tests RetrievalCache: entries are reused for queries within the cosine
+    threshold, only at the same memory version and retrieval options.
+    """
+
+    def setUp(self):
+        # cos(18 degrees) ~ 0.951
+        self.cache = RetrievalCache(similarity_threshold=0.95, max_entries=2)
+
+    def test_close_query_reuses_entry(self):
+        self.cache.store(rotated(0), 1, "opts", "first")
+
+        self.assertEqual(self.cache.lookup(rotated(0), 1, "opts"), "first")
+        self.assertEqual(self.cache.lookup(rotated(15), 1, "opts"), "first")
+        # Scale doesn't matter, only direction
+        self.assertEqual(
+            self.cache.lookup(5 * rotated(10), 1, "opts"), "first"
+        )
+        self.assertIsNone(self.cache.lookup(rotated(25), 1, "opts"))
+        self.assertEqual(self.cache.stats()["hits"], 3)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_most_similar_entry_wins(self):
+        self.cache.store(rotated(0), 1, "opts", "zero")
+        self.cache.store(rotated(20), 1, "opts", "twenty")
+
+        self.assertEqual(self.cache.lookup(rotated(8), 1, "opts"), "zero")
+        self.assertEqual(self.cache.lookup(rotated(12), 1, "opts"), "twenty")
+
+    def test_version_and_options_must_match(self):
+        self.cache.store(rotated(0), 1, (10, True), "data")
+
+        self.assertIsNone(self.cache.lookup(rotated(0), 2, (10, True)))
+        self.assertIsNone(self.cache.lookup(rotated(0), 1, (10, False)))
+        self.assertEqual(self.cache.lookup(rotated(0), 1, (10, True)), "data")
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.store(rotated(0), 1, "opts", "a")
+        self.cache.store(rotated(90), 1, "opts", "b")
+        self.cache.lookup(rotated(0), 1, "opts")
+        self.cache.store(rotated(180), 1, "opts", "c")
+
+        self.assertEqual(self.cache.lookup(rotated(0), 1, "opts"), "a")
+        self.assertIsNone(self.cache.lookup(rotated(90), 1, "opts"))
+        self.assertEqual(self.cache.stats()["entries"], 2)
+
+    def test_clear_counts_invalidations(self):
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()["invalidations"], 0)
+        self.cache.store(rotated(0), 1, "opts", "data")
+        self.cache.clear()
+
+        self.assertIsNone(self.cache.lookup(rotated(0), 1, "opts"))
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+
+class TestGREENRetrievalCache(GREENMemoriesTestCase):
+    """
+    Tests that get_relevant_memories() reuses the candidates of a close
+    follow-up query and searches again once a memory is written.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.start_patch(
+            mock.patch.object(
+                GREENMemories, "_is_query_substantive", return_value=True
+            )
+        )
+        self.green = self._green()
+        self.assertTrue(self.green.wait_until_ready(timeout=10))
+        self.assertIsNotNone(self.green.retrieval_cache)
+        self.green.retrieval_cache.similarity_threshold = 0.95
+
+        self.memory = self._create("tea")
+        self.embeddings = {}
+        self.green._embed_query = lambda query: self.embeddings[query]
+        self.gather = mock.Mock(side_effect=self._gather)
+        self.green._gather_memory_candidates = self.gather
+
+    def _create(self, topic):
+        return self.green._create_new_memory(
+            {"memory_data": {"topic": topic, "memory": f"about {topic}"}},
+            {"id": f"u-{topic}"},
+            {"id": f"a-{topic}"},
+        )
+
+    def _gather(self, query, query_embedding, top_k, exclude_ids, topic_boost):
+        return (
+            [self.memory],
+            np.array([0.5]),
+            np.array([False]),
+            np.array([False]),
+            np.array([False]),
+            np.array([np.nan]),
+        )
+
+    def _retrieve(self, query, angle, **kwargs):
+        self.embeddings[query] = rotated(angle)
+        return self.green.get_relevant_memories(query, **kwargs)
+
+    def test_close_follow_up_reuses_candidates(self):
+        first = self._retrieve("do I like tea", 0)
+        second = self._retrieve("do I like tea at all", 10)
+
+        self.assertEqual(self.gather.call_count, 1)
+        self.assertEqual([m["id"] for m in first], [self.memory["id"]])
+        self.assertEqual([m["id"] for m in second], [self.memory["id"]])
+
+        # A different question, or different options, search again
+        self._retrieve("what about coffee", 60)
+        self._retrieve("do I like tea", 0, top_k=3)
+        self.assertEqual(self.gather.call_count, 3)
+
+    def test_memory_write_invalidates_cache(self):
+        self._retrieve("do I like tea", 0)
+        version = self.green._memory_version
+
+        self.assertTrue(self.green._reinforce_memory(self.memory["id"]))
+        self.assertEqual(self.green._memory_version, version + 1)
+        self._retrieve("do I like tea", 0)
+        self.assertEqual(self.gather.call_count, 2)
+
+        self._create("chess")
+        self._retrieve("do I like tea", 0)
+        self.assertEqual(self.gather.call_count, 3)
+        self.assertGreaterEqual(
+            self.green.retrieval_cache.stats()["invalidations"], 2
+        )
+
+    def test_cached_candidates_are_not_modified(self):
+        # Returned memories are copies, so a caller can't alter the cache
+        results = self._retrieve("do I like tea", 0)
+        results[0]["memory"] = "changed"
+
+        cached = self._retrieve("do I like tea", 0)
+        self.assertEqual(self.gather.call_count, 1)
+        self.assertEqual(cached[0]["memory"], "about tea")
+
+
+if __name__ == '__main__':
+    unittest.main()
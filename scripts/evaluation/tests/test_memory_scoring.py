@@ -0,0 +1,212 @@
+import math
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.green_memories import (
+    DEFAULT_SCORING_CONFIG,
+    _timestamp_seconds,
+    score_memory_candidates,
+    validate_scoring_config,
+)
+
+NOW = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def reference_score(config, memory, distance, relevance, relevant_topics):
+    """The per-candidate formula score_memory_candidates() replaced."""
+    if memory.get("memory_type") == "key_memories":
+        relevance *= config["key_memory_boost"]
+    if relevant_topics and memory.get("topic") in relevant_topics:
+        relevance *= config["key_memory_boost"]
+    semantic_score = 1 - (distance / 2)
+    base_score = semantic_score * (1 - config["relevance_weight"]) + (
+        relevance * config["relevance_weight"]
+    )
+    recency_boost = 1.0
+    if memory.get("last_updated"):
+        try:
+            last_updated = datetime.fromisoformat(memory["last_updated"])
+            hours = (NOW - last_updated).total_seconds() / 3600
+            recency_boost = 1 + (config["max_recency_boost"] - 1) * math.exp(
+                -config["recency_decay_rate"] * hours
+            )
+        except (ValueError, TypeError):
+            pass
+    score = base_score * recency_boost
+    if memory.get("status", "current") == "past":
+        score *= config["past_memory_penalty"]
+    return score
+
+
+class TestValidateScoringConfig(unittest.TestCase):
+    """
+    Tests validate_scoring_config: overrides merged into the defaults,
+    unknown settings ignored, bad values of known settings rejected.
+    """
+
+    def test_defaults(self):
+        self.assertEqual(validate_scoring_config(), DEFAULT_SCORING_CONFIG)
+
+    def test_overrides_are_merged(self):
+        scoring = validate_scoring_config({"relevance_weight": 1})
+        self.assertEqual(scoring["relevance_weight"], 1.0)
+        self.assertIsInstance(scoring["relevance_weight"], float)
+        self.assertEqual(
+            scoring["key_memory_boost"],
+            DEFAULT_SCORING_CONFIG["key_memory_boost"],
+        )
+
+    def test_unknown_settings_are_ignored(self):
+        with self.assertLogs(
+            "ainara.framework.green_memories", level="WARNING"
+        ) as logs:
+            scoring = validate_scoring_config(
+                {"relevance_wieght": 0.9, "past_memory_penalty": 0.2}
+            )
+        self.assertIn("relevance_wieght", logs.output[0])
+        self.assertNotIn("relevance_wieght", scoring)
+        self.assertEqual(scoring["past_memory_penalty"], 0.2)
+
+    def test_invalid_values_are_rejected(self):
+        for overrides in (
+            {"relevance_weight": "high"},
+            {"relevance_weight": True},
+            {"relevance_weight": 1.5},
+            {"max_recency_boost": 0.5},
+            {"key_memory_boost": -1},
+        ):
+            with self.assertRaises(ValueError, msg=overrides):
+                validate_scoring_config(overrides)
+
+
+class TestScoreMemoryCandidates(unittest.TestCase):
+    """
+    Tests the vectorized ranking score against the per-candidate formula it
+    replaced.
+    """
+
+    config = DEFAULT_SCORING_CONFIG
+
+    def _hours_ago(self, hours):
+        return (NOW - timedelta(hours=hours)).isoformat()
+
+    def _score(self, memories, distances, relevances, relevant_topics):
+        return score_memory_candidates(
+            self.config,
+            np.array(distances, dtype=float),
+            np.array(relevances, dtype=float),
+            np.array(
+                [m.get("memory_type") == "key_memories" for m in memories]
+            ),
+            np.array([m.get("topic") in relevant_topics for m in memories]),
+            np.array([m.get("status") == "past" for m in memories]),
+            np.array(
+                [_timestamp_seconds(m.get("last_updated")) for m in memories]
+            ),
+            now=NOW.timestamp(),
+        )
+
+    def test_matches_per_candidate_formula(self):
+        memories = [
+            # Key memory on an active topic: both boosts stack
+            {
+                "memory_type": "key_memories",
+                "topic": "food",
+                "last_updated": self._hours_ago(2),
+            },
+            {
+                "memory_type": "key_memories",
+                "topic": "work",
+                "last_updated": self._hours_ago(2),
+            },
+            {
+                "memory_type": "extended_memories",
+                "topic": "food",
+                "last_updated": self._hours_ago(200),
+            },
+            {
+                "memory_type": "extended_memories",
+                "topic": "food",
+                "status": "past",
+                "last_updated": self._hours_ago(2),
+            },
+            # Unknown or unparseable update times get no recency boost
+            {"memory_type": "extended_memories", "topic": "work"},
+            {
+                "memory_type": "extended_memories",
+                "topic": "work",
+                "last_updated": "yesterday",
+            },
+        ]
+        distances = [0.4, 0.4, 0.2, 0.3, 0.8, 0.8]
+        relevances = [1.0, 1.0, 3.0, 2.0, 0.5, 0.5]
+
+        scores = self._score(memories, distances, relevances, ["food"])
+
+        expected = [
+            reference_score(self.config, m, d, r, ["food"])
+            for m, d, r in zip(memories, distances, relevances)
+        ]
+        np.testing.assert_allclose(scores, expected)
+        # Same recency, so the ratio is that of the boosted base scores
+        self.assertAlmostEqual(
+            scores[0] / scores[1],
+            (0.8 * 0.7 + 1.5 * 1.5 * 0.3) / (0.8 * 0.7 + 1.5 * 0.3),
+        )
+        self.assertEqual(scores[4], scores[5])
+        self.assertAlmostEqual(scores[4], 0.6 * 0.7 + 0.5 * 0.3)
+
+    def test_past_penalty(self):
+        current = {"topic": "x", "last_updated": self._hours_ago(1)}
+        past = dict(current, status="past")
+        scores = self._score([current, past], [0.5, 0.5], [1.0, 1.0], [])
+        self.assertAlmostEqual(
+            scores[1], scores[0] * self.config["past_memory_penalty"]
+        )
+
+    def test_ties_keep_vector_search_order(self):
+        memories = [{"topic": "x"}] * 3 + [{"topic": "y"}] * 2
+        distances = [0.5, 0.5, 0.5, 0.1, 0.1]
+        scores = self._score(memories, distances, [1.0] * 5, [])
+        ranking = np.argsort(-scores, kind="stable")
+        self.assertEqual(list(ranking), [3, 4, 0, 1, 2])
+
+        # Same order as the stable descending sort of the old loop
+        reference = [
+            reference_score(self.config, memory, distance, 1.0, [])
+            for memory, distance in zip(memories, distances)
+        ]
+        expected = sorted(range(5), key=reference.__getitem__, reverse=True)
+        self.assertEqual(list(ranking), expected)
+
+    def test_naive_timestamps_are_utc(self):
+        # The old loop failed on naive minus aware datetimes and gave no
+        # boost; naive times are now read as UTC, like the stored ones
+        naive = NOW.replace(tzinfo=None) - timedelta(hours=5)
+        self.assertEqual(
+            _timestamp_seconds(naive.isoformat()),
+            (NOW - timedelta(hours=5)).timestamp(),
+        )
+        scores = self._score(
+            [
+                {"topic": "x", "last_updated": naive.isoformat()},
+                {"topic": "x", "last_updated": self._hours_ago(5)},
+            ],
+            [0.5, 0.5],
+            [1.0, 1.0],
+            [],
+        )
+        self.assertEqual(scores[0], scores[1])
+        self.assertTrue(math.isnan(_timestamp_seconds(None)))
+        self.assertTrue(math.isnan(_timestamp_seconds("not a date")))
+
+
+if __name__ == '__main__':
+    unittest.main()
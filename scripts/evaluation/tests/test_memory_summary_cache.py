@@ -0,0 +1,137 @@
+import os
+import sys
+import threading
+import unittest
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.green_memories import PROFILE_SUMMARY_FAILED
+from scripts.evaluation.tests.memory_fixtures import GREENMemoriesTestCase
+
+
+class SummaryGenerator:
+    """
+    Stands in for generate_user_profile_summary(): returns numbered
+    summaries, records the thread of every call, and can be held.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.threads = []
+        self.result = None
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.threads.append(threading.current_thread())
+        self.release.wait(10)
+        return self.result or f"summary {self.calls}"
+
+
+class TestSummaryCache(GREENMemoriesTestCase):
+    """
+    Tests the cached narrative summaries: the last good summary is served
+    while a fresh one is generated in the background, and is kept across
+    restarts until the memories or the context window change.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.generate = SummaryGenerator()
+        self.addCleanup(self.generate.release.set)
+
+    def _green(self):
+        green = super()._green()
+        green.generate_user_profile_summary = self.generate
+        self.addCleanup(green._summary_executor.shutdown)
+        return green
+
+    def _wait_for_refresh(self, green):
+        # The summary executor has a single worker
+        green._summary_executor.submit(lambda: None).result(10)
+
+    def test_missing_summary_is_generated_inline_only_if_asked(self):
+        green = self._green()
+
+        self.assertEqual(
+            green.get_user_profile_summary(wait_if_missing=True), "summary 1"
+        )
+        self.assertIs(self.generate.threads[0], threading.current_thread())
+
+        # With an entry, even a stale one, generation is never inline
+        green._bump_memory_version()
+        self.assertEqual(
+            green.get_user_profile_summary(wait_if_missing=True), "summary 1"
+        )
+        self._wait_for_refresh(green)
+        self.assertIsNot(self.generate.threads[1], threading.current_thread())
+
+    def test_missing_summary_is_generated_in_background(self):
+        green = self._green()
+
+        self.assertIsNone(green.get_user_profile_summary())
+        self._wait_for_refresh(green)
+        self.assertIsNot(self.generate.threads[0], threading.current_thread())
+        self.assertEqual(green.get_user_profile_summary(), "summary 1")
+        self.assertEqual(self.generate.calls, 1)
+
+    def test_stale_summary_is_served_during_refresh(self):
+        green = self._green()
+        green.get_user_profile_summary(wait_if_missing=True)
+        green._bump_memory_version()
+        self.generate.release.clear()
+
+        self.assertEqual(green.get_user_profile_summary(), "summary 1")
+        # A refresh already running isn't started twice
+        self.assertEqual(green.get_user_profile_summary(), "summary 1")
+        self.generate.release.set()
+        self._wait_for_refresh(green)
+
+        self.assertEqual(self.generate.calls, 2)
+        self.assertEqual(green.get_user_profile_summary(), "summary 2")
+        self.assertEqual(self.generate.calls, 2)
+
+    def test_failed_generation_keeps_previous_summary(self):
+        green = self._green()
+        green.get_user_profile_summary(wait_if_missing=True)
+        green._bump_memory_version()
+        self.generate.result = PROFILE_SUMMARY_FAILED
+
+        self.assertEqual(green.get_user_profile_summary(), "summary 1")
+        self._wait_for_refresh(green)
+        self.assertEqual(self.generate.calls, 2)
+        self.assertEqual(green.get_user_profile_summary(), "summary 1")
+        self.assertEqual(self._green().get_user_profile_summary(), "summary 1")
+
+    def test_summary_persists_across_instances(self):
+        self._green().get_user_profile_summary(wait_if_missing=True)
+
+        green = self._green()
+        self.assertEqual(
+            green.get_user_profile_summary(wait_if_missing=True), "summary 1"
+        )
+        self._wait_for_refresh(green)
+        self.assertEqual(self.generate.calls, 1)
+
+    def test_context_window_change_invalidates_summary(self):
+        self._green().get_user_profile_summary(wait_if_missing=True)
+
+        green = self._green()
+        green.context_window = 4096
+        self.assertEqual(green.get_user_profile_summary(), "summary 1")
+        self._wait_for_refresh(green)
+        self.assertEqual(self.generate.calls, 2)
+        self.assertEqual(green.get_user_profile_summary(), "summary 2")
+
+        # The refreshed entry is for the new context window
+        green = self._green()
+        green.context_window = 4096
+        self.assertEqual(green.get_user_profile_summary(), "summary 2")
+        self._wait_for_refresh(green)
+        self.assertEqual(self.generate.calls, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
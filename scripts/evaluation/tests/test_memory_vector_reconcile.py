@@ -0,0 +1,184 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from scripts.evaluation.tests.memory_fixtures import GREENMemoriesTestCase
+
+
+class FakeVectorStore:
+    """
+    Memory vector index kept as a dict of metadata by id, recording the
+    ids every call wrote or deleted.
+    """
+
+    supports_vector_search = False
+
+    def __init__(self, metadata=None, can_list=True):
+        self.metadata = dict(metadata or {})
+        self.supports_metadata_listing = can_list
+        self.searches = []
+        self.upserted = []
+        self.added = []
+        self.deleted = []
+        self.resets = 0
+
+    def get_all_metadata(self, batch_size=1000):
+        return {doc_id: dict(meta) for doc_id, meta in self.metadata.items()}
+
+    def upsert_documents(self, documents):
+        for doc in documents:
+            self.upserted.append(doc["metadata"]["id"])
+            self.metadata[doc["metadata"]["id"]] = doc["metadata"]
+
+    def add_documents(self, documents):
+        for doc in documents:
+            self.added.append(doc["metadata"]["id"])
+            self.metadata.setdefault(doc["metadata"]["id"], doc["metadata"])
+
+    def delete(self, ids):
+        for doc_id in ids:
+            self.deleted.append(doc_id)
+            self.metadata.pop(doc_id, None)
+
+    def reset(self):
+        self.resets += 1
+        self.metadata.clear()
+
+    def search_with_scores(self, query, limit=5, filter_dict=None):
+        self.searches.append(("text", query))
+        return []
+
+    def search_by_vector(self, query_embedding, limit=5, filter_dict=None):
+        self.searches.append(("vector", list(query_embedding)))
+        return []
+
+
+class TestReconcileProfileVectorStore(GREENMemoriesTestCase):
+    """
+    Tests the startup reconciliation of the memory vector index with the
+    profile: only memories that differ are re-embedded, orphans are
+    deleted, and backends that can't list their documents are rebuilt.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.green = self._green()
+        self.assertTrue(self.green.wait_until_ready(timeout=10))
+        self.memories = {
+            topic: self.green._create_new_memory(
+                {"memory_data": {"topic": topic, "memory": f"about {topic}"}},
+                {"id": f"u-{topic}"},
+                {"id": f"a-{topic}"},
+            )
+            for topic in ("same", "text", "updated", "status", "old", "new")
+        }
+        # Documents carry the memory as metadata, with the text as is
+        self.green._memory_documents = lambda memories: [
+            {"page_content": memory["memory"], "metadata": dict(memory)}
+            for memory in memories
+        ]
+
+    def _indexed(self):
+        """The index as a previous run left it, one case per memory."""
+        indexed = {
+            memory["id"]: dict(memory)
+            for topic, memory in self.memories.items()
+            if topic != "new"
+        }
+        ids = {topic: memory["id"] for topic, memory in self.memories.items()}
+        # Relevance isn't stored in the index, so it never counts
+        indexed[ids["same"]]["relevance"] = 0.1
+        indexed[ids["text"]]["memory"] = "about something else"
+        indexed[ids["updated"]]["last_updated"] = "2020-01-01T00:00:00"
+        indexed[ids["status"]]["status"] = "past"
+        # Indexed before retrieval read the topic from the metadata
+        del indexed[ids["old"]]["topic"]
+        indexed["orphan"] = {"id": "orphan", "memory": "deleted memory"}
+        return indexed
+
+    def test_only_changed_memories_are_upserted(self):
+        vector_store = FakeVectorStore(self._indexed())
+        self.green.vector_storage = vector_store
+        self.storage.set_metadata("vector_db_needs_reset", "true")
+
+        self.green._reconcile_profile_vector_store(batch_size=2)
+
+        ids = {topic: memory["id"] for topic, memory in self.memories.items()}
+        self.assertEqual(
+            sorted(vector_store.upserted),
+            sorted(
+                ids[topic]
+                for topic in ("text", "updated", "status", "old", "new")
+            ),
+        )
+        self.assertEqual(vector_store.deleted, ["orphan"])
+        self.assertEqual(vector_store.resets, 0)
+        self.assertEqual(sorted(vector_store.metadata), sorted(ids.values()))
+        self.assertEqual(
+            self.storage.get_metadata("vector_db_needs_reset"), "false"
+        )
+
+        # Once in line, a second pass changes nothing
+        vector_store.upserted.clear()
+        vector_store.deleted.clear()
+        self.green._reconcile_profile_vector_store()
+        self.assertEqual(vector_store.upserted, [])
+        self.assertEqual(vector_store.deleted, [])
+
+    def test_unlisted_backend_is_rebuilt(self):
+        vector_store = FakeVectorStore(self._indexed(), can_list=False)
+        self.green.vector_storage = vector_store
+
+        self.green._reconcile_profile_vector_store()
+
+        self.assertEqual(vector_store.resets, 1)
+        self.assertEqual(vector_store.upserted, [])
+        self.assertEqual(
+            sorted(vector_store.added),
+            sorted(memory["id"] for memory in self.memories.values()),
+        )
+        self.assertEqual(
+            self.storage.get_metadata("vector_db_needs_rebuild"), "false"
+        )
+
+
+class TestSearchMemories(GREENMemoriesTestCase):
+    """
+    Tests that memory searches reuse the query embedding only with vector
+    stores that support searching by vector with the same encoder.
+    """
+
+    def test_vector_search_needs_the_capability(self):
+        green = self._green()
+        self.assertTrue(green.wait_until_ready(timeout=10))
+        green.embedding_model_name = "encoder"
+        vector_store = FakeVectorStore()
+        vector_store.embedding_model_name = "encoder"
+        green.vector_storage = vector_store
+        embedding = np.array([1.0, 0.0], dtype=np.float32)
+
+        green._search_memories("tea", 5, query_embedding=embedding)
+        vector_store.supports_vector_search = True
+        green._search_memories("tea", 5, query_embedding=embedding)
+        green._search_memories("tea", 5)
+        vector_store.embedding_model_name = "other encoder"
+        green._search_memories("tea", 5, query_embedding=embedding)
+
+        self.assertEqual(
+            vector_store.searches,
+            [
+                ("text", "tea"),
+                ("vector", [1.0, 0.0]),
+                ("text", "tea"),
+                ("text", "tea"),
+            ],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
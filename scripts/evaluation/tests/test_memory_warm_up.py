@@ -0,0 +1,144 @@
+import json
+import os
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.green_memories import SUMMARY_CACHE_KEYS, GREENMemories
+from scripts.evaluation.tests.memory_fixtures import (
+    GREENMemoriesTestCase,
+    fake_warm_up,
+)
+
+try:
+    from ainara.framework import chat_manager
+
+    CHAT_MANAGER_AVAILABLE = True
+except (ImportError, SyntaxError):
+    CHAT_MANAGER_AVAILABLE = False
+
+
+class TestMemoryWarmUp(GREENMemoriesTestCase):
+    """
+    Tests GREENMemories while the background warm-up runs or after it
+    failed: retrieval degrades to nothing, the cached summary is still
+    served, and profile updates are skipped.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.release = threading.Event()
+        self.warm_up_error = None
+
+        def slow_warm_up(green):
+            self.release.wait(10)
+            if self.warm_up_error:
+                raise self.warm_up_error
+            fake_warm_up(green)
+
+        self.start_patch(
+            mock.patch.object(
+                GREENMemories, "_load_models_and_vector_store", slow_warm_up
+            )
+        )
+        self.addCleanup(self.release.set)
+
+    def test_retrieval_waits_for_warm_up(self):
+        self.storage.set_metadata(
+            SUMMARY_CACHE_KEYS["user_profile"],
+            json.dumps(
+                {
+                    "version": 0,
+                    "context_window": 8192,
+                    "summary": "Likes green tea.",
+                }
+            ),
+        )
+        green = self._green(background_warm_up=True)
+        green._is_query_substantive = mock.Mock(return_value=True)
+
+        self.assertFalse(green.is_ready())
+        self.assertIn(
+            green.get_warm_up_status()["state"], ("pending", "warming_up")
+        )
+        self.assertEqual(green.get_relevant_memories("do I like tea"), [])
+        green._is_query_substantive.assert_not_called()
+        self.assertEqual(
+            green.get_user_profile_summary(wait_if_missing=True),
+            "Likes green tea.",
+        )
+
+        self.release.set()
+        self.assertTrue(green.wait_until_ready(timeout=10))
+        self.assertEqual(green.get_warm_up_status()["state"], "ready")
+        self.assertEqual(green.get_relevant_memories("do I like tea"), [])
+        green._is_query_substantive.assert_called_once()
+
+    def test_failed_warm_up_skips_updates(self):
+        self.warm_up_error = RuntimeError("spaCy model missing")
+        green = self._green(background_warm_up=True)
+        self.release.set()
+
+        self.assertFalse(green.wait_until_ready(timeout=10))
+        status = green.get_warm_up_status()
+        self.assertEqual(status["state"], "failed")
+        self.assertEqual(status["error"], "spaCy model missing")
+        self.assertTrue(green.is_ready())
+
+        with mock.patch.object(green, "_process_new_messages") as process:
+            green.process_new_messages_for_update()
+        process.assert_not_called()
+        self.assertEqual(green.get_relevant_memories("do I like tea"), [])
+
+
+@unittest.skipUnless(
+    CHAT_MANAGER_AVAILABLE, "chat manager dependencies not installed"
+)
+class TestChatManagerMemoryInit(unittest.TestCase):
+    """
+    Tests that ChatManager initializes memory on demand as configured by
+    user_profile.green_memories.background_warm_up and
+    user_profile.green_memories.assimilation.background.
+    """
+
+    def _initialize(self, settings):
+        manager = types.SimpleNamespace(
+            chat_memory=object(),
+            green_memories=None,
+            llm=object(),
+            memory_decay_interval=0,
+        )
+        with mock.patch.object(chat_manager, "GREENMemories") as green_class:
+            with mock.patch.object(chat_manager.config, "get", settings.get):
+                chat_manager.ChatManager._initialize_memory_if_needed(manager)
+        return green_class
+
+    def test_defaults_run_in_background(self):
+        green_class = self._initialize({})
+        green = green_class.return_value
+
+        self.assertTrue(green_class.call_args.kwargs["background_warm_up"])
+        green.start_background_update.assert_called_once()
+        green.process_new_messages_for_update.assert_not_called()
+
+    def test_foreground_settings(self):
+        green_class = self._initialize(
+            {
+                "user_profile.green_memories.background_warm_up": False,
+                "user_profile.green_memories.assimilation.background": False,
+            }
+        )
+        green = green_class.return_value
+
+        self.assertFalse(green_class.call_args.kwargs["background_warm_up"])
+        green.start_background_update.assert_not_called()
+        green.process_new_messages_for_update.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
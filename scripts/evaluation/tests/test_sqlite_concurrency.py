@@ -0,0 +1,163 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.storage.sqlite import SQLiteStorage
+
+
+class TestSQLiteConcurrency(unittest.TestCase):
+    """
+    Stress tests for SQLiteStorage's connection manager: a single serialized
+    writer and per-thread WAL readers shared by request and background
+    threads.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = SQLiteStorage(
+            db_path=os.path.join(self.tmpdir.name, "chat_memory.db"),
+            context_id="persona-test",
+        )
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def _run_threads(self, targets):
+        errors = []
+
+        def wrap(target):
+            def run():
+                try:
+                    target()
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+            return run
+
+        threads = [threading.Thread(target=wrap(t)) for t in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+        self.assertEqual(errors, [])
+
+    def test_concurrent_reads_and_writes(self):
+        writers, messages_per_writer = 4, 100
+        stop_reading = threading.Event()
+        reads = []
+
+        def writer(n):
+            def run():
+                for i in range(messages_per_writer):
+                    self.storage.add_message(f"writer {n} message {i}", "user")
+                    self.storage.set_metadata(f"writer_{n}", str(i))
+            return run
+
+        def reader():
+            count = 0
+            while not stop_reading.is_set():
+                self.storage.get_messages(limit=20)
+                self.storage.get_metadata("writer_0")
+                self.storage.get_message_count()
+                count += 1
+            reads.append(count)
+
+        reader_threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in reader_threads:
+            thread.start()
+        try:
+            self._run_threads([writer(n) for n in range(writers)])
+        finally:
+            stop_reading.set()
+            for thread in reader_threads:
+                thread.join(timeout=60)
+
+        self.assertEqual(
+            self.storage.get_message_count(), writers * messages_per_writer
+        )
+        for n in range(writers):
+            self.assertEqual(
+                self.storage.get_metadata(f"writer_{n}"),
+                str(messages_per_writer - 1),
+            )
+        self.assertEqual(len(reads), 4)
+        self.assertTrue(all(count > 0 for count in reads))
+
+    def test_reads_do_not_wait_for_open_write(self):
+        self.storage.set_metadata("key", "before")
+        write_started = threading.Event()
+        release_write = threading.Event()
+
+        def long_write():
+            with self.storage.write() as conn:
+                conn.execute(
+                    "UPDATE db_metadata SET value = 'after' WHERE key = 'key'"
+                )
+                write_started.set()
+                release_write.wait(timeout=10)
+
+        thread = threading.Thread(target=long_write)
+        thread.start()
+        try:
+            self.assertTrue(write_started.wait(timeout=10))
+            start = time.perf_counter()
+            value = self.storage.get_metadata("key")
+            elapsed = time.perf_counter() - start
+            # Readers see the last committed snapshot, without waiting
+            self.assertEqual(value, "before")
+            self.assertLess(elapsed, 1.0)
+        finally:
+            release_write.set()
+            thread.join(timeout=10)
+        self.assertEqual(self.storage.get_metadata("key"), "after")
+
+    def test_writes_are_serialized(self):
+        self.storage.set_metadata("counter", "0")
+
+        def increment():
+            for _ in range(50):
+                with self.storage.write() as conn:
+                    value = int(
+                        conn.execute(
+                            "SELECT value FROM db_metadata WHERE key ="
+                            " 'counter'"
+                        ).fetchone()[0]
+                    )
+                    conn.execute(
+                        "UPDATE db_metadata SET value = ? WHERE key ="
+                        " 'counter'",
+                        (str(value + 1),),
+                    )
+
+        self._run_threads([increment for _ in range(8)])
+        self.assertEqual(self.storage.get_metadata("counter"), "400")
+
+    def test_reader_connection_per_thread(self):
+        main_reader = self.storage.reader()
+        self.assertIs(self.storage.reader(), main_reader)
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(self.storage.reader())
+        )
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], main_reader)
+        self.assertIsNot(main_reader, self.storage.conn)
+
+    def test_readers_are_read_only(self):
+        import sqlite3
+
+        with self.assertRaises(sqlite3.OperationalError):
+            self.storage.reader().execute(
+                "DELETE FROM db_metadata WHERE key = 'memory_id'"
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.storage.sqlite import SQLiteStorage
+
+
+class TestSQLiteFullTextSearch(unittest.TestCase):
+    """
+    Tests SQLiteStorage.search_text: BM25 ranking over the FTS5 index, the
+    triggers keeping the index in sync with messages, and the LIKE scan
+    fallback.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = SQLiteStorage(
+            db_path=os.path.join(self.tmpdir.name, "chat_memory.db"),
+            context_id="persona-test",
+        )
+        if not self.storage.fts_enabled:
+            self.skipTest("SQLite was built without FTS5")
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def _add(self, content, timestamp):
+        return self.storage.add_message(
+            content, "user", metadata={"timestamp": timestamp}
+        )
+
+    def _search(self, query, **kwargs):
+        results = self.storage.search_text(query, **kwargs)
+        return [message["content"] for message in results]
+
+    def test_results_are_ranked_by_bm25(self):
+        # The newest message is the weakest match, so recency order differs
+        self._add("garden garden garden tomatoes", "2024-01-01T10:00:00")
+        self._add("garden tomatoes", "2024-01-02T10:00:00")
+        self._add(
+            "we talked about the garden at length today, then"
+            " the weather and the car",
+            "2024-01-03T10:00:00",
+        )
+        self._add("nothing relevant here", "2024-01-04T10:00:00")
+
+        self.assertEqual(
+            self._search("garden"),
+            [
+                "garden garden garden tomatoes",
+                "garden tomatoes",
+                "we talked about the garden at length today, then"
+                " the weather and the car",
+            ],
+        )
+
+    def test_every_word_must_match_and_last_is_a_prefix(self):
+        self._add("planting tomatoes in spring", "2024-01-01T10:00:00")
+        self._add("planting roses in spring", "2024-01-02T10:00:00")
+
+        self.assertEqual(
+            self._search("planting tomat"), ["planting tomatoes in spring"]
+        )
+        self.assertEqual(len(self._search("spring")), 2)
+
+    def test_update_trigger_reindexes_content(self):
+        message_id = self._add("old words", "2024-01-01T10:00:00")
+        with self.storage.write() as conn:
+            conn.execute(
+                "UPDATE messages SET content = ? WHERE id = ?",
+                ("fresh words", message_id),
+            )
+
+        self.assertEqual(self._search("old"), [])
+        self.assertEqual(self._search("fresh"), ["fresh words"])
+
+    def test_delete_trigger_removes_content(self):
+        message_id = self._add("ephemeral note", "2024-01-01T10:00:00")
+        self._add("ephemeral thought", "2024-01-02T10:00:00")
+        with self.storage.write() as conn:
+            conn.execute("DELETE FROM messages WHERE id = ?", (message_id,))
+
+        self.assertEqual(self._search("ephemeral"), ["ephemeral thought"])
+
+    def test_index_survives_vacuum(self):
+        ids = [
+            self._add(f"entry {i} keyword{i}", f"2024-01-0{i + 1}T10:00:00")
+            for i in range(6)
+        ]
+        with self.storage.write() as conn:
+            conn.executemany(
+                "DELETE FROM messages WHERE id = ?", [(i,) for i in ids[:3]]
+            )
+        self.storage.vacuum()
+
+        for i in range(3, 6):
+            self.assertEqual(
+                self._search(f"keyword{i}"), [f"entry {i} keyword{i}"]
+            )
+        self.assertEqual(self._search("keyword0"), [])
+        self.assertEqual(len(self._search("entry")), 3)
+
+    def test_vacuum_needs_no_rebuild(self):
+        ids = [
+            self._add(f"entry {i} keyword{i}", f"2024-01-0{i + 1}T10:00:00")
+            for i in range(6)
+        ]
+        with self.storage.write() as conn:
+            conn.executemany(
+                "DELETE FROM messages WHERE id = ?", [(i,) for i in ids[::2]]
+            )
+        # A plain VACUUM, leaving the index as it was
+        self.storage.db.vacuum()
+        self._add("entry 6 keyword6", "2024-01-07T10:00:00")
+
+        for i in (1, 3, 5, 6):
+            self.assertEqual(
+                self._search(f"keyword{i}"), [f"entry {i} keyword{i}"]
+            )
+        self.assertEqual(len(self._search("entry")), 4)
+
+    def test_version_1_index_is_migrated(self):
+        self._add("garden tomatoes", "2024-01-01T10:00:00")
+        # The previous layout: an external content index on messages rowids
+        with self.storage.write() as conn:
+            conn.execute("DROP TRIGGER messages_fts_insert")
+            conn.execute("DROP TRIGGER messages_fts_delete")
+            conn.execute("DROP TRIGGER messages_fts_update")
+            conn.execute("DROP TABLE messages_fts")
+            conn.execute("DROP TABLE messages_fts_ids")
+            conn.execute(
+                "CREATE VIRTUAL TABLE messages_fts USING fts5(content,"
+                " content='messages', content_rowid='rowid')"
+            )
+            conn.execute(
+                "INSERT INTO messages_fts (messages_fts) VALUES ('rebuild')"
+            )
+            conn.execute(
+                "UPDATE db_metadata SET value = '1' WHERE key = 'fts_version'"
+            )
+        db_path = self.storage.db_path
+        self.storage.close()
+
+        self.storage = SQLiteStorage(
+            db_path=db_path, context_id="persona-test"
+        )
+        self._add("garden roses", "2024-01-02T10:00:00")
+
+        self.assertEqual(
+            sorted(self._search("garden")),
+            ["garden roses", "garden tomatoes"],
+        )
+        self.assertEqual(self.storage.get_metadata("fts_version"), "2")
+
+    def test_like_fallback_without_searchable_words(self):
+        self._add("see you :-)", "2024-01-01T10:00:00")
+        self._add("see you", "2024-01-02T10:00:00")
+
+        # No words left for FTS5, so the LIKE scan matches the substring
+        self.assertEqual(self._search(":-)"), ["see you :-)"])
+
+    def test_like_fallback_without_fts(self):
+        self._add("first apple", "2024-01-01T10:00:00")
+        self._add("second apple", "2024-01-02T10:00:00")
+        self._add("pineapple", "2024-01-03T10:00:00")
+        self.storage.fts_enabled = False
+
+        # Substring matches, newest first
+        self.assertEqual(
+            self._search("apple"), ["pineapple", "second apple", "first apple"]
+        )
+        self.assertEqual(
+            self._search("apple", start_date="2024-01-02T00:00:00", limit=1),
+            ["pineapple"],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
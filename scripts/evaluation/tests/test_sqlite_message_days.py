@@ -0,0 +1,164 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.storage.base import StorageBackend
+from ainara.framework.storage.sqlite import SQLiteStorage
+
+
+class TestSQLiteMessageDays(unittest.TestCase):
+    """
+    Tests the message_days index behind the day-by-day chat history view:
+    the list of days with messages and the adjacent-day lookup.
+
+    Timestamps are at local noon, so days match in any timezone the tests
+    run in.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "chat_memory.db")
+        self.storage = SQLiteStorage(
+            db_path=self.db_path, context_id="persona-test"
+        )
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    @staticmethod
+    def _noon(day):
+        noon = datetime.fromisoformat(f"{day}T12:00:00")
+        return noon.astimezone().isoformat()
+
+    def _add(self, day, storage=None):
+        (storage or self.storage).add_message(
+            f"message on {day}", "user", {"timestamp": self._noon(day)}
+        )
+
+    def _day_counts(self):
+        cursor = self.storage.reader().execute(
+            "SELECT day, message_count FROM message_days WHERE context_id = ?"
+            " ORDER BY day",
+            ("persona-test",),
+        )
+        return [tuple(row) for row in cursor]
+
+    def test_days_are_counted_as_messages_are_added(self):
+        for day in ("2024-03-05", "2024-03-01", "2024-03-05", "2024-03-09"):
+            self._add(day)
+        self.storage.add_historical_messages(
+            [
+                {
+                    "role": "user",
+                    "content": "imported",
+                    "timestamp": self._noon("2024-02-20"),
+                },
+                {
+                    "role": "assistant",
+                    "content": "imported",
+                    "timestamp": self._noon("2024-03-01"),
+                },
+            ]
+        )
+
+        self.assertEqual(
+            self.storage.get_message_days(),
+            ["2024-02-20", "2024-03-01", "2024-03-05", "2024-03-09"],
+        )
+        self.assertEqual(
+            self._day_counts(),
+            [
+                ("2024-02-20", 1),
+                ("2024-03-01", 2),
+                ("2024-03-05", 2),
+                ("2024-03-09", 1),
+            ],
+        )
+        self.assertEqual(
+            len(self.storage.get_messages_for_day("2024-03-05")), 2
+        )
+        self.assertEqual(self.storage.get_message_day_count("2024-03-05"), 2)
+        self.assertEqual(self.storage.get_message_day_count("2024-03-02"), 0)
+
+    def test_base_defaults_match_the_day_index(self):
+        for day in ("2024-03-05", "2024-03-01", "2024-03-05", "2024-03-09"):
+            self._add(day)
+
+        # The scanning defaults of StorageBackend give the same answers
+        self.assertEqual(
+            StorageBackend.get_message_days(self.storage),
+            self.storage.get_message_days(),
+        )
+        for day in ("2024-03-01", "2024-03-05", "2024-03-06"):
+            self.assertEqual(
+                StorageBackend.get_messages_for_day(self.storage, day),
+                self.storage.get_messages_for_day(day),
+            )
+            self.assertEqual(
+                StorageBackend.get_message_day_count(self.storage, day),
+                self.storage.get_message_day_count(day),
+            )
+            for direction in ("previous", "next"):
+                self.assertEqual(
+                    StorageBackend.get_adjacent_message_day(
+                        self.storage, day, direction
+                    ),
+                    self.storage.get_adjacent_message_day(day, direction),
+                )
+        self.assertEqual(
+            StorageBackend.get_adjacent_message_day(self.storage),
+            "2024-03-09",
+        )
+
+    def test_adjacent_day_lookup(self):
+        for day in ("2024-03-01", "2024-03-05", "2024-03-09"):
+            self._add(day)
+        adjacent = self.storage.get_adjacent_message_day
+
+        self.assertEqual(adjacent("2024-03-05", "previous"), "2024-03-01")
+        self.assertEqual(adjacent("2024-03-05", "next"), "2024-03-09")
+        # Days without messages skip to the closest day that has some
+        self.assertEqual(adjacent("2024-03-07", "previous"), "2024-03-05")
+        self.assertEqual(adjacent("2024-03-02", "next"), "2024-03-05")
+        self.assertIsNone(adjacent("2024-03-01", "previous"))
+        self.assertIsNone(adjacent("2024-03-09", "next"))
+        # No reference day: the latest or the earliest
+        self.assertEqual(adjacent(None, "previous"), "2024-03-09")
+        self.assertEqual(adjacent(None, "next"), "2024-03-01")
+        with self.assertRaises(ValueError):
+            adjacent("2024-03-05", "sideways")
+
+    def test_days_are_per_context(self):
+        self._add("2024-03-01")
+        other = SQLiteStorage(db_path=self.db_path, context_id="persona-other")
+        self.addCleanup(other.close)
+        self._add("2024-03-02", storage=other)
+
+        self.assertEqual(self.storage.get_message_days(), ["2024-03-01"])
+        self.assertEqual(other.get_message_days(), ["2024-03-02"])
+        self.assertIsNone(other.get_adjacent_message_day("2024-03-02"))
+
+    def test_index_is_rebuilt_when_timezone_changes(self):
+        self._add("2024-03-01")
+        self._add("2024-03-02")
+        with self.storage.write() as conn:
+            conn.execute("DELETE FROM message_days")
+        self.storage.set_metadata("message_days_tz", "elsewhere")
+        self.storage.close()
+
+        self.storage = SQLiteStorage(
+            db_path=self.db_path, context_id="persona-test"
+        )
+        self.assertEqual(
+            self._day_counts(), [("2024-03-01", 1), ("2024-03-02", 1)]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
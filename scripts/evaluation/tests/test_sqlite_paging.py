@@ -0,0 +1,116 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.storage.sqlite import SQLiteStorage
+
+
+class TestSQLitePaging(unittest.TestCase):
+    """
+    Tests keyset pagination of messages on (timestamp, id): no message is
+    skipped or repeated across pages, even when many share a timestamp.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = SQLiteStorage(
+            db_path=os.path.join(self.tmpdir.name, "chat_memory.db"),
+            context_id="persona-test",
+        )
+        # Runs of identical timestamps, with the page size landing mid-run
+        self.timestamps = (
+            ["2024-01-01T10:00:00"] * 7
+            + ["2024-01-01T11:00:00"]
+            + ["2024-01-01T12:00:00"] * 5
+        )
+        self.expected = sorted(
+            (
+                timestamp,
+                self.storage.add_message(
+                    f"message {i}", "user", {"timestamp": timestamp}
+                ),
+            )
+            for i, timestamp in enumerate(self.timestamps)
+        )
+
+    def tearDown(self):
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def _pages(self, limit, **kwargs):
+        pages, cursor = [], None
+        while True:
+            messages, cursor = self.storage.get_messages_page(
+                limit=limit, cursor=cursor, **kwargs
+            )
+            pages.append([(m["timestamp"], m["id"]) for m in messages])
+            if cursor is None:
+                return pages
+
+    def test_pages_split_timestamp_ties(self):
+        for limit in (1, 2, 3, 4, 13, 50):
+            pages = self._pages(limit, descending=False)
+            keys = [key for page in pages for key in page]
+            self.assertEqual(keys, self.expected, limit)
+            self.assertTrue(all(len(page) <= limit for page in pages))
+
+            pages = self._pages(limit, descending=True)
+            keys = [key for page in pages for key in page]
+            self.assertEqual(keys, self.expected[::-1], limit)
+
+    def test_cursor_is_last_key_of_page(self):
+        messages, cursor = self.storage.get_messages_page(
+            limit=3, descending=False
+        )
+        self.assertEqual(
+            cursor, (messages[-1]["timestamp"], messages[-1]["id"])
+        )
+        self.assertEqual(cursor, self.expected[2])
+
+        # The last page is short, or empty when the count divides evenly
+        messages, cursor = self.storage.get_messages_page(
+            limit=13, descending=False
+        )
+        self.assertEqual(len(messages), 13)
+        messages, cursor = self.storage.get_messages_page(
+            limit=13, cursor=cursor, descending=False
+        )
+        self.assertEqual((messages, cursor), ([], None))
+
+    def test_filters_apply_to_every_page(self):
+        pages = self._pages(
+            2,
+            descending=False,
+            start_date="2024-01-01T10:30:00",
+            end_date="2024-01-01T12:00:00",
+        )
+        keys = [key for page in pages for key in page]
+        self.assertEqual(keys, self.expected[7:])
+
+        pages = self._pages(2, descending=False, since="2024-01-01T10:00:00")
+        keys = [key for page in pages for key in page]
+        self.assertEqual(keys, self.expected[7:])
+
+    def test_iter_messages_streams_in_order(self):
+        keys = [
+            (m["timestamp"], m["id"])
+            for m in self.storage.iter_messages(batch_size=4)
+        ]
+        self.assertEqual(keys, self.expected)
+
+        keys = [
+            (m["timestamp"], m["id"])
+            for m in self.storage.iter_messages(batch_size=4, descending=True)
+        ]
+        self.assertEqual(keys, self.expected[::-1])
+        self.assertEqual(
+            self.storage.count_messages(end_date="2024-01-01T11:00:00"), 8
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,190 @@
+import os
+import sys
+import tempfile
+import threading
+import types
+import unittest
+
+# Add project root to the Python path to allow importing ainara modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from ainara.framework.chat_memory import ChatMemory
+from ainara.framework.storage.sqlite import SQLiteStorage
+from ainara.framework.storage.write_behind import (
+    VectorWriteBehind,
+    vector_metadata,
+)
+
+
+class FakeVectorStore:
+    """
+    Keeps documents by id like the Chroma backend: adding a document whose
+    id is already stored leaves it unchanged.
+    """
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.documents = {}
+        self.add_calls = 0
+        self._lock = threading.Lock()
+
+    def add_documents(self, documents):
+        with self._lock:
+            self.add_calls += 1
+            if self.fail:
+                raise RuntimeError("vector store unavailable")
+            for doc in documents:
+                self.documents.setdefault(doc["metadata"]["id"], doc)
+        return [doc["metadata"]["id"] for doc in documents]
+
+
+class TestVectorWriteBehind(unittest.TestCase):
+    """
+    Tests the write-behind queue between the chat history and the vector
+    store: batched indexing, and replay at startup of the rows a previous
+    run left with vector_indexed = 0.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.storage = SQLiteStorage(
+            db_path=os.path.join(self.tmpdir.name, "chat_memory.db"),
+            context_id="persona-test",
+        )
+        self.writers = []
+
+    def tearDown(self):
+        for writer in self.writers:
+            writer.close()
+        self.storage.close()
+        self.tmpdir.cleanup()
+
+    def _writer(self, vector_store, **kwargs):
+        writer = VectorWriteBehind(
+            self.storage, vector_store, name="test", **kwargs
+        )
+        self.writers.append(writer)
+        return writer
+
+    def _add(self, writer, count, start=0):
+        # What ChatMemory.add_entry does with the queue enabled
+        message_ids = []
+        for i in range(start, start + count):
+            message_id = self.storage.add_message(
+                f"message {i}",
+                "user",
+                {"timestamp": f"2024-01-01T10:00:{i:02d}"},
+                vector_indexed=False,
+            )
+            message = self.storage.get_message_by_id(message_id)
+            writer.enqueue(
+                message_id, message["content"], vector_metadata(message)
+            )
+            message_ids.append(message_id)
+        return message_ids
+
+    def _unindexed_ids(self):
+        return [m["id"] for m in self.storage.get_unindexed_messages()]
+
+    def test_messages_are_indexed_in_batches(self):
+        vector_store = FakeVectorStore()
+        writer = self._writer(vector_store, max_batch_size=4, max_wait_ms=200)
+
+        message_ids = self._add(writer, 10)
+        self.assertTrue(writer.flush(timeout=10))
+
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(sorted(vector_store.documents), sorted(message_ids))
+        self.assertLessEqual(vector_store.add_calls, 5)
+        self.assertEqual(self._unindexed_ids(), [])
+        doc = vector_store.documents[message_ids[0]]
+        self.assertEqual(doc["page_content"], "message 0")
+        self.assertEqual(doc["metadata"]["message_id"], message_ids[0])
+
+    def test_failed_batches_are_replayed_at_startup(self):
+        # First run: the vector store is down, rows stay unindexed
+        writer = self._writer(FakeVectorStore(fail=True), max_wait_ms=1)
+        message_ids = self._add(writer, 5)
+        self.assertTrue(writer.flush(timeout=10))
+        writer.close()
+        self.assertEqual(self._unindexed_ids(), message_ids)
+
+        # Next start: replay queues them again, oldest first
+        vector_store = FakeVectorStore()
+        writer = self._writer(vector_store, max_wait_ms=1)
+        self.assertEqual(writer.replay(), 5)
+        self.assertTrue(writer.flush(timeout=10))
+
+        self.assertEqual(sorted(vector_store.documents), sorted(message_ids))
+        self.assertEqual(self._unindexed_ids(), [])
+        self.assertEqual(writer.replay(), 0)
+
+    def test_replay_does_not_duplicate_indexed_vectors(self):
+        # A crash between add_documents() and mark_vector_indexed(): the
+        # vectors exist but the rows are still flagged as unindexed
+        vector_store = FakeVectorStore()
+        writer = self._writer(vector_store, max_wait_ms=1)
+        message_ids = self._add(writer, 3)
+        self.assertTrue(writer.flush(timeout=10))
+        with self.storage.write() as conn:
+            conn.execute("UPDATE messages SET vector_indexed = 0")
+
+        self.assertEqual(writer.replay(), 3)
+        self.assertTrue(writer.flush(timeout=10))
+
+        self.assertEqual(sorted(vector_store.documents), sorted(message_ids))
+        self.assertEqual(self._unindexed_ids(), [])
+
+    def test_enqueue_after_close_indexes_synchronously(self):
+        vector_store = FakeVectorStore()
+        writer = self._writer(vector_store)
+        writer.close()
+
+        message_ids = self._add(writer, 2)
+
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(sorted(vector_store.documents), sorted(message_ids))
+        self.assertEqual(self._unindexed_ids(), [])
+
+    def test_re_index_flags_only_the_indexed_messages(self):
+        writer = self._writer(FakeVectorStore(), max_wait_ms=1)
+        message_ids = self._add(writer, 5)
+        self.assertTrue(writer.flush(timeout=10))
+        vector_store = FakeVectorStore()
+        added = vector_store.add_documents
+        late_ids = []
+
+        def add_and_store(documents):
+            # A message stored mid-run, behind the page being read, isn't
+            # part of this re-index
+            if not late_ids:
+                late_ids.append(
+                    self.storage.add_message(
+                        "late message",
+                        "user",
+                        {"timestamp": "2024-01-01T09:00:00"},
+                        vector_indexed=False,
+                    )
+                )
+            return added(documents)
+
+        chat_memory = types.SimpleNamespace(
+            storage=self.storage,
+            vector_storage=types.SimpleNamespace(
+                reset=lambda: None, add_documents=add_and_store
+            ),
+            vector_writer=None,
+            get_total_messages=lambda: 5,
+        )
+        with self.storage.write() as conn:
+            conn.execute("UPDATE messages SET vector_indexed = 0")
+
+        ChatMemory.re_index_vectors(chat_memory, batch_size=2)
+
+        self.assertEqual(vector_store.add_calls, 3)
+        self.assertEqual(sorted(vector_store.documents), sorted(message_ids))
+        self.assertEqual(self._unindexed_ids(), late_ids)
+
+
+if __name__ == '__main__':
+    unittest.main()
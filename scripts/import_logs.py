@@ -20,7 +20,6 @@
 import argparse
 import logging
 import os
-import re
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -38,6 +37,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Messages buffered before each bulk insert
+IMPORT_BATCH_SIZE = 500
+
+
+def iter_log_turns(lines):
+    """
+    Yields (user_content, assistant_text) pairs from the lines of a log.
+
+    A user turn is a line starting with '>' and the assistant response is
+    everything up to the next user line. Lines are consumed one at a time,
+    so arbitrarily large logs are parsed in constant memory.
+    """
+    user_line = None
+    assistant_lines = []
+    for line in lines:
+        if line.startswith(">"):
+            if user_line is not None:
+                yield user_line[1:].strip(), "".join(assistant_lines).strip()
+            user_line = line.rstrip("\r\n")
+            assistant_lines = []
+        elif user_line is not None:
+            assistant_lines.append(line)
+    if user_line is not None:
+        yield user_line[1:].strip(), "".join(assistant_lines).strip()
+
 
 def parse_and_import_logs(storage: SQLiteStorage, directory_path: str):
     """Parses conversation logs from a directory and imports them into the database."""
@@ -59,67 +83,56 @@ def parse_and_import_logs(storage: SQLiteStorage, directory_path: str):
             base_ts = datetime.fromtimestamp(file_path.stat().st_mtime, tz=timezone.utc)
             time_offset = timedelta(seconds=0)
 
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-
-            # Split the content into user/assistant turns.
-            # The regex captures the user line (starting with '>') and includes it in the split list.
-            turns = re.split(r"(^>.*$)", content, flags=re.MULTILINE)
-
-            # The first element might be empty or an initial non-user text, so we discard it if it's not a user line.
-            if turns and not turns[0].strip().startswith(">"):
-                turns.pop(0)
-
+            # Prepare messages for insertion
+            metadata = {
+                "source_type": "log_import",
+                "persona": "default",
+                "original_file": file_path.name,
+            }
+            file_messages_imported = 0
             messages_to_add = []
-            # Process in pairs: user line, then assistant response
-            for j in range(0, len(turns), 2):
-                if j + 1 >= len(turns):
-                    continue  # Skip if there's a user line without a following assistant response
-
-                user_line = turns[j].strip()
-                assistant_text = turns[j + 1].strip()
-
-                # Basic validation
-                if not user_line.startswith(">"):
-                    continue
-                user_content = user_line[1:].strip()
-                if not user_content or not assistant_text:
-                    continue
-
-                # Prepare messages for insertion
-                metadata = {
-                    "source_type": "log_import",
-                    "persona": "default",
-                    "original_file": file_path.name,
-                }
-                # Add user message
-                messages_to_add.append(
-                    {
-                        "role": "user",
-                        "content": user_content,
-                        "timestamp": (base_ts + time_offset).isoformat(),
-                        "metadata": metadata,
-                    }
-                )
-                time_offset += timedelta(seconds=5)  # Increment time for the next message
-
-                # Add assistant message
-                messages_to_add.append(
-                    {
-                        "role": "assistant",
-                        "content": assistant_text,
-                        "timestamp": (base_ts + time_offset).isoformat(),
-                        "metadata": metadata,
-                    }
-                )
-                time_offset += timedelta(seconds=5)
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                for user_content, assistant_text in iter_log_turns(f):
+                    # Basic validation
+                    if not user_content or not assistant_text:
+                        continue
+
+                    # Add user message
+                    messages_to_add.append(
+                        {
+                            "role": "user",
+                            "content": user_content,
+                            "timestamp": (base_ts + time_offset).isoformat(),
+                            "metadata": metadata,
+                        }
+                    )
+                    time_offset += timedelta(seconds=5)  # Increment time for the next message
+
+                    # Add assistant message
+                    messages_to_add.append(
+                        {
+                            "role": "assistant",
+                            "content": assistant_text,
+                            "timestamp": (base_ts + time_offset).isoformat(),
+                            "metadata": metadata,
+                        }
+                    )
+                    time_offset += timedelta(seconds=5)
+
+                    if len(messages_to_add) >= IMPORT_BATCH_SIZE:
+                        storage.add_historical_messages(messages_to_add)
+                        file_messages_imported += len(messages_to_add)
+                        messages_to_add = []
 
             if messages_to_add:
                 storage.add_historical_messages(messages_to_add)
+                file_messages_imported += len(messages_to_add)
+
+            if file_messages_imported:
                 logger.info(
-                    f"  -> Imported {len(messages_to_add)} messages from {file_path.name}"
+                    f"  -> Imported {file_messages_imported} messages from {file_path.name}"
                 )
-                total_messages_imported += len(messages_to_add)
+                total_messages_imported += file_messages_imported
 
         except Exception as e:
             logger.error(f"Failed to process {file_path.name}: {e}")
@@ -133,9 +146,9 @@ def trigger_memory_rescan(storage: SQLiteStorage):
     """Resets metadata to force GREENMemories to re-process all messages."""
     logger.info("Scheduling a full rescan of chat history to generate new memories...")
     try:
-        with storage.conn:
+        with storage.write() as conn:
             # This forces the GREENMemories to start from the beginning
-            storage.conn.execute(
+            conn.execute(
                 "DELETE FROM db_metadata WHERE key = ?",
                 ("profile_last_processed_timestamp",),
             )
@@ -0,0 +1,83 @@
+# Ainara AI Companion Framework Project
+# Copyright (C) 2025 Rubén Gómez - khromalabs.org
+#
+# This file is dual-licensed under:
+# 1. GNU Lesser General Public License v3.0 (LGPL-3.0)
+#    (See the included LICENSE_LGPL3.txt file or look into
+#    <https://www.gnu.org/licenses/lgpl-3.0.html> for details)
+# 2. Commercial license
+#    (Contact: rgomez@khromalabs.org for licensing options)
+#
+# You may use, distribute and modify this code under the terms of either license.
+# This notice must be preserved in all copies or substantial portions of the code.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow importing from 'ainara'
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from ainara.framework.config import ConfigManager
+from ainara.framework.storage.sqlite import SQLiteStorage
+
+# --- Basic Setup ---
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def schedule_vector_rebuild(storage: SQLiteStorage):
+    """Flags the user memory vector store for a full rebuild on next start."""
+    storage.set_metadata("vector_db_needs_rebuild", "true")
+    logger.info(
+        "Scheduled a full rebuild of the user memory vector store. Every"
+        " memory will be re-embedded on the next application run."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Schedule a full rebuild of the user memory vector store. Startup"
+            " normally only re-embeds memories that changed; use this after"
+            " corruption or to force every vector to be recomputed."
+        )
+    )
+    parser.parse_args()
+
+    try:
+        # Use the framework's config manager to find the database
+        config = ConfigManager()
+        config.load_config()
+        db_path = config.get(
+            "memory.text_storage.storage_path",
+            os.path.join(config.get("data.directory"), "chat_memory.db"),
+        )
+        if not db_path:
+            raise ValueError("Database path not found in configuration.")
+
+        db_path = os.path.expanduser(db_path)
+        logger.info(f"Connecting to database at: {db_path}")
+
+        storage = SQLiteStorage(db_path=db_path)
+        schedule_vector_rebuild(storage)
+        storage.close()
+
+    except Exception as e:
+        logger.error(f"An unexpected error occurred: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()